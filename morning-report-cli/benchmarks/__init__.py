@@ -0,0 +1,5 @@
+"""Benchmarks for the morningreport hot paths.
+
+Not part of the test run. ``python -m benchmarks.timing`` prints scaling
+curves and checks them against a stored baseline; see the README.
+"""
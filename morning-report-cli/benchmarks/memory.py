@@ -0,0 +1,144 @@
+"""Peak and retained memory for the heavy operations.
+
+    python -m benchmarks.memory
+    python -m benchmarks.memory --cues 100000
+
+Each operation runs under tracemalloc on a synthetic transcript. Peak is
+the high-water mark while it ran; retained is what was still allocated
+when it returned, which is mostly the result it hands back. Both are
+reported per cue as well as in total, and peak is checked against
+BUDGETS — a fixed allowance plus so much per cue, about twice what the
+operation takes today, so a change that doubles memory fails here and
+in the tests long before it fails on a shared VM.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tempfile
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+from morningreport import rubric as rb, scoring, vtt
+from morningreport.roles import NameBoundary, Redaction
+from morningreport.store import Store
+
+from . import synth
+
+CUES = 20_000
+
+KB = 1024
+
+# Peak bytes allowed: (fixed, per cue). tracemalloc counts Python
+# allocations only, which is what these operations make.
+BUDGETS = {
+    "vtt.parse_file": (256 * KB, 720),
+    "redaction": (256 * KB, 800),
+    "scoring": (512 * KB, 32),
+    "Store.grep": (192 * KB, 4),
+}
+
+
+@dataclass
+class Usage:
+    op: str
+    cues: int
+    peak: int
+    retained: int
+
+    @property
+    def per_cue(self) -> float:
+        return self.peak / self.cues if self.cues else 0.0
+
+    def budget(self, budgets=BUDGETS) -> int | None:
+        if self.op not in budgets:
+            return None
+        fixed, per_cue = budgets[self.op]
+        return fixed + per_cue * self.cues
+
+    def over(self, budgets=BUDGETS) -> bool:
+        budget = self.budget(budgets)
+        return budget is not None and self.peak > budget
+
+
+def measure(op: str, cues: int, fn) -> Usage:
+    """Run `fn` under tracemalloc, counting only what it allocates."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return Usage(op, cues, peak - before, current - before)
+
+
+def run(cues: int = CUES, name_density: float = 0.1, only=None) -> list[Usage]:
+    rubric = rb.load()
+    man = synth.manifest()
+    boundary = NameBoundary(man.roles)
+    out = []
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Store(root=Path(tmp))
+        path = store.write_text(synth.generate(cues, name_density=name_density),
+                                "working", "bench.vtt")
+        # a day's worth of other files for grep to walk past
+        for n in range(20):
+            store.write_text(synth.generate(cues // 20, seed=n), "sessions", f"s{n}.vtt")
+        tx = vtt.parse_file(path)
+
+        def redaction():
+            r = Redaction(boundary)
+            return r.excerpt(tx), r.residual_names(tx)
+
+        ops = {
+            "vtt.parse_file": lambda: vtt.parse_file(path),
+            "redaction": redaction,
+            "scoring": lambda: scoring.score(rubric, tx, man, boundary, dry_run=True),
+            "Store.grep": lambda: store.grep("Priya"),
+        }
+        for op, fn in ops.items():
+            if only and op not in only:
+                continue
+            out.append(measure(op, cues, fn))
+    return out
+
+
+def table(usages: list[Usage], budgets=BUDGETS) -> str:
+    lines = [f"{'':<16}{'peak':>12}{'retained':>12}{'per cue':>10}{'budget':>12}"]
+    for u in usages:
+        budget = u.budget(budgets)
+        flag = "  OVER" if u.over(budgets) else ""
+        lines.append(
+            f"{u.op:<16}{_mb(u.peak):>12}{_mb(u.retained):>12}"
+            f"{u.per_cue:>9.0f}B{_mb(budget) if budget else '-':>12}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1_048_576:.1f} MB"
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.memory", description=__doc__.split("\n")[0])
+    ap.add_argument("--cues", type=int, default=CUES)
+    ap.add_argument("--names", type=float, default=0.1,
+                    help="chance a cue mentions a participant by name")
+    ap.add_argument("--only", default="", help="comma-separated operations to run")
+    args = ap.parse_args(argv)
+
+    only = {s.strip() for s in args.only.split(",") if s.strip()} or None
+    usages = run(args.cues, name_density=args.names, only=only)
+    print(table(usages))
+    return 1 if any(u.over() for u in usages) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
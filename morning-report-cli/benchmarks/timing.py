@@ -0,0 +1,171 @@
+"""Scaling curves for the hot paths, and a regression check.
+
+    python -m benchmarks.timing
+    python -m benchmarks.timing --sizes 100,1000 --out after.json --baseline before.json
+
+Each operation is timed on synthetic transcripts of every size, taking
+the best of a few repeats, and the results are written as
+``{"results": {op: {cues: seconds}}}``. With ``--baseline`` it compares
+against an earlier run and exits non-zero if any operation got slower
+than the threshold allows — run it once before an optimisation and once
+after. Timings belong to the machine they were taken on, so there is no
+baseline checked in.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from morningreport import deterministic, model, phi, rubric as rb, vtt
+from morningreport.roles import NameBoundary, Redaction
+from morningreport.store import Store
+
+from . import synth
+
+SIZES = (100, 1_000, 10_000, 100_000)
+THRESHOLD = 0.25
+REPEATS = 3
+NAME_DENSITY = 0.1
+
+# Regressions smaller than this are noise, whatever the ratio says.
+FLOOR = 0.002
+
+
+def cases(text: str, rubric, root: Path) -> dict:
+    """{op: zero-argument callable} over one synthetic transcript."""
+    man = synth.manifest()
+    tx = vtt.parse(text)
+    boundary = NameBoundary(man.roles)
+    joined = tx.text()
+    model_items = [i for i in rubric.items if i.model_scored and rubric.bindings[i.id].prompt]
+
+    store = Store(root=root)
+    store.write_text(text, "working", "bench.vtt")
+    store.write({"transcript": joined}, "working", "bench.json")
+
+    def payloads():
+        redaction = Redaction(boundary)
+        for item in model_items:
+            model.build_payload(item, tx, boundary, man, redaction=redaction)
+
+    def scorers():
+        for fn in deterministic.SCORERS.values():
+            fn(man, tx, boundary)
+
+    return {
+        "vtt.parse": lambda: vtt.parse(text),
+        "NameBoundary.substitute": lambda: boundary.substitute(joined),
+        "NameBoundary.residual_names": lambda: boundary.residual_names(joined),
+        "phi.scan": lambda: phi.scan(joined),
+        "deterministic": scorers,
+        "model.build_payload": payloads,
+        "Store.grep": lambda: store.grep("Priya"),
+    }
+
+
+def best(fn, repeats: int = REPEATS) -> float:
+    times = []
+    for _ in range(repeats):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+def run(sizes=SIZES, repeats: int = REPEATS, name_density: float = NAME_DENSITY,
+        only=None, progress=None) -> dict:
+    rubric = rb.load()
+    results: dict[str, dict[str, float]] = {}
+    for n in sizes:
+        text = synth.generate(n, name_density=name_density)
+        with tempfile.TemporaryDirectory() as tmp:
+            for op, fn in cases(text, rubric, Path(tmp)).items():
+                if only and op not in only:
+                    continue
+                results.setdefault(op, {})[str(n)] = best(fn, repeats)
+                if progress:
+                    progress(op, n, results[op][str(n)])
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "name_density": name_density,
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def regressions(current: dict, baseline: dict, threshold: float = THRESHOLD) -> list[str]:
+    """Every op and size that is more than `threshold` slower than the baseline.
+
+    Only sizes present in both runs are compared.
+    """
+    out = []
+    base = baseline.get("results", {})
+    for op, by_size in current.get("results", {}).items():
+        for n, seconds in by_size.items():
+            before = base.get(op, {}).get(n)
+            if not before:
+                continue
+            if seconds > before * (1 + threshold) and seconds - before > FLOOR:
+                out.append(f"{op} at {n} cues: {before * 1000:.1f} ms -> {seconds * 1000:.1f} ms "
+                           f"(+{(seconds / before - 1) * 100:.0f}%)")
+    return out
+
+
+def table(current: dict) -> str:
+    results = current["results"]
+    sizes = sorted({int(n) for r in results.values() for n in r})
+    width = max(len(op) for op in results) if results else 10
+    lines = [" " * width + "".join(f"{n:>12,}" for n in sizes)]
+    for op, by_size in results.items():
+        cells = "".join(
+            f"{by_size[str(n)] * 1000:>10.1f}ms" if str(n) in by_size else " " * 12
+            for n in sizes
+        )
+        lines.append(f"{op:<{width}}{cells}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.timing", description=__doc__.split("\n")[0])
+    ap.add_argument("--sizes", default=",".join(str(n) for n in SIZES),
+                    help="comma-separated cue counts")
+    ap.add_argument("--repeats", type=int, default=REPEATS)
+    ap.add_argument("--names", type=float, default=NAME_DENSITY,
+                    help="chance a cue mentions a participant by name")
+    ap.add_argument("--only", default="", help="comma-separated operations to run")
+    ap.add_argument("--out", type=Path, help="write results as JSON")
+    ap.add_argument("--baseline", type=Path, help="compare against an earlier --out")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD,
+                    help="allowed slowdown as a fraction (0.25 = 25%%)")
+    args = ap.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    only = {s.strip() for s in args.only.split(",") if s.strip()} or None
+    current = run(sizes, repeats=args.repeats, name_density=args.names, only=only)
+    print(table(current))
+
+    if args.out:
+        args.out.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"\nWrote {args.out}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        slower = regressions(current, baseline, args.threshold)
+        if slower:
+            print(f"\nSlower than {args.baseline} by more than {args.threshold:.0%}:")
+            for line in slower:
+                print("  " + line)
+            return 1
+        print(f"\nNo regressions against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""Scoring a day's recordings together.
+
+Several sites run morning report on the same day, so the recordings
+arrive in a pile. Each transcript is named for its session id —
+``2026-09-03-galveston.vtt`` — and is paired with that session's
+manifest the same way `score` finds one.
+
+Sessions are scored in separate processes. Every process draws its
+model calls from one shared :class:`~morningreport.model.RateLimiter`,
+so running more sessions at once never means more calls per minute.
+Each session writes its own working copy, exactly as `score` would; a
+session that cannot be scored is reported and the rest carry on.
+"""
+
+from __future__ import annotations
+
+import glob
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import manifest as mf
+from . import model, rubric as rb, scoring, vtt
+from .roles import NameBoundary
+from .store import Store
+
+# Model calls per minute, shared by every session in the batch.
+RATE_PER_MINUTE = 50
+
+_limiter: model.RateLimiter | None = None
+
+
+@dataclass
+class Job:
+    transcript: str
+    session_id: str
+    root: str
+    rubric: str | None = None
+    dry_run: bool = False
+    model_name: str = model.MODEL
+
+
+@dataclass
+class Outcome:
+    session_id: str
+    ok: bool
+    struck: int | None = None
+    of: int | None = None
+    failed: bool | None = None
+    needs_review: list = field(default_factory=list)
+    notes: list = field(default_factory=list)
+    error: str = ""
+
+
+def discover(target) -> list[Path]:
+    """The .vtt files in a folder, or matching a glob."""
+    p = Path(target).expanduser()
+    if p.is_dir():
+        return sorted(p.glob("*.vtt"))
+    return sorted(Path(m) for m in glob.glob(str(p)) if m.lower().endswith(".vtt"))
+
+
+def find_manifest(store: Store, session_id: str) -> Path | None:
+    """Where `score` would look for a session's manifest."""
+    for candidate in (
+        store.working(f"{session_id}.manifest.json"),
+        store.path("manifests", f"{session_id}.json"),
+    ):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _init(limiter):
+    global _limiter
+    _limiter = limiter
+
+
+def score_one(job: Job) -> Outcome:
+    """Score one session and write its working copy. Never raises."""
+    try:
+        return _score(job)
+    except Exception as e:          # one bad session must not sink the batch
+        return Outcome(job.session_id, ok=False, error=str(e) or type(e).__name__)
+
+
+def _score(job: Job) -> Outcome:
+    store = Store(root=Path(job.root))
+    rubric = rb.load(job.rubric)
+
+    path = find_manifest(store, job.session_id)
+    if path is None:
+        return Outcome(job.session_id, ok=False, error="no manifest")
+    man = mf.load(path)
+
+    tx = vtt.parse_file(job.transcript)
+    if not len(tx):
+        return Outcome(job.session_id, ok=False, error="no cues; is it a Zoom .vtt?")
+
+    boundary = NameBoundary(man.roles)
+    unmapped = boundary.unmapped_speakers(tx.speakers)
+    if unmapped and not job.dry_run:
+        return Outcome(job.session_id, ok=False,
+                       error="unmapped speakers, so no model calls: " + ", ".join(unmapped))
+
+    client = model.Client(model=job.model_name, limiter=_limiter)
+    board = store.read("board-archive", f"{job.session_id}.json")
+    session = scoring.score(rubric, tx, man, boundary, client=client,
+                            board=board, dry_run=job.dry_run)
+
+    working = scoring.to_working(session, man, rubric)
+    working["scored"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    working["transcript"] = Path(job.transcript).name
+    store.write(working, "working", f"{job.session_id}.json")
+
+    return Outcome(
+        job.session_id, ok=True,
+        struck=session.struck(), of=rubric.of(), failed=session.failed(),
+        needs_review=session.needs_review(), notes=list(session.notes),
+    )
+
+
+def run(jobs: list[Job], processes: int = 1,
+        per_minute: float = RATE_PER_MINUTE, on_done=None) -> list[Outcome]:
+    """Score every job, returning outcomes in the order given."""
+    limiter = model.RateLimiter(per_minute)
+    if processes <= 1 or len(jobs) <= 1:
+        _init(limiter)
+        outcomes = []
+        for job in jobs:
+            outcomes.append(score_one(job))
+            if on_done:
+                on_done(outcomes[-1])
+        return outcomes
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init,
+                             initargs=(limiter,)) as pool:
+        outcomes = []
+        for outcome in pool.map(score_one, jobs):
+            outcomes.append(outcome)
+            if on_done:
+                on_done(outcome)
+        return outcomes
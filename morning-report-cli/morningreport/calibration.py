@@ -11,12 +11,18 @@ unknown reliability, because that is what it is.
 
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
 
 THRESHOLD = 0.80
 MIN_SESSIONS = 10
 MIN_OBSERVATIONS = 4
 
+# How agreement can be cut. "prompt" is per item: the version of that
+# item's prompt file the session was scored with.
+DIMENSIONS = ("rubric_version", "prompt", "block", "site")
+WINDOW = 5
+
 
 @dataclass
 class ItemAgreement:
@@ -24,30 +30,45 @@ class ItemAgreement:
     text: str
     compared: int
     agreed: int
+    stats: object = None         # a stats.ItemStats, when asked for
+    conservative: bool = False   # judge on the lower confidence bound
 
     @property
     def rate(self) -> float | None:
         return self.agreed / self.compared if self.compared else None
 
+    @property
+    def lower(self) -> float | None:
+        ci = getattr(self.stats, "agreement_ci", None)
+        return ci[0] if ci else None
+
     @property
     def verdict(self) -> str:
         if self.compared < MIN_OBSERVATIONS:
             return "too few"
         if self.rate is None:
             return "too few"
-        return "keep" if self.rate >= THRESHOLD else "demote to human-only"
+        judged = self.lower if self.conservative and self.lower is not None else self.rate
+        return "keep" if judged >= THRESHOLD else "demote to human-only"
 
 
-def compare(sessions: list[dict], rubric) -> dict:
+def compare(sessions: list[dict], rubric, stats: bool = False,
+            conservative: bool = False, resamples: int | None = None, seed=None) -> dict:
     """Per-item agreement between the model and the human across sessions.
 
     A comparison only exists where both a model verdict and a settled
     final verdict are present. Items the model never scored are reported
     as such rather than counted as agreement.
+
+    With `stats`, each row also carries kappa, AC1 and bootstrap
+    intervals (see :mod:`morningreport.stats`). With `conservative`, an
+    item is kept only if the lower bound of its agreement interval clears
+    the threshold, not just the point estimate.
     """
     rows: dict[str, ItemAgreement] = {}
     for item in rubric.items:
-        rows[item.id] = ItemAgreement(code=item.code, text=item.text, compared=0, agreed=0)
+        rows[item.id] = ItemAgreement(code=item.code, text=item.text, compared=0, agreed=0,
+                                      conservative=conservative)
 
     for s in sessions:
         results = {**(s.get("items") or {}), **(s.get("automatic_fails") or {})}
@@ -61,6 +82,15 @@ def compare(sessions: list[dict], rubric) -> dict:
             if mv == fv:
                 rows[item_id].agreed += 1
 
+    if stats or conservative:
+        from . import stats as st
+
+        kwargs = {"seed": seed}
+        if resamples is not None:
+            kwargs["resamples"] = resamples
+        for item_id, row in st.agreement(sessions, rubric, **kwargs).items():
+            rows[item_id].stats = row
+
     ordered = sorted(
         rows.values(),
         key=lambda a: (a.rate if a.rate is not None else 2, a.code),
@@ -79,5 +109,73 @@ def compare(sessions: list[dict], rubric) -> dict:
         "threshold": THRESHOLD,
         "overall": overall,
         "items": ordered,
-        "demote": [a.code for a in scored if a.rate is not None and a.rate < THRESHOLD],
+        "demote": [a.code for a in scored if a.verdict == "demote to human-only"],
+    }
+
+
+def trends(sessions: list[dict], rubric, window: int = WINDOW,
+           by: tuple[str, ...] = DIMENSIONS) -> dict:
+    """Agreement over time and by version, from one pass over the sessions.
+
+    Pooled agreement hides a prompt fix behind the history it is pooled
+    with. This keeps, per item, a rolling rate over its last `window`
+    comparisons in date order, and a running tally for every value of
+    each dimension in `by` — so whether a new prompt moved an item over
+    the threshold is read off directly rather than by rescanning.
+    """
+    unknown = [d for d in by if d not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"cannot group by {', '.join(unknown)}; expected {', '.join(DIMENSIONS)}")
+
+    codes = {item.id: item.code for item in rubric.items}
+    recent: dict[str, deque] = {item_id: deque(maxlen=max(1, window)) for item_id in codes}
+    agreed_recent: dict[str, int] = {item_id: 0 for item_id in codes}
+    rolling: dict[str, list] = {item_id: [] for item_id in codes}
+    tally: dict[str, dict[str, dict]] = {d: {item_id: {} for item_id in codes} for d in by}
+
+    for s in sorted(sessions, key=lambda s: (s.get("date") or "", s.get("id") or "")):
+        results = {**(s.get("items") or {}), **(s.get("automatic_fails") or {})}
+        prompts = s.get("prompt_versions") or {}
+        for item_id, r in results.items():
+            if item_id not in codes:
+                continue
+            mv, fv = r.get("model_verdict"), r.get("final_verdict")
+            if mv is None or fv is None:
+                continue
+            hit = int(mv == fv)
+
+            q = recent[item_id]
+            if len(q) == q.maxlen:
+                agreed_recent[item_id] -= q[0]
+            q.append(hit)
+            agreed_recent[item_id] += hit
+            rolling[item_id].append({
+                "id": s.get("id"), "date": s.get("date"),
+                "rate": agreed_recent[item_id] / len(q), "n": len(q),
+            })
+
+            for d in by:
+                if d == "prompt":
+                    key = prompts.get(codes[item_id])
+                else:
+                    key = s.get(d)
+                cell = tally[d][item_id].setdefault(str(key) if key is not None else "unknown",
+                                                   [0, 0])
+                cell[0] += 1
+                cell[1] += hit
+
+    def row(key, compared, agreed):
+        a = ItemAgreement(code="", text="", compared=compared, agreed=agreed)
+        return {"key": key, "compared": compared, "agreed": agreed,
+                "rate": a.rate, "verdict": a.verdict}
+
+    return {
+        "window": window,
+        "threshold": THRESHOLD,
+        "rolling": {codes[i]: pts for i, pts in rolling.items() if pts},
+        "groups": {
+            d: {codes[i]: [row(k, *v) for k, v in cells.items()]
+                for i, cells in per_item.items() if cells}
+            for d, per_item in tally.items()
+        },
     }
@@ -1,6 +1,7 @@
 """morningreport — the command line half.
 
     morningreport score <transcript.vtt> <session-id>
+    morningreport batch <folder-or-glob>
     morningreport feedback <session-id>
     morningreport mark-sent <session-id>
     morningreport purge
@@ -19,11 +20,13 @@ from pathlib import Path
 
 import click
 
+from . import batch as bt
 from . import calibration as calib
 from . import feedback as fb
 from . import manifest as mf
 from . import model, rubric as rb, scoring, vtt
-from .roles import NameBoundary
+from .roles import NameBoundary, Redaction
+from .stats import StatsError
 from .store import Store, StoreError
 
 
@@ -47,19 +50,16 @@ def _store(ctx) -> Store:
 def _rubric(ctx):
     try:
         return rb.load(ctx.obj.get("rubric"))
-    except FileNotFoundError as e:
+    except (FileNotFoundError, rb.RubricError) as e:
         raise click.ClickException(str(e)) from e
 
 
 def _manifest(store: Store, session_id: str, explicit=None) -> mf.Manifest:
     if explicit:
         return mf.load(explicit)
-    for candidate in (
-        store.working(f"{session_id}.manifest.json"),
-        store.path("manifests", f"{session_id}.json"),
-    ):
-        if candidate.exists():
-            return mf.load(candidate)
+    found = bt.find_manifest(store, session_id)
+    if found:
+        return mf.load(found)
     raise click.ClickException(
         f"No manifest for {session_id}. Pass --manifest, or run "
         f"`morningreport manifest {session_id}` to write a template."
@@ -131,14 +131,21 @@ def manifest(ctx, session_id, force):
 @click.option("--show-api-payload", is_flag=True,
               help="Print exactly what would be sent, and send nothing.")
 @click.option("--dry-run", is_flag=True, help="Deterministic items only; no model calls.")
+@click.option("--incremental", is_flag=True,
+              help="Recompute only items whose inputs changed since the last score.")
 @click.option("--model", "model_name", default=model.MODEL, show_default=True)
 @click.pass_context
-def score(ctx, transcript, session_id, manifest_path, only, show_api_payload, dry_run, model_name):
+def score(ctx, transcript, session_id, manifest_path, only, show_api_payload, dry_run,
+          incremental, model_name):
     """Score a transcript against the rubric.
 
     Deterministic items are decided locally. Model items get one call
     each, carrying only the phase window the item is scoped to, with
     names already swapped for role tokens.
+
+    With --incremental, an item keeps its verdict from the working copy
+    unless the manifest fields, transcript window, prompt or model it was
+    scored from have changed; a human's verdict is always kept.
     """
     store = _store(ctx)
     rubric = _rubric(ctx)
@@ -171,8 +178,9 @@ def score(ctx, transcript, session_id, manifest_path, only, show_api_payload, dr
         if not items:
             raise click.ClickException("No model-scored items match that selection.")
         leaked = False
+        redaction = Redaction(boundary)
         for item in items:
-            payload = model.build_payload(item, tx, boundary, man)
+            payload = model.build_payload(item, tx, boundary, man, redaction)
             click.echo(click.style("=" * 72, dim=True))
             click.echo(click.style(f"{payload.code} — {item.text}", bold=True))
             click.echo(click.style("=" * 72, dim=True))
@@ -209,8 +217,15 @@ def score(ctx, transcript, session_id, manifest_path, only, show_api_payload, dr
         tail += f", confidence {conf:.2f})" if isinstance(conf, float) else ")"
         click.echo(f"  {item.code:3} {_mark(result.get('final_verdict'))}  {item.text[:52]}{tail}")
 
+    previous = None
+    if incremental:
+        previous = store.read("working", f"{session_id}.json")
+        if previous is None:
+            click.echo("No working copy to build on, so scoring everything.")
+
     session = scoring.score(rubric, tx, man, boundary, client=client, only=codes,
-                            board=board, dry_run=dry_run, on_item=progress)
+                            board=board, dry_run=dry_run, on_item=progress,
+                            previous=previous)
 
     working = scoring.to_working(session, man, rubric)
     working["scored"] = _now()
@@ -218,6 +233,9 @@ def score(ctx, transcript, session_id, manifest_path, only, show_api_payload, dr
     path = store.write(working, "working", f"{session_id}.json")
 
     click.echo()
+    if previous is not None:
+        click.echo(f"Recomputed {len(session.recomputed)} of {len(rubric.items)} item(s); "
+                   "the rest were unchanged.")
     click.echo(f"Struck {session.struck()} of {rubric.of()}."
                + (click.style("  Automatic fail triggered.", fg="red") if session.failed() else ""))
     if session.needs_review():
@@ -228,6 +246,60 @@ def score(ctx, transcript, session_id, manifest_path, only, show_api_payload, dr
     click.echo(f"Working copy at {path} — identified, and deleted after seven days.")
 
 
+# ------------------------------------------------------------------- batch
+
+@cli.command()
+@click.argument("target")
+@click.option("--jobs", default=4, show_default=True, help="Sessions scored at once.")
+@click.option("--rate", default=bt.RATE_PER_MINUTE, show_default=True,
+              help="Model calls per minute, shared by every session.")
+@click.option("--dry-run", is_flag=True, help="Deterministic items only; no model calls.")
+@click.option("--model", "model_name", default=model.MODEL, show_default=True)
+@click.pass_context
+def batch(ctx, target, jobs, rate, dry_run, model_name):
+    """Score every transcript in a folder, or matching a glob.
+
+    Each file is named for its session id, e.g. 2026-09-03-galveston.vtt,
+    and is paired with that session's manifest. Sessions are scored in
+    parallel; model calls from all of them share one rate limit.
+    """
+    store = _store(ctx)
+    files = bt.discover(target)
+    if not files:
+        raise click.ClickException(f"No .vtt files at {target}.")
+
+    if not dry_run and not model.Client().ready():
+        click.echo(click.style(
+            "No ANTHROPIC_API_KEY, so only the deterministic items will be scored.",
+            fg="yellow"), err=True)
+
+    run_jobs = [bt.Job(transcript=str(f), session_id=f.stem, root=str(store.root),
+                       rubric=ctx.obj.get("rubric"), dry_run=dry_run, model_name=model_name)
+                for f in files]
+
+    width = max(len(j.session_id) for j in run_jobs)
+
+    def row(o: bt.Outcome):
+        if ctx.obj.get("quiet") and o.ok:
+            return
+        if not o.ok:
+            click.echo(f"  {o.session_id:<{width}}  " + click.style(o.error, fg="red"))
+            return
+        fail = click.style("FAIL", fg="red") if o.failed else "    "
+        review = f"{len(o.needs_review)} to review" if o.needs_review else ""
+        click.echo(f"  {o.session_id:<{width}}  {o.struck:>2}/{o.of:<2}  {fail}  {review}")
+
+    click.echo(f"Scoring {len(run_jobs)} session(s), {max(1, jobs)} at a time.")
+    outcomes = bt.run(run_jobs, processes=jobs, per_minute=rate, on_done=row)
+
+    errors = [o for o in outcomes if not o.ok]
+    click.echo()
+    click.echo(f"Scored {len(outcomes) - len(errors)} of {len(outcomes)}. "
+               "Working copies are identified, and deleted after seven days.")
+    if errors:
+        raise click.ClickException(f"{len(errors)} session(s) could not be scored.")
+
+
 # ---------------------------------------------------------------- feedback
 
 @cli.command()
@@ -257,9 +329,14 @@ def feedback(ctx, session_id, dry_run, model_name):
         click.echo(click.style("No ANTHROPIC_API_KEY — drafting placeholders instead.", fg="yellow"), err=True)
         dry_run = True
 
-    drafts = fb.draft_all(working, rubric, client, boundary, dry_run=dry_run)
+    # drafts keyed by their substituted prompt, so an edit that leaves a
+    # role's note unchanged does not pay for it again; swept with the rest
+    cache = store.read("working", f"{session_id}.drafts.json") or {}
+    drafts = fb.draft_all(working, rubric, client, boundary, dry_run=dry_run, cache=cache)
     if not drafts:
         raise click.ClickException("No roles in the manifest, so there is nobody to write to.")
+    if cache:
+        store.write(cache, "working", f"{session_id}.drafts.json")
 
     for d in drafts:
         path = store.write_text(d.render(), "working", "emails", d.filename())
@@ -295,6 +372,8 @@ def mark_sent(ctx, session_id, yes):
     if not yes:
         click.echo(f"This will write sessions/{session_id}.json with no names in it, then delete:")
         click.echo(f"  working/{session_id}.json")
+        if store.working(f"{session_id}.drafts.json").exists():
+            click.echo(f"  working/{session_id}.drafts.json")
         for e in emails:
             click.echo(f"  working/emails/{e}")
         if store.path("manifests", f"{session_id}.json").exists():
@@ -308,6 +387,7 @@ def mark_sent(ctx, session_id, yes):
     click.echo(f"Wrote {path}")
 
     store.remove("working", f"{session_id}.json")
+    store.remove("working", f"{session_id}.drafts.json")
     for e in emails:
         store.remove("working", "emails", e)
     # the manifest IS the name-to-role mapping, so it goes too
@@ -362,8 +442,19 @@ def purge(ctx, days, everything, yes):
 
 @cli.command()
 @click.option("--json", "as_json", is_flag=True, help="Machine-readable.")
+@click.option("--stats", "with_stats", is_flag=True,
+              help="Add kappa, AC1, prevalence and bias, with bootstrap intervals.")
+@click.option("--conservative", is_flag=True,
+              help="Demote on the lower bound of agreement, not the point estimate.")
+@click.option("--resamples", type=int, help="Bootstrap resamples for --stats.")
+@click.option("--trend", is_flag=True,
+              help="Rolling agreement, and agreement by rubric version, prompt, block and site.")
+@click.option("--window", default=calib.WINDOW, show_default=True,
+              help="Comparisons in each rolling window, for --trend.")
+@click.option("--by", "dims", multiple=True, type=click.Choice(calib.DIMENSIONS),
+              help="Only these groupings, for --trend. Repeatable.")
 @click.pass_context
-def calibrate(ctx, as_json):
+def calibrate(ctx, as_json, with_stats, conservative, resamples, trend, window, dims):
     """Per-item agreement between the model and the human.
 
     Do not report aggregate findings to anyone until this has been run
@@ -373,14 +464,25 @@ def calibrate(ctx, as_json):
     store = _store(ctx)
     rubric = _rubric(ctx)
     sessions = [data for _, data in store.read_all("sessions")]
-    out = calib.compare(sessions, rubric)
+
+    if trend:
+        _trend(calib.trends(sessions, rubric, window=window, by=dims or calib.DIMENSIONS), as_json)
+        return
+    try:
+        out = calib.compare(sessions, rubric, stats=with_stats, conservative=conservative,
+                            resamples=resamples)
+    except StatsError as e:
+        raise click.ClickException(str(e)) from e
 
     if as_json:
         click.echo(json.dumps({
             "sessions": out["sessions"], "ready": out["ready"],
             "overall": out["overall"], "demote": out["demote"],
+            "conservative": conservative,
             "items": [{"code": a.code, "compared": a.compared, "agreed": a.agreed,
-                       "rate": a.rate, "verdict": a.verdict} for a in out["items"]],
+                       "rate": a.rate, "verdict": a.verdict,
+                       **({"stats": a.stats.as_dict()} if a.stats else {})}
+                      for a in out["items"]],
         }, indent=2))
         return
 
@@ -393,6 +495,12 @@ def calibrate(ctx, as_json):
         click.echo(f"Overall agreement where both rated: {out['overall']:.0%}")
     click.echo()
 
+    def num(x):
+        return f"{x:5.2f}" if x is not None else "    —"
+
+    def span(ci, fmt="{:.0%}"):
+        return (fmt.format(ci[0]) + "–" + fmt.format(ci[1])) if ci else "—"
+
     any_rows = False
     for a in out["items"]:
         if not a.compared:
@@ -400,20 +508,58 @@ def calibrate(ctx, as_json):
         any_rows = True
         colour = "green" if a.verdict == "keep" else "yellow" if a.verdict == "too few" else "red"
         rate = f"{a.rate:.0%}" if a.rate is not None else "  —"
-        click.echo(f"  {a.code:3} {rate:>5}  {a.agreed}/{a.compared:<3} "
-                   + click.style(a.verdict, fg=colour) + f"  {a.text[:44]}")
+        line = f"  {a.code:3} {rate:>5}  {a.agreed}/{a.compared:<3} "
+        if a.stats:
+            s = a.stats
+            line += (f"({span(s.agreement_ci):>9})  κ {num(s.kappa)}  AC1 {num(s.ac1)}  "
+                     f"prev {num(s.prevalence)}  bias {num(s.bias)}  ")
+        click.echo(line + click.style(a.verdict, fg=colour) + f"  {a.text[:44]}")
     if not any_rows:
         click.echo("No item has both a model verdict and a human verdict yet.")
         return
 
     if out["demote"]:
         click.echo()
+        basis = "the lower bound of " if conservative else ""
         click.echo(click.style(
-            "Below " + f"{out['threshold']:.0%}" + " agreement, so not trustworthy: "
+            "Below " + f"{out['threshold']:.0%}" + f" on {basis}agreement, so not trustworthy: "
             + ", ".join(out["demote"])
             + ". Demote these to human-only in the next rubric version.", fg="red"))
 
 
+def _trend(out: dict, as_json: bool):
+    if as_json:
+        click.echo(json.dumps(out, indent=2))
+        return
+    if not out["rolling"]:
+        click.echo("No item has both a model verdict and a human verdict yet.")
+        return
+
+    def pct(rate):
+        return f"{rate:.0%}" if rate is not None else "—"
+
+    click.echo(f"Rolling agreement, last {out['window']} comparisons, oldest to newest:")
+    for code, points in sorted(out["rolling"].items()):
+        latest = points[-1]["rate"]
+        colour = "green" if latest >= out["threshold"] else "red"
+        series = " ".join(f"{p['rate']:.0%}" for p in points[-8:])
+        click.echo(f"  {code:3} " + click.style(f"{pct(latest):>5}", fg=colour)
+                   + click.style(f"   {series}", dim=True))
+
+    for dim, per_item in out["groups"].items():
+        if not per_item:
+            continue
+        click.echo()
+        click.echo(f"By {dim.replace('_', ' ')}:")
+        for code, rows in sorted(per_item.items()):
+            cells = []
+            for r in rows:
+                colour = "green" if r["verdict"] == "keep" else "yellow" if r["verdict"] == "too few" else "red"
+                cells.append(f"{r['key']} " + click.style(pct(r["rate"]), fg=colour)
+                             + f" {r['agreed']}/{r['compared']}")
+            click.echo(f"  {code:3} " + "   ".join(cells))
+
+
 def main():
     try:
         cli(obj={})
@@ -204,4 +204,23 @@ SCORERS = {
     "one_block": score_a5,
 }
 
+# What each scorer reads: manifest fields, and the stretch of transcript
+# in seconds — None for all of it, False for none. The working copy keeps
+# a fingerprint of these, so `score --incremental` can tell which
+# verdicts an edit has made stale.
+READS = {
+    "deidentified": (("deidentified_confirmed",), None),
+    "eight_slides": (("slide_count",), False),
+    "board_posted": (("board_exported",), False),
+    "uninterrupted": (("roles",), (FIRST_PASS_START, FIRST_PASS_END)),
+    "faculty_early": (("roles",), None),
+    "ran_over": ((), None),
+    "one_block": (("roles",), None),
+}
+
 DEPENDENT = {"nothing_struck": score_f4}
+
+# What each dependent item waits for. The scheduler fires it as soon as
+# these have settled; a dependent with no entry here waits for every
+# other item, which is always safe and never fast.
+REQUIRES = {"nothing_struck": ("struck_reason",)}
@@ -17,12 +17,17 @@ Two rules the drafter enforces rather than hopes for:
 
 from __future__ import annotations
 
-import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from pathlib import Path
 
 from . import model
 
+MAX_TOKENS = 700
+
+# Notes drafted at once. Six roles, six independent calls.
+WORKERS = 6
+
 # Which rubric items belong to which role. A person is only ever coached
 # on something their own card asked of them.
 OWNED_BY = {
@@ -209,12 +214,31 @@ def subject_for(role: str) -> str:
     }.get(role.upper(), "Morning report — a quick note")
 
 
-def draft_all(working: dict, rubric, client, boundary, dry_run: bool = False) -> list[Draft]:
+def cache_key(model_name: str, payload: dict) -> str:
+    """What a draft depends on: the model and the substituted prompt."""
+    h = hashlib.sha256()
+    for part in (model_name, str(MAX_TOKENS), payload["system"], payload["user"]):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def draft_all(working: dict, rubric, client, boundary, dry_run: bool = False,
+              cache: dict | None = None, workers: int = WORKERS) -> list[Draft]:
+    """One draft per participant, in manifest order.
+
+    The calls are independent, so they run together and the whole set
+    takes about as long as the slowest note. `cache` maps
+    :func:`cache_key` to a drafted body; a role whose substituted prompt
+    has not changed since the last run is not drafted again, and new
+    drafts are added to it.
+    """
     results = {**working.get("items", {}), **working.get("automatic_fails", {})}
     block = working.get("block", "jul-sep")
     objective = working.get("objective", "")
-    drafts: list[Draft] = []
+    calling = not (dry_run or client is None or not client.ready())
 
+    planned = []
     for name, role in (working.get("roles") or {}).items():
         strength, improvement, withheld = choose(role, results, rubric, block)
         payload = build_payload(role, strength, improvement, block, objective)
@@ -226,17 +250,32 @@ def draft_all(working: dict, rubric, client, boundary, dry_run: bool = False) ->
             raise model.ModelError(
                 "refusing to draft: names survived substitution — " + ", ".join(residual)
             )
+        planned.append((name, role, strength, improvement, withheld, payload))
+
+    bodies: dict[int, str] = {}
+    if calling:
+        pending = {}
+        for n, (*_, payload) in enumerate(planned):
+            key = cache_key(client.model, payload)
+            if cache is not None and key in cache:
+                bodies[n] = cache[key]
+            else:
+                pending[n] = key
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as pool:
+                futures = {
+                    n: pool.submit(client.complete, planned[n][-1]["system"],
+                                   planned[n][-1]["user"], MAX_TOKENS)
+                    for n in pending
+                }
+                for n, future in futures.items():
+                    bodies[n] = future.result().strip()
+                    if cache is not None:
+                        cache[pending[n]] = bodies[n]
 
-        if dry_run or client is None or not client.ready():
-            body = _placeholder(role, strength, improvement)
-        else:
-            resp = client._sdk().messages.create(
-                model=client.model, max_tokens=700,
-                system=payload["system"],
-                messages=[{"role": "user", "content": payload["user"]}],
-            )
-            body = "".join(getattr(b, "text", "") for b in resp.content).strip()
-
+    drafts: list[Draft] = []
+    for n, (name, role, strength, improvement, withheld, _) in enumerate(planned):
+        body = bodies[n] if calling else _placeholder(role, strength, improvement)
         drafts.append(Draft(
             role=role.upper(), name=name, subject=subject_for(role), body=body,
             based_on={
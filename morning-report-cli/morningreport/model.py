@@ -13,9 +13,12 @@ calibration mode exists to measure.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
+import threading
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -64,6 +67,31 @@ class ModelError(RuntimeError):
     pass
 
 
+class RateLimiter:
+    """Spaces model calls evenly, across threads and across processes.
+
+    The slot clock lives in shared memory, so every worker in a batch
+    draws from the same budget however many sessions are in flight.
+    """
+
+    def __init__(self, per_minute: float):
+        import multiprocessing
+
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._lock = multiprocessing.Lock()
+        self._next = multiprocessing.Value("d", 0.0, lock=False)
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.value)
+            self._next.value = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 @dataclass
 class Payload:
     """Exactly what would be sent. Printed by --show-api-payload.
@@ -104,14 +132,30 @@ def has_prompt(code: str) -> bool:
     return prompt_path(code).exists()
 
 
-def build_payload(item, transcript, boundary, manifest=None) -> Payload:
-    """Assemble one item's call. Substitution happens here, once, for everything."""
-    from .roles import redact_transcript
+def prompt_version(code: str) -> str | None:
+    """A short hash of the prompt file, so an edit to it counts as a new version."""
+    p = prompt_path(code)
+    if not p.exists():
+        return None
+    return hashlib.sha256(p.read_bytes()).hexdigest()[:12]
+
+
+def build_payload(item, transcript, boundary, manifest=None, redaction=None) -> Payload:
+    """Assemble one item's call. Substitution happens here, once, for everything.
+
+    Pass the session's :class:`~morningreport.roles.Redaction` when
+    building several payloads, so cues shared between windows are
+    redacted once rather than once per item.
+    """
+    from .roles import Redaction
+
+    if redaction is None:
+        redaction = Redaction(boundary)
 
     window = WINDOWS.get(item.code.upper())
     slice_ = transcript.between(*window) if window else transcript
 
-    excerpt = redact_transcript(slice_, boundary)
+    excerpt = redaction.excerpt(slice_)
     if not excerpt.strip():
         excerpt = "(no transcript in this window)"
 
@@ -138,7 +182,8 @@ def build_payload(item, transcript, boundary, manifest=None) -> Payload:
     # instructions are authored here and contain no participant data,
     # but they do contain words like "chief complaint" that collide
     # with placeholder names.
-    residual = boundary.residual_names(excerpt + "\n" + "\n".join(context))
+    residual = sorted(set(redaction.residual_names(slice_))
+                      | set(boundary.residual_names("\n".join(context))))
 
     return Payload(
         code=item.code,
@@ -188,10 +233,13 @@ def parse_reply(text: str) -> dict:
 class Client:
     """Thin wrapper over the Anthropic SDK, with the boundary enforced."""
 
-    def __init__(self, api_key: str | None = None, model: str = MODEL):
+    def __init__(self, api_key: str | None = None, model: str = MODEL,
+                 limiter: RateLimiter | None = None):
         self.model = model
+        self.limiter = limiter
         self._key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         self._client = None
+        self._lock = threading.Lock()
 
     def ready(self) -> bool:
         return bool(self._key)
@@ -208,7 +256,10 @@ class Client:
             import anthropic
         except ImportError as e:
             raise ModelError("the anthropic package is not installed: pip install anthropic") from e
-        self._client = anthropic.Anthropic(api_key=self._key)
+        # scoring sends from several threads; build the SDK client once
+        with self._lock:
+            if self._client is None:
+                self._client = anthropic.Anthropic(api_key=self._key)
         return self._client
 
     def send(self, payload: Payload) -> dict:
@@ -219,12 +270,21 @@ class Client:
                 + ", ".join(payload.residual_names)
                 + ". This is a bug in the name boundary; report it rather than working around it."
             )
+        return parse_reply(self.complete(payload.system, payload.user))
+
+    def complete(self, system: str, user: str, max_tokens: int = MAX_TOKENS) -> str:
+        """One call, one text reply. Every call this tool makes goes through here.
+
+        Callers check their own payload against the boundary first;
+        :meth:`send` does it for scoring, the drafter for feedback.
+        """
         client = self._sdk()
+        if self.limiter is not None:
+            self.limiter.wait()
         resp = client.messages.create(
             model=self.model,
-            max_tokens=MAX_TOKENS,
-            system=payload.system,
-            messages=[{"role": "user", "content": payload.user}],
+            max_tokens=max_tokens,
+            system=system,
+            messages=[{"role": "user", "content": user}],
         )
-        text = "".join(getattr(b, "text", "") for b in resp.content)
-        return parse_reply(text)
+        return "".join(getattr(b, "text", "") for b in resp.content)
@@ -180,3 +180,41 @@ def redact_cue(cue, boundary: NameBoundary) -> str:
 
 def redact_transcript(transcript, boundary: NameBoundary) -> str:
     return "\n".join(redact_cue(c, boundary) for c in transcript)
+
+
+class Redaction:
+    """One session's transcript, redacted once per cue.
+
+    Several items share a window — B1, B2 and B3 all read 6–12 minutes,
+    and F1 covers nearly everything — so redacting per item repeats the
+    most expensive text operation in the tool on the same cues. This
+    redacts each cue the first time any window asks for it, keyed by cue
+    index, and assembles every excerpt from the cached lines.
+
+    The residual check is cached the same way. A name cannot span two
+    lines of an excerpt, so the residual names of an excerpt are exactly
+    the union of its lines'.
+    """
+
+    def __init__(self, boundary: NameBoundary):
+        self.boundary = boundary
+        self._lines: dict[int, str] = {}
+        self._residual: dict[int, list[str]] = {}
+
+    def line(self, cue) -> str:
+        line = self._lines.get(cue.index)
+        if line is None:
+            line = self._lines[cue.index] = redact_cue(cue, self.boundary)
+        return line
+
+    def excerpt(self, transcript) -> str:
+        return "\n".join(self.line(c) for c in transcript)
+
+    def residual_names(self, transcript) -> list[str]:
+        found: set[str] = set()
+        for c in transcript:
+            names = self._residual.get(c.index)
+            if names is None:
+                names = self._residual[c.index] = self.boundary.residual_names(self.line(c))
+            found.update(names)
+        return sorted(found)
@@ -3,13 +3,32 @@
 content/rubric.json lives in the site half. The CLI reads it rather than
 keeping a copy, so the printed card, the web form and the scorer cannot
 drift apart.
+
+Loading compiles it: items are indexed by id and by code, each is bound
+to its scorer, dependants, prompt file and phase window, and the whole
+thing is checked — an item that says it is scored from the transcript
+but has neither a prompt nor a scorer would otherwise just never get a
+verdict, silently. The parsed form is cached on disk, keyed by a hash of
+the JSON, so an edit to rubric.json is picked up the next time and
+nothing else is reparsed.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import dataclass
+import os
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import Callable
+
+from . import __version__
+
+CACHE_ENV = "MORNINGREPORT_CACHE"
+
+
+class RubricError(ValueError):
+    pass
 
 
 @dataclass(frozen=True)
@@ -34,6 +53,16 @@ class Item:
         return self.scored_from == "transcript"
 
 
+@dataclass(frozen=True)
+class Binding:
+    """What the code knows about one item, looked up once at compile time."""
+    scorer: Callable | None = None
+    dependent: Callable | None = None
+    requires: tuple[str, ...] = ()
+    prompt: Path | None = None
+    window: tuple[int, int] | None = None
+
+
 @dataclass
 class Rubric:
     version: int
@@ -41,21 +70,22 @@ class Rubric:
     lede: str
     footer: str
     items: list[Item]
+    bindings: dict[str, Binding] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        self._by_id = {i.id: i for i in self.items}
+        self._by_code = {i.code.upper(): i for i in self.items}
+        if not self.bindings:
+            self.bindings = bind(self.items)
 
     def __iter__(self):
         return iter(self.items)
 
     def by_code(self, code: str) -> Item | None:
-        for i in self.items:
-            if i.code.upper() == code.upper():
-                return i
-        return None
+        return self._by_code.get(code.upper())
 
     def by_id(self, item_id: str) -> Item | None:
-        for i in self.items:
-            if i.id == item_id:
-                return i
-        return None
+        return self._by_id.get(item_id)
 
     @property
     def scored_items(self) -> list[Item]:
@@ -69,12 +99,60 @@ class Rubric:
         return len(self.scored_items)
 
 
+def bind(items: list[Item]) -> dict[str, Binding]:
+    """Each item's scorer, dependants, prompt and window."""
+    from . import deterministic, model
+
+    out = {}
+    for item in items:
+        prompt = model.prompt_path(item.code)
+        out[item.id] = Binding(
+            scorer=deterministic.SCORERS.get(item.id),
+            dependent=deterministic.DEPENDENT.get(item.id),
+            requires=tuple(deterministic.REQUIRES.get(item.id, ())),
+            prompt=prompt if prompt.exists() else None,
+            window=model.WINDOWS.get(item.code.upper()),
+        )
+    return out
+
+
+def validate(rubric: Rubric) -> None:
+    """Refuse a rubric whose items could never be scored the way they say."""
+    problems = []
+    seen: set[str] = set()
+    for item in rubric.items:
+        b = rubric.bindings[item.id]
+        if item.code.upper() in seen:
+            problems.append(f"{item.code} appears twice")
+        seen.add(item.code.upper())
+        if item.scored_from == "transcript" and not (b.prompt or b.scorer):
+            problems.append(f"{item.code} is scored from the transcript but has no prompt "
+                            f"(prompts/{item.code.upper()}.md) and no scorer")
+        if item.scored_from == "timing" and not b.scorer:
+            problems.append(f"{item.code} is scored from timing but has no scorer")
+        if item.scored_from == "derived" and not (b.dependent or item.derived):
+            problems.append(f"{item.code} is derived but nothing derives it")
+        for r in b.requires:
+            if rubric.by_id(r) is None:
+                problems.append(f"{item.code} depends on {r}, which the rubric does not have")
+    if problems:
+        raise RubricError("the rubric does not match the code:\n  " + "\n  ".join(problems))
+
+
 def default_path() -> Path:
     """morning-report/content/rubric.json, relative to this package."""
     here = Path(__file__).resolve()
     return here.parents[2] / "morning-report" / "content" / "rubric.json"
 
 
+def cache_dir() -> Path:
+    base = os.environ.get(CACHE_ENV)
+    if base:
+        return Path(base).expanduser()
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    return (Path(xdg) if xdg else Path.home() / ".cache") / "morningreport"
+
+
 def load(path=None) -> Rubric:
     p = Path(path) if path else default_path()
     if not p.exists():
@@ -82,8 +160,50 @@ def load(path=None) -> Rubric:
             f"no rubric at {p}. Pass --rubric, or run from the repository so "
             "morning-report/content/rubric.json can be found."
         )
-    data = json.loads(p.read_text(encoding="utf-8"))
-
+    raw = p.read_bytes()
+    digest = hashlib.sha256(raw + __version__.encode()).hexdigest()[:16]
+    cached = cache_dir() / f"rubric-{digest}.json"
+
+    data = None
+    if cached.exists():
+        try:
+            data = json.loads(cached.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            data = None
+
+    if data is not None:
+        rubric = Rubric(
+            version=data["version"], title=data["title"], lede=data["lede"],
+            footer=data["footer"], items=[Item(**i) for i in data["items"]],
+        )
+    else:
+        rubric = parse(json.loads(raw.decode("utf-8")))
+
+    # prompt files and scorers live in code, not in the cache, so this
+    # runs every time; it is a dictionary lookup per item
+    validate(rubric)
+
+    if data is None:
+        _store_cache(cached, rubric)
+    return rubric
+
+
+def _store_cache(path: Path, rubric: Rubric) -> None:
+    """Best effort: a read-only home directory just means no cache."""
+    blob = {
+        "version": rubric.version, "title": rubric.title, "lede": rubric.lede,
+        "footer": rubric.footer, "items": [asdict(i) for i in rubric.items],
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(blob, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+    except OSError:
+        pass
+
+
+def parse(data: dict) -> Rubric:
     items: list[Item] = []
     for col in data.get("columns", []):
         for raw in col.get("items", []):
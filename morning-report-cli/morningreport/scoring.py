@@ -1,23 +1,32 @@
 """Putting a session together.
 
-Order matters: deterministic items first, then the model items one at a
-time, then the items derived from others. Whatever the board and the
-human already supplied wins over the model, because those are not
+Each item is a node in a small dependency graph: what the board settled,
+then its deterministic scorer, then its model call, then anything derived
+from other items. Model calls run concurrently, since each is its own
+call; derived items wait only for what they read. Whatever the board and
+the human already supplied wins over the model, because those are not
 guesses.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 
 from . import deterministic, model
-from .roles import NameBoundary
+from .roles import NameBoundary, Redaction
 from .vtt import Transcript
 
 # Precedence when two sources have an opinion. Higher wins.
 PRECEDENCE = {"model": 0, "timing": 1, "transcript": 1, "derived": 1,
               "manifest": 2, "board": 2, "human": 3}
 
+# Model calls in flight at once. Each item is its own call, so the wait
+# is the network rather than anything here.
+WORKERS = 4
+
 
 @dataclass
 class Session:
@@ -29,6 +38,9 @@ class Session:
     items: dict = field(default_factory=dict)
     fails: dict = field(default_factory=dict)
     notes: list = field(default_factory=list)
+    fingerprints: dict = field(default_factory=dict)
+    recomputed: list = field(default_factory=list)
+    prompt_versions: dict = field(default_factory=dict)
 
     def all_results(self) -> dict:
         return {**self.items, **self.fails}
@@ -96,10 +108,136 @@ def merge(existing: dict, incoming: dict, item) -> dict:
     return out
 
 
+@dataclass(frozen=True)
+class Node:
+    """One rubric item in the scoring graph.
+
+    `sources` are the stages that may give it a verdict, in the order
+    they are consulted; `requires` are the items that must settle before
+    its derived stage can run.
+    """
+    item: object
+    sources: tuple[str, ...]
+    requires: tuple[str, ...] = ()
+    binding: object = None
+
+
+def compile_graph(rubric) -> dict[str, Node]:
+    """The rubric as a dependency graph, in rubric order.
+
+    Built from the bindings the rubric was compiled with, so adding a
+    derived item is an entry in ``deterministic.DEPENDENT`` and one in
+    ``deterministic.REQUIRES``; nothing here changes.
+    """
+    ids = [item.id for item in rubric.items]
+    dependent = {i for i, b in rubric.bindings.items() if b.dependent}
+    graph: dict[str, Node] = {}
+    for item in rubric.items:
+        b = rubric.bindings[item.id]
+        sources = []
+        if item.derived:
+            sources.append("board")
+        if b.scorer:
+            sources.append("deterministic")
+        if item.model_scored and b.prompt:
+            sources.append("model")
+        requires: tuple[str, ...] = ()
+        if b.dependent:
+            sources.append("derived")
+            requires = b.requires or tuple(i for i in ids if i not in dependent)
+        unknown = [r for r in requires if r not in ids]
+        if unknown:
+            raise ValueError(f"{item.code} depends on {', '.join(unknown)}, which the rubric does not have")
+        graph[item.id] = Node(item=item, sources=tuple(sources), requires=requires, binding=b)
+
+    # a cycle would leave its items waiting forever, so refuse it up front
+    state: dict[str, int] = {}
+
+    def visit(item_id, path):
+        if state.get(item_id) == 2:
+            return
+        if state.get(item_id) == 1:
+            raise ValueError("circular dependency: " + " -> ".join(path + [item_id]))
+        state[item_id] = 1
+        for r in graph[item_id].requires:
+            visit(r, path + [item_id])
+        state[item_id] = 2
+
+    for item_id in graph:
+        visit(item_id, [])
+    return graph
+
+
+def _window_hash(transcript: Transcript, window) -> str | None:
+    if window is False:
+        return None
+    cues = transcript.between(*window) if window else transcript
+    h = hashlib.sha256()
+    for c in cues:
+        h.update(f"{c.start}|{c.end}|{c.speaker}|{c.text}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def fingerprint(node: Node, manifest, transcript: Transcript, board=None,
+                model_name: str = model.MODEL, _windows=None) -> str:
+    """A hash of everything an item's verdict was computed from.
+
+    Manifest fields its scorer reads, the transcript window it sees, the
+    prompt file and the model. Derived stages are not included: they are
+    cheap, and always re-run.
+    """
+    item = node.item
+    windows = _windows if _windows is not None else {}
+
+    def window(w):
+        key = repr(w)
+        if key not in windows:
+            windows[key] = _window_hash(transcript, w)
+        return windows[key]
+
+    def fields(names):
+        out = {}
+        for name in names:
+            value = getattr(manifest, name)
+            out[name] = sorted(value.items()) if isinstance(value, dict) else value
+        return out
+
+    parts: dict = {"sources": node.sources}
+    if "board" in node.sources:
+        key = item.derived.lstrip("!")
+        parts["board"] = ((board or {}).get("derived") or {}).get(key)
+    if "deterministic" in node.sources:
+        names, w = deterministic.READS.get(item.id, (("roles",), None))
+        parts["deterministic"] = {"manifest": fields(names), "transcript": window(w)}
+    if "model" in node.sources:
+        parts["model"] = {
+            "manifest": fields(("objective", "roles")),
+            "transcript": window(model.WINDOWS.get(item.code.upper())),
+            "prompt": model.prompt_version(item.code),
+            "model": model_name,
+        }
+    blob = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
 def score(rubric, transcript: Transcript, manifest, boundary: NameBoundary,
           client: model.Client | None = None, only: list[str] | None = None,
-          board=None, dry_run: bool = False, on_item=None) -> Session:
-    """Score a session. `only` restricts to given item codes."""
+          board=None, dry_run: bool = False, on_item=None,
+          workers: int = WORKERS, previous: dict | None = None) -> Session:
+    """Score a session. `only` restricts to given item codes.
+
+    With `previous` — an earlier working record for the same session —
+    an item whose fingerprint has not changed keeps its earlier result
+    and makes no call, as does anything a human has already settled.
+    Derived items are re-derived either way.
+
+    Each item runs its stages in order — board, deterministic, model,
+    derived — and precedence is settled by :func:`merge` whatever order
+    the opinions arrive in. Model calls are independent of one another,
+    so up to `workers` are in flight at once, and a derived item fires
+    as soon as the items it reads from have settled rather than after
+    everything else.
+    """
     session = Session(
         session_id=manifest.session_id,
         date=manifest.session_date,
@@ -109,81 +247,126 @@ def score(rubric, transcript: Transcript, manifest, boundary: NameBoundary,
     )
 
     wanted = {c.upper() for c in only} if only else None
+    graph = compile_graph(rubric)
+    # which prompt each model item was asked with, so calibration can
+    # tell a prompt fix from the history it is pooled with
+    session.prompt_versions = {
+        node.item.code: model.prompt_version(node.item.code)
+        for node in graph.values() if "model" in node.sources
+    }
+    notes: dict[str, list[str]] = {item_id: [] for item_id in graph}
+    calling = not (dry_run or client is None or not client.ready())
 
     for item in rubric.items:
         bucket = session.fails if item.is_fail else session.items
         bucket[item.id] = blank_result(item)
 
-    # 1. what the board already settled — deterministic, and not a guess
-    if board:
-        derived = board.get("derived") or {}
-        for item in rubric.items:
+    def bucket_for(item):
+        return session.fails if item.is_fail else session.items
+
+    derived = (board or {}).get("derived") or {}
+    redaction = Redaction(boundary)
+    waiting = {item_id: set(node.requires) for item_id, node in graph.items()}
+    dependants: dict[str, list[str]] = {item_id: [] for item_id in graph}
+    for item_id, node in graph.items():
+        for r in node.requires:
+            dependants[r].append(item_id)
+
+    in_flight: dict = {}
+    model_name = getattr(client, "model", None) or model.MODEL
+    prev_results = {**((previous or {}).get("items") or {}),
+                    **((previous or {}).get("automatic_fails") or {})}
+    prev_prints = (previous or {}).get("fingerprints") or {}
+    windows: dict = {}
+
+    def start(node: Node, pool):
+        item = node.item
+        bucket = bucket_for(item)
+        selected = not wanted or item.code.upper() in wanted
+        fp = fingerprint(node, manifest, transcript, board, model_name, windows)
+
+        if previous is not None and "derived" not in node.sources:
+            before = prev_results.get(item.id)
+            human = bool(before) and before.get("source") == "human" \
+                and before.get("final_verdict") is not None
+            if before and (human or prev_prints.get(item.id) == fp):
+                bucket[item.id] = dict(before)
+                if item.id in prev_prints:
+                    session.fingerprints[item.id] = prev_prints[item.id]
+                finish(node, pool)
+                return
+        session.recomputed.append(item.id)
+
+        # what the board already settled — deterministic, and not a guess
+        if "board" in node.sources:
             key = item.derived
-            if not key:
-                continue
             neg = key.startswith("!")
             k = key[1:] if neg else key
-            if k not in derived or derived[k] is None:
-                continue
-            value = not derived[k] if neg else bool(derived[k])
-            bucket = session.fails if item.is_fail else session.items
-            bucket[item.id] = merge(
-                bucket[item.id],
-                {"final_verdict": value, "source": "board",
-                 "why": f"From the board archive ({k})."},
-                item,
-            )
-
-    # 2. deterministic scorers
-    for item in rubric.items:
-        if wanted and item.code.upper() not in wanted:
-            continue
-        fn = deterministic.SCORERS.get(item.id)
-        if not fn:
-            continue
-        bucket = session.fails if item.is_fail else session.items
-        if bucket[item.id]["source"] == "board":
-            continue
-        result = fn(manifest, transcript, boundary)
-        bucket[item.id] = merge(bucket[item.id], result, item)
-        if on_item:
-            on_item(item, bucket[item.id])
-
-    # 3. model items, one call each
-    for item in rubric.items:
-        if wanted and item.code.upper() not in wanted:
-            continue
-        if not item.model_scored or not model.has_prompt(item.code):
-            continue
-        bucket = session.fails if item.is_fail else session.items
-        if bucket[item.id]["source"] in ("board", "manifest"):
-            continue
-        if dry_run or client is None or not client.ready():
-            session.notes.append(f"{item.code}: not scored (no model call made)")
-            continue
-        payload = model.build_payload(item, transcript, boundary, manifest)
-        try:
-            reply = client.send(payload)
-        except model.ModelError as e:
-            session.notes.append(f"{item.code}: {e}")
-            continue
-        reply["source"] = "model"
-        bucket[item.id] = merge(bucket[item.id], reply, item)
-        if on_item:
-            on_item(item, bucket[item.id])
-
-    # 4. items derived from other items
-    for item in rubric.items:
-        fn = deterministic.DEPENDENT.get(item.id)
-        if not fn:
-            continue
-        bucket = session.fails if item.is_fail else session.items
-        if bucket[item.id]["source"] in ("board", "human"):
-            continue
-        result = fn(manifest, transcript, boundary, session.items)
-        if result.get("final_verdict") is not None:
+            if derived.get(k) is not None:
+                value = not derived[k] if neg else bool(derived[k])
+                bucket[item.id] = merge(
+                    bucket[item.id],
+                    {"final_verdict": value, "source": "board",
+                     "why": f"From the board archive ({k})."},
+                    item,
+                )
+
+        if "deterministic" in node.sources and selected and bucket[item.id]["source"] != "board":
+            result = node.binding.scorer(manifest, transcript, boundary)
             bucket[item.id] = merge(bucket[item.id], result, item)
-
+            if on_item:
+                on_item(item, bucket[item.id])
+
+        if "model" in node.sources and selected and bucket[item.id]["source"] not in ("board", "manifest"):
+            if not calling:
+                notes[item.id].append(f"{item.code}: not scored (no model call made)")
+            else:
+                payload = model.build_payload(item, transcript, boundary, manifest, redaction)
+                in_flight[pool.submit(client.send, payload)] = (node, fp)
+                return
+        elif selected:
+            # every stage that could speak has spoken; remember what it saw
+            session.fingerprints[item.id] = fp
+
+        finish(node, pool)
+
+    def finish(node: Node, pool):
+        item = node.item
+        if "derived" in node.sources:
+            bucket = bucket_for(item)
+            if bucket[item.id]["source"] not in ("board", "human"):
+                result = node.binding.dependent(manifest, transcript, boundary, session.items)
+                if result.get("final_verdict") is not None:
+                    bucket[item.id] = merge(bucket[item.id], result, item)
+        for d in dependants[item.id]:
+            waiting[d].discard(item.id)
+            if not waiting[d]:
+                start(graph[d], pool)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for item_id, node in graph.items():
+            if not node.requires:
+                start(node, pool)
+        while in_flight:
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in done:
+                node, fp = in_flight.pop(future)
+                item = node.item
+                try:
+                    reply = future.result()
+                except model.ModelError as e:
+                    notes[item.id].append(f"{item.code}: {e}")
+                else:
+                    reply["source"] = "model"
+                    bucket = bucket_for(item)
+                    bucket[item.id] = merge(bucket[item.id], reply, item)
+                    session.fingerprints[item.id] = fp
+                    if on_item:
+                        on_item(item, bucket[item.id])
+                finish(node, pool)
+
+    # notes in rubric order, however the calls happened to finish
+    session.notes.extend(n for item_id in graph for n in notes[item_id])
     return session
 
 
@@ -204,6 +387,8 @@ def to_working(session: Session, manifest, rubric) -> dict:
         "failed": session.failed(),
         "needs_review": session.needs_review(),
         "notes": session.notes,
+        "fingerprints": session.fingerprints,
+        "prompt_versions": session.prompt_versions,
         "identified": True,
         "_warning": "Identified and ephemeral. Deleted by mark-sent, and by the 7-day sweep regardless.",
     }
@@ -233,6 +418,7 @@ def to_deidentified(working: dict, rubric) -> dict:
         "site": working["site"],
         "block": working.get("block"),
         "rubric_version": working.get("rubric_version"),
+        "prompt_versions": working.get("prompt_versions"),
         "items": strip(working.get("items", {})),
         "automatic_fails": strip(working.get("automatic_fails", {})),
         "struck": working.get("struck"),
@@ -0,0 +1,190 @@
+"""Inter-rater statistics for calibration.
+
+Raw agreement flatters an item that is almost always true: if the human
+says yes in nineteen sessions of twenty, a model that always says yes
+agrees 95% of the time and has learned nothing. This reports, per item,
+the chance-corrected measures alongside it:
+
+* Cohen's kappa, the usual correction, which collapses when prevalence
+  is extreme — the paradox that makes it unfair to exactly these items;
+* Gwet's AC1, which stays stable there;
+* the prevalence and bias indices, so a reader can see which of the two
+  is distorting kappa;
+* bootstrap confidence intervals for all three, since ten sessions is a
+  small sample and a point estimate alone says nothing about that.
+
+Everything is computed over a sessions × items verdict matrix with NumPy.
+Resampling an item's sessions with replacement is a multinomial draw over
+its four agree/disagree cells, so every resample for every item comes
+from one vectorised call.
+
+NumPy is optional: ``pip install -e ".[stats]"``.
+"""
+
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass
+
+RESAMPLES = 10_000
+LEVEL = 0.95
+
+
+class StatsError(RuntimeError):
+    pass
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise StatsError('the statistics need NumPy: pip install -e ".[stats]"') from e
+    return numpy
+
+
+@dataclass
+class ItemStats:
+    code: str
+    n: int
+    cells: tuple[int, int, int, int]     # both yes, model only, human only, both no
+    agreement: float | None
+    kappa: float | None
+    ac1: float | None
+    prevalence: float | None
+    bias: float | None
+    agreement_ci: tuple[float, float] | None
+    kappa_ci: tuple[float, float] | None
+    ac1_ci: tuple[float, float] | None
+
+    def as_dict(self) -> dict:
+        return {
+            "code": self.code, "n": self.n, "cells": list(self.cells),
+            "agreement": self.agreement, "kappa": self.kappa, "ac1": self.ac1,
+            "prevalence_index": self.prevalence, "bias_index": self.bias,
+            "agreement_ci": list(self.agreement_ci) if self.agreement_ci else None,
+            "kappa_ci": list(self.kappa_ci) if self.kappa_ci else None,
+            "ac1_ci": list(self.ac1_ci) if self.ac1_ci else None,
+        }
+
+
+def matrix(sessions: list[dict], rubric):
+    """Model and final verdicts as two sessions × items arrays.
+
+    1.0 for yes, 0.0 for no, NaN where that rater gave no verdict.
+    """
+    np = _numpy()
+    ids = [item.id for item in rubric.items]
+    column = {item_id: j for j, item_id in enumerate(ids)}
+    model_v = np.full((len(sessions), len(ids)), np.nan)
+    final_v = np.full((len(sessions), len(ids)), np.nan)
+    for i, s in enumerate(sessions):
+        results = {**(s.get("items") or {}), **(s.get("automatic_fails") or {})}
+        for item_id, r in results.items():
+            j = column.get(item_id)
+            if j is None:
+                continue
+            if r.get("model_verdict") is not None:
+                model_v[i, j] = float(bool(r["model_verdict"]))
+            if r.get("final_verdict") is not None:
+                final_v[i, j] = float(bool(r["final_verdict"]))
+    return ids, model_v, final_v
+
+
+def cells(model_v, final_v):
+    """The 2×2 table per item, as an items × 4 array of counts."""
+    np = _numpy()
+    both = ~np.isnan(model_v) & ~np.isnan(final_v)
+    m = (model_v == 1) & both
+    f = (final_v == 1) & both
+    return np.stack([
+        (m & f).sum(axis=0),
+        (m & ~f & both).sum(axis=0),
+        (~m & f & both).sum(axis=0),
+        (~m & ~f & both).sum(axis=0),
+    ], axis=-1)
+
+
+def measures(counts):
+    """Agreement, kappa, AC1, prevalence and bias from counts of shape (..., 4)."""
+    np = _numpy()
+    counts = np.asarray(counts, dtype=float)
+    a, b, c, d = (counts[..., k] for k in range(4))
+    n = counts.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        po = (a + d) / n
+        p_model = (a + b) / n
+        p_human = (a + c) / n
+        pe_kappa = p_model * p_human + (1 - p_model) * (1 - p_human)
+        kappa = (po - pe_kappa) / (1 - pe_kappa)
+        pi = (p_model + p_human) / 2
+        pe_ac1 = 2 * pi * (1 - pi)
+        ac1 = (po - pe_ac1) / (1 - pe_ac1)
+        prevalence = np.abs(a - d) / n
+        bias = np.abs(b - c) / n
+    return {"agreement": po, "kappa": kappa, "ac1": ac1,
+            "prevalence": prevalence, "bias": bias}
+
+
+def bootstrap(counts, resamples: int = RESAMPLES, level: float = LEVEL, seed=None):
+    """Percentile intervals for agreement, kappa and AC1, per item.
+
+    Returns {measure: items × 2 array of (low, high)}, NaN for an item
+    with nothing to resample.
+    """
+    np = _numpy()
+    counts = np.asarray(counts, dtype=np.int64)
+    n = counts.sum(axis=-1)
+    has = n > 0
+    out = {k: np.full((len(counts), 2), np.nan) for k in ("agreement", "kappa", "ac1")}
+    if not has.any() or resamples <= 0:
+        return out
+
+    rng = np.random.default_rng(seed)
+    p = counts[has] / n[has, None]
+    draws = rng.multinomial(n[has], p, size=(resamples, int(has.sum())))
+    stats = measures(draws)
+    tail = (1 - level) / 2 * 100
+    with warnings.catch_warnings():
+        # an item whose kappa is undefined in every resample is NaN, not news
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for k in out:
+            lo, hi = np.nanpercentile(stats[k], [tail, 100 - tail], axis=0)
+            out[k][has, 0] = lo
+            out[k][has, 1] = hi
+    return out
+
+
+def agreement(sessions: list[dict], rubric, resamples: int = RESAMPLES,
+              level: float = LEVEL, seed=None) -> dict[str, ItemStats]:
+    """Per-item inter-rater statistics, keyed by item id."""
+    np = _numpy()
+    ids, model_v, final_v = matrix(sessions, rubric)
+    counts = cells(model_v, final_v)
+    point = measures(counts)
+    ci = bootstrap(counts, resamples=resamples, level=level, seed=seed)
+
+    def num(x):
+        x = float(x)
+        return x if np.isfinite(x) else None
+
+    def interval(row):
+        lo, hi = num(row[0]), num(row[1])
+        return (lo, hi) if lo is not None and hi is not None else None
+
+    codes = {item.id: item.code for item in rubric.items}
+    out = {}
+    for j, item_id in enumerate(ids):
+        out[item_id] = ItemStats(
+            code=codes[item_id],
+            n=int(counts[j].sum()),
+            cells=tuple(int(x) for x in counts[j]),
+            agreement=num(point["agreement"][j]),
+            kappa=num(point["kappa"][j]),
+            ac1=num(point["ac1"][j]),
+            prevalence=num(point["prevalence"][j]),
+            bias=num(point["bias"][j]),
+            agreement_ci=interval(ci["agreement"][j]),
+            kappa_ci=interval(ci["kappa"][j]),
+            ac1_ci=interval(ci["ac1"][j]),
+        )
+    return out
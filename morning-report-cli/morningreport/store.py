@@ -173,6 +173,10 @@ class Store:
         bookkeeping. Used by mark-sent to prove the purge finished, and
         by the tests, which assert a resident's name appears nowhere
         outside roster.json afterwards.
+
+        Files are read a line at a time; a name is never split across
+        lines, and the data folder can hold transcripts far bigger than
+        it is sensible to read whole.
         """
         import re
 
@@ -185,8 +189,9 @@ class Store:
             if rel in skip:
                 continue
             try:
-                if pattern.search(p.read_text(encoding="utf-8", errors="ignore")):
-                    hits.append(rel)
+                with p.open(encoding="utf-8", errors="ignore") as f:
+                    if any(pattern.search(line) for line in f):
+                        hits.append(rel)
             except OSError:
                 continue
         return sorted(hits)
@@ -43,7 +43,7 @@ def format_timestamp(seconds: float) -> str:
     return f"{seconds // 60:02d}:{seconds % 60:02d}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Cue:
     index: int
     start: float
@@ -90,65 +90,90 @@ class Transcript:
     def by_speaker(self, name: str) -> "Transcript":
         return Transcript([c for c in self.cues if c.speaker == name])
 
+    def lines(self) -> Iterator[str]:
+        """The transcript as text, a line at a time."""
+        for c in self.cues:
+            yield f"[{c.stamp}] {c.speaker or 'UNKNOWN'}: {c.text}"
+
     def text(self) -> str:
-        return "\n".join(
-            f"[{c.stamp}] {c.speaker or 'UNKNOWN'}: {c.text}" for c in self.cues
-        )
+        """All of it as one string. Prefer `lines` for anything long."""
+        return "\n".join(self.lines())
 
 
 def parse(source: str | Iterable[str]) -> Transcript:
-    """Parse WebVTT text into cues. Tolerant: Zoom's output is not always tidy."""
-    if isinstance(source, str):
-        lines = source.splitlines()
-    else:
-        lines = list(source)
+    """Parse WebVTT text into cues. Tolerant: Zoom's output is not always tidy.
+
+    One pass over the lines, holding only the cue being read — an hour's
+    transcript is never in memory as a list of lines as well as a list
+    of cues. `source` may be the text or any iterable of lines, such as
+    an open file.
+    """
+    lines = _lines(source) if isinstance(source, str) else source
 
     cues: list[Cue] = []
-    i = 0
-    n = len(lines)
-    index = 0
-
-    while i < n:
-        line = lines[i].strip()
-        if not line or line.upper().startswith("WEBVTT") or line.startswith("NOTE"):
-            i += 1
-            continue
-
-        m = TIMING.match(line)
-        if not m:
-            # a cue identifier, or junk; either way the timing is next
-            i += 1
-            continue
-
-        start = parse_timestamp(m.group("start"))
-        end = parse_timestamp(m.group("end"))
-        i += 1
-
-        payload: list[str] = []
-        while i < n and lines[i].strip() and not TIMING.match(lines[i].strip()):
-            payload.append(lines[i].strip())
-            i += 1
-
-        body = " ".join(payload).strip()
-        if not body:
-            continue
-
-        speaker = None
-        sm = SPEAKER.match(body)
-        if sm:
-            candidate = sm.group("name").strip()
-            # "38.6" or "Next" are not speakers; a speaker label is short and wordy
-            if candidate and len(candidate.split()) <= 5 and not candidate.replace(".", "").isdigit():
-                speaker = candidate
-                body = sm.group("text").strip()
-
-        index += 1
-        cues.append(Cue(index=index, start=start, end=end, speaker=speaker, text=body))
+    timing = None
+    payload: list[str] = []
+
+    for raw in lines:
+        line = raw.strip()
+        m = TIMING.match(line) if line else None
+
+        if timing is not None:
+            if line and not m:
+                payload.append(line)
+                continue
+            cue = _cue(len(cues) + 1, timing, payload)
+            if cue is not None:
+                cues.append(cue)
+            timing, payload = None, []
+
+        if m:
+            timing = (parse_timestamp(m.group("start")), parse_timestamp(m.group("end")))
+        # otherwise a blank line, the header, a NOTE, a cue identifier or junk
+
+    if timing is not None:
+        cue = _cue(len(cues) + 1, timing, payload)
+        if cue is not None:
+            cues.append(cue)
 
     return Transcript(cues)
 
 
+def _lines(text: str) -> Iterator[str]:
+    """The lines of `text`, one at a time, without splitting it all up front."""
+    if "\n" not in text:
+        yield from text.splitlines()        # a single line, or old Mac line endings
+        return
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _cue(index: int, timing: tuple[float, float], payload: list[str]) -> Cue | None:
+    body = " ".join(payload).strip()
+    if not body:
+        return None
+
+    speaker = None
+    sm = SPEAKER.match(body)
+    if sm:
+        candidate = sm.group("name").strip()
+        # "38.6" or "Next" are not speakers; a speaker label is short and wordy
+        if candidate and len(candidate.split()) <= 5 and not candidate.replace(".", "").isdigit():
+            speaker = candidate
+            body = sm.group("text").strip()
+
+    return Cue(index=index, start=timing[0], end=timing[1], speaker=speaker, text=body)
+
+
 def parse_file(path) -> Transcript:
+    """Parse a .vtt file, streaming it rather than reading it whole."""
     from pathlib import Path
 
-    return parse(Path(path).read_text(encoding="utf-8-sig"))
+    with Path(path).open(encoding="utf-8-sig") as f:
+        return parse(f)
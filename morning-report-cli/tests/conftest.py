@@ -1,4 +1,5 @@
 import json
+import os
 import shutil
 from pathlib import Path
 
@@ -13,8 +14,20 @@ from morningreport.store import Store
 FIXTURES = Path(__file__).parent / "fixtures"
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _rubric_cache(tmp_path_factory):
+    """Keep the compiled-rubric cache out of the home directory."""
+    before = os.environ.get(rb.CACHE_ENV)
+    os.environ[rb.CACHE_ENV] = str(tmp_path_factory.mktemp("cache"))
+    yield
+    if before is None:
+        os.environ.pop(rb.CACHE_ENV, None)
+    else:
+        os.environ[rb.CACHE_ENV] = before
+
+
 @pytest.fixture(scope="session")
-def rubric():
+def rubric(_rubric_cache):
     return rb.load()
 
 
@@ -0,0 +1,37 @@
+"""The benchmark harness itself, at a size that costs nothing.
+
+Timings are not asserted — they belong to the machine — only that the
+generator produces what it says and the regression check catches one.
+"""
+
+from benchmarks import synth, timing
+from morningreport import vtt
+from morningreport.roles import NameBoundary
+
+
+def test_synthetic_transcript_shape():
+    tx = vtt.parse(synth.generate(300, name_density=0.5, seed=1))
+    assert len(tx) == 300
+    assert set(tx.speakers) <= set(synth.ROLES)
+    assert 1400 < tx.duration <= 1500
+    boundary = NameBoundary(synth.manifest().roles)
+    assert boundary.residual_names(tx.text())          # names were planted
+    assert not boundary.unmapped_speakers(tx.speakers)
+    assert synth.generate(50, seed=3) == synth.generate(50, seed=3)
+
+
+def test_every_operation_runs():
+    out = timing.run(sizes=[50], repeats=1)
+    assert set(out["results"]) == {
+        "vtt.parse", "NameBoundary.substitute", "NameBoundary.residual_names",
+        "phi.scan", "deterministic", "model.build_payload", "Store.grep",
+    }
+    assert all(r["50"] >= 0 for r in out["results"].values())
+
+
+def test_regression_check():
+    base = {"results": {"vtt.parse": {"1000": 0.010}, "phi.scan": {"1000": 0.050}}}
+    now = {"results": {"vtt.parse": {"1000": 0.020, "100": 1.0}, "phi.scan": {"1000": 0.055}}}
+    slower = timing.regressions(now, base, threshold=0.25)
+    assert len(slower) == 1 and slower[0].startswith("vtt.parse at 1000 cues")
+    assert timing.regressions(now, base, threshold=1.5) == []
@@ -94,3 +94,30 @@ def test_role_tokens_are_the_only_speakers_in_a_payload(rubric, load_tx, man, bo
     assert speakers
     assert speakers <= {"[PRESENTER]", "[SCRIBE]", "[PGY1]", "[SENIOR]",
                         "[FACULTY]", "[FACILITATOR]", "[OTHER]"}
+
+
+def test_shared_windows_are_redacted_once(rubric, load_tx, man, boundary):
+    """B1, B2 and B3 share a window; each cue is substituted once per session."""
+    from morningreport.roles import Redaction
+    tx = load_tx("clean.vtt")
+    calls = []
+    original = boundary.substitute
+
+    def counting(text):
+        calls.append(text)
+        return original(text)
+
+    boundary.substitute = counting
+    redaction = Redaction(boundary)
+    cached = {}
+    for item in rubric.items:
+        if item.model_scored and model.has_prompt(item.code):
+            cached[item.code] = model.build_payload(item, tx, boundary, man, redaction)
+    cue_calls = [c for c in calls if c != man.objective]
+    assert len(cue_calls) <= len(tx)
+
+    boundary.substitute = original
+    for code, payload in cached.items():
+        fresh = model.build_payload(rubric.by_code(code), tx, boundary, man)
+        assert payload.user == fresh.user, code
+        assert payload.residual_names == fresh.residual_names, code
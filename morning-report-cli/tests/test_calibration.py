@@ -0,0 +1,81 @@
+"""Measuring the second rater: raw agreement, and what it hides."""
+
+import pytest
+
+from morningreport import calibration as calib
+
+
+def sessions(pairs, item_id="framework_first"):
+    """One de-identified session per (model, human) pair for one item."""
+    return [{"id": f"s{n}", "items": {item_id: {"model_verdict": m, "final_verdict": h}}}
+            for n, (m, h) in enumerate(pairs)]
+
+
+def test_agreement_counts_only_where_both_rated(rubric):
+    out = calib.compare(sessions([(True, True), (False, True), (None, True), (True, None)]), rubric)
+    row = next(a for a in out["items"] if a.code == "B5")
+    assert (row.agreed, row.compared) == (1, 2)
+    assert row.verdict == "too few"
+
+
+def test_a_weak_item_is_demoted(rubric):
+    out = calib.compare(sessions([(True, True)] * 6 + [(True, False)] * 4), rubric)
+    assert out["demote"] == ["B5"]
+
+
+def test_kappa_and_ac1_on_a_known_table(rubric):
+    pytest.importorskip("numpy")
+    from morningreport import stats
+    counts = [[45, 5, 5, 45], [90, 5, 5, 0]]
+    m = stats.measures(counts)
+    assert m["agreement"].tolist() == pytest.approx([0.9, 0.9])
+    assert m["kappa"][0] == pytest.approx(0.8)
+    # same raw agreement, but at 95% prevalence kappa collapses and AC1 does not
+    assert m["kappa"][1] < 0
+    assert m["ac1"][1] == pytest.approx(0.8895, abs=1e-3)
+    assert m["prevalence"].tolist() == pytest.approx([0.0, 0.9])
+
+
+def test_the_interval_brackets_the_estimate_and_is_repeatable(rubric):
+    pytest.importorskip("numpy")
+    data = sessions([(True, True)] * 9 + [(False, False)] * 6 + [(True, False)] * 2)
+    out = calib.compare(data, rubric, stats=True, seed=7)
+    row = next(a for a in out["items"] if a.code == "B5")
+    lo, hi = row.stats.agreement_ci
+    assert lo <= row.rate <= hi
+    again = calib.compare(data, rubric, stats=True, seed=7)
+    assert next(a for a in again["items"] if a.code == "B5").stats.agreement_ci == (lo, hi)
+
+
+def test_the_conservative_rule_demotes_on_the_lower_bound(rubric):
+    pytest.importorskip("numpy")
+    # 85% agreement: above the threshold, but not convincingly over twenty sessions
+    data = sessions([(True, True)] * 17 + [(True, False)] * 3)
+    assert calib.compare(data, rubric)["demote"] == []
+    assert calib.compare(data, rubric, conservative=True, seed=1)["demote"] == ["B5"]
+
+
+def test_a_prompt_fix_shows_up_in_the_trend(rubric):
+    old = [{"id": f"a{n}", "date": f"2026-09-{n + 1:02d}", "site": "Galveston",
+            "rubric_version": 1, "prompt_versions": {"B5": "old"},
+            "items": {"framework_first": {"model_verdict": True, "final_verdict": n % 2 == 0}}}
+           for n in range(6)]
+    new = [{"id": f"b{n}", "date": f"2026-10-{n + 1:02d}", "site": "Austin",
+            "rubric_version": 1, "prompt_versions": {"B5": "new"},
+            "items": {"framework_first": {"model_verdict": True, "final_verdict": True}}}
+           for n in range(5)]
+    out = calib.trends(old + new, rubric, window=5)
+
+    # pooled, the fix is invisible; by prompt and over time, it is not
+    assert calib.compare(old + new, rubric)["demote"] == ["B5"]
+    by_prompt = {r["key"]: r for r in out["groups"]["prompt"]["B5"]}
+    assert by_prompt["old"]["rate"] == 0.5 and by_prompt["new"]["rate"] == 1.0
+    assert by_prompt["new"]["verdict"] == "keep"
+    assert out["rolling"]["B5"][-1]["rate"] == 1.0
+    assert [p["id"] for p in out["rolling"]["B5"]][:2] == ["a0", "a1"]
+    assert {r["key"] for r in out["groups"]["site"]["B5"]} == {"Galveston", "Austin"}
+
+
+def test_trends_refuse_an_unknown_grouping(rubric):
+    with pytest.raises(ValueError):
+        calib.trends([], rubric, by=("resident",))
@@ -129,3 +129,45 @@ def test_a_draft_never_leaves_with_a_name_in_the_prompt(rubric, man):
     substituted = boundary.substitute(payload["user"])
     assert "Will Barlow" not in substituted
     assert boundary.residual_names(substituted) == []
+
+
+class DraftingClient:
+    """Drafts without a network, and proves the six calls overlap."""
+
+    def __init__(self, overlap=0):
+        import threading
+        self.model = "fake"
+        self.calls = []
+        self.barrier = threading.Barrier(overlap, timeout=5) if overlap else None
+
+    def ready(self):
+        return True
+
+    def complete(self, system, user, max_tokens):
+        self.calls.append(user)
+        if self.barrier:
+            self.barrier.wait()
+        return f"A note about {user.splitlines()[0]}"
+
+
+def _working(man, **items):
+    return {"block": "apr-jun", "objective": "an objective", "roles": man.roles,
+            "items": {"problem_rep": result(True, quote="Three-year-old"), **items},
+            "automatic_fails": {}}
+
+
+def test_drafts_are_made_together_and_cached(rubric, man):
+    boundary = NameBoundary(man.roles)
+    client = DraftingClient(overlap=len(man.roles))
+    cache = {}
+    drafts = fb.draft_all(_working(man), rubric, client, boundary, cache=cache)
+    assert len(client.calls) == len(man.roles)
+    assert len(cache) == len(man.roles)
+    assert [d.name for d in drafts] == list(man.roles)
+
+    # a change that touches only the intern's note redrafts only that one
+    again = DraftingClient()
+    fb.draft_all(_working(man, three_to_four=result(False, why="Five offered.")),
+                 rubric, again, boundary, cache=cache)
+    assert len(again.calls) == 1
+    assert again.calls[0].startswith("Role: PGY-1 discussant")
@@ -41,6 +41,17 @@ def test_score_writes_an_identified_working_copy(folder):
     assert "deleted" in data["_warning"].lower()
 
 
+def test_incremental_score_builds_on_the_working_copy(folder):
+    run(folder, "score", str(FIXTURES / "clean.vtt"), "2026-09-03-galveston", "--dry-run")
+    working = json.loads((folder / "working" / "2026-09-03-galveston.json").read_text())
+    assert working["fingerprints"]["eight_slides"]
+
+    r = run(folder, "score", str(FIXTURES / "clean.vtt"), "2026-09-03-galveston",
+            "--dry-run", "--incremental")
+    assert r.exit_code == 0, r.output
+    assert "Recomputed" in r.output
+
+
 def test_mark_sent_leaves_no_name_anywhere(folder):
     """The phase 10 acceptance test, run rather than described."""
     run(folder, "score", str(FIXTURES / "clean.vtt"), "2026-09-03-galveston", "--dry-run")
@@ -136,3 +147,27 @@ def test_a_session_id_cannot_escape_the_data_folder(folder):
     store = Store(root=folder)
     with pytest.raises(Exception):
         store.write({"x": 1}, "..", "..", "escaped.json")
+
+
+def test_batch_scores_a_folder_and_reports_each_session(folder, tmp_path_factory):
+    inbox = tmp_path_factory.mktemp("inbox")
+    (inbox / "2026-09-03-galveston.vtt").write_text(
+        (FIXTURES / "clean.vtt").read_text(), encoding="utf-8")
+    (inbox / "2026-09-04-nowhere.vtt").write_text(
+        (FIXTURES / "clean.vtt").read_text(), encoding="utf-8")
+
+    r = run(folder, "batch", str(inbox), "--dry-run", "--jobs", "2")
+    assert r.exit_code != 0, "one session has no manifest, so the batch fails"
+    assert "2026-09-03-galveston" in r.output
+    assert "no manifest" in r.output
+    assert "Scored 1 of 2" in r.output
+    assert (folder / "working" / "2026-09-03-galveston.json").exists()
+
+
+def test_the_rate_limiter_spaces_calls():
+    from morningreport.model import RateLimiter
+    limiter = RateLimiter(per_minute=1200)      # one every 50 ms
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.wait()
+    assert time.monotonic() - start >= 0.14
@@ -0,0 +1,32 @@
+"""Memory budgets, enforced.
+
+A change that doubles what parsing, redaction, scoring or grep holds at
+peak fails here. The budgets live in benchmarks/memory.py; raise one
+there, on purpose, if an operation legitimately needs more.
+"""
+
+import pytest
+
+from benchmarks import memory
+
+CUES = 5_000
+
+
+@pytest.fixture(scope="module")
+def usages():
+    return {u.op: u for u in memory.run(CUES)}
+
+
+@pytest.mark.parametrize("op", sorted(memory.BUDGETS))
+def test_within_budget(usages, op):
+    u = usages[op]
+    assert u.peak > 0
+    assert not u.over(), (
+        f"{op} peaked at {u.peak:,} bytes for {CUES:,} cues; "
+        f"the budget is {u.budget():,}"
+    )
+
+
+def test_grep_does_not_hold_whole_files(usages):
+    # well under one cue's worth of bytes per cue: it streams lines
+    assert usages["Store.grep"].peak < usages["vtt.parse_file"].peak / 4
@@ -0,0 +1,59 @@
+"""The compiled rubric: indexes, bindings, and the checks that it matches the code."""
+
+import json
+
+import pytest
+
+from morningreport import deterministic as det
+from morningreport import rubric as rb
+
+
+def test_lookups_by_id_and_code(rubric):
+    assert rubric.by_code("b5").id == "framework_first"
+    assert rubric.by_id("framework_first").code == "B5"
+    assert rubric.by_code("Z9") is None and rubric.by_id("nope") is None
+
+
+def test_items_are_bound_to_their_scorers_prompts_and_windows(rubric):
+    b = rubric.bindings
+    assert b["ran_over"].scorer is det.score_f3
+    assert b["nothing_struck"].dependent is det.score_f4
+    assert b["nothing_struck"].requires == ("struck_reason",)
+    assert b["framework_first"].prompt.name == "B5.md"
+    assert b["problem_rep"].window == (6 * 60, 12 * 60)
+    assert b["let_silence"] == rb.Binding()
+
+
+def _write(tmp_path, **changes):
+    data = json.loads(rb.default_path().read_text(encoding="utf-8"))
+    item = data["columns"][0]["items"][0]
+    item.update(changes)
+    p = tmp_path / "rubric.json"
+    p.write_text(json.dumps(data), encoding="utf-8")
+    return p, item
+
+
+def test_a_transcript_item_with_no_prompt_or_scorer_is_refused(tmp_path):
+    p, _ = _write(tmp_path, id="new_item", code="Z1", scored_from="transcript")
+    with pytest.raises(rb.RubricError, match="Z1 is scored from the transcript"):
+        rb.load(p)
+
+
+def test_a_timing_item_with_no_scorer_is_refused(tmp_path):
+    p, _ = _write(tmp_path, id="new_item", code="Z2", scored_from="timing")
+    with pytest.raises(rb.RubricError, match="Z2 is scored from timing"):
+        rb.load(p)
+
+
+def test_the_cache_follows_the_json(tmp_path):
+    p, item = _write(tmp_path)
+    first = rb.load(p)
+    cached = max(rb.cache_dir().glob("rubric-*.json"), key=lambda f: f.stat().st_mtime_ns)
+    blob = json.loads(cached.read_text(encoding="utf-8"))
+    blob["title"] = "from the cache"
+    cached.write_text(json.dumps(blob), encoding="utf-8")
+
+    again = rb.load(p)
+    assert again.title == "from the cache" and again.items == first.items
+    _write(tmp_path, text="A reworded standard")
+    assert rb.load(p).by_id(item["id"]).text == "A reworded standard"
@@ -6,6 +6,7 @@ from pathlib import Path
 import pytest
 
 from morningreport import model, scoring
+from morningreport import rubric as rb
 from morningreport.roles import NameBoundary
 
 
@@ -134,6 +135,107 @@ def test_an_automatic_fail_flips_failed(rubric, load_tx, man, boundary):
     assert session.failed() is True
 
 
+def test_a_derived_item_fires_from_the_item_it_reads(rubric, load_tx, man, boundary):
+    client = FakeClient(verdict=True)
+    session = scoring.score(rubric, load_tx("clean.vtt"), man, boundary, client=client)
+    f4 = session.fails["nothing_struck"]
+    assert session.items["struck_reason"]["final_verdict"] is True
+    assert f4["final_verdict"] is False
+    assert f4["source"] == "derived"
+
+
+def test_model_calls_are_in_flight_together(rubric, load_tx, man, boundary):
+    """Two calls must overlap, or the barrier times out and the items go unscored."""
+    import threading
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    class Overlapping(FakeClient):
+        def send(self, payload):
+            if payload.code in ("B1", "B2"):
+                try:
+                    barrier.wait()
+                except threading.BrokenBarrierError:
+                    raise model.ModelError("calls were made one at a time") from None
+            return super().send(payload)
+
+    session = scoring.score(rubric, load_tx("clean.vtt"), man, boundary,
+                            client=Overlapping(), only=["B1", "B2"], workers=2)
+    assert session.notes == []
+    assert session.items["problem_rep"]["final_verdict"] is True
+
+
+def test_the_graph_declares_sources_and_prerequisites(rubric):
+    graph = scoring.compile_graph(rubric)
+    assert graph["nothing_struck"].requires == ("struck_reason",)
+    assert graph["nothing_struck"].sources == ("board", "derived")
+    assert graph["framework_first"].sources == ("board", "model")
+    assert graph["ran_over"].sources == ("board", "deterministic")
+    assert graph["let_silence"].sources == ()
+
+
+def test_a_circular_dependency_is_refused(rubric, monkeypatch):
+    from morningreport import deterministic as det
+    monkeypatch.setitem(det.DEPENDENT, "struck_reason", det.score_f4)
+    monkeypatch.setitem(det.REQUIRES, "struck_reason", ("nothing_struck",))
+    with pytest.raises(ValueError, match="circular"):
+        scoring.compile_graph(rb.load())
+
+
+# ---- incremental re-scoring ---------------------------------------------
+
+def _rescore(rubric, tx, man, boundary, previous, client=None):
+    client = client or FakeClient()
+    session = scoring.score(rubric, tx, man, boundary, client=client, previous=previous)
+    return session, client
+
+
+def test_an_unchanged_session_makes_no_calls(rubric, load_tx, man, boundary):
+    tx = load_tx("clean.vtt")
+    first = scoring.score(rubric, tx, man, boundary, client=FakeClient())
+    working = scoring.to_working(first, man, rubric)
+    session, client = _rescore(rubric, tx, man, boundary, working)
+    assert client.calls == []
+    assert session.items == first.items and session.fails == first.fails
+    assert set(session.recomputed) == {"nothing_struck"}, "derived items are always re-derived"
+
+
+def test_a_manifest_edit_recomputes_only_what_reads_it(rubric, load_tx, man, boundary):
+    tx = load_tx("clean.vtt")
+    working = scoring.to_working(scoring.score(rubric, tx, man, boundary, client=FakeClient()), man, rubric)
+    man.slide_count = 12
+    session, client = _rescore(rubric, tx, man, boundary, working)
+    assert client.calls == []
+    assert "eight_slides" in session.recomputed
+    assert session.items["eight_slides"]["final_verdict"] is False
+
+    man.objective = "A different objective"
+    session, client = _rescore(rubric, tx, man, boundary, working)
+    assert "B5" in [p.code for p in client.calls], "the objective is in every model payload"
+
+
+def test_a_human_override_survives_and_its_dependants_follow(rubric, load_tx, man, boundary):
+    tx = load_tx("clean.vtt")
+    working = scoring.to_working(scoring.score(rubric, tx, man, boundary, client=FakeClient()), man, rubric)
+    assert working["automatic_fails"]["nothing_struck"]["final_verdict"] is False
+    working["items"]["struck_reason"].update(final_verdict=False, source="human")
+    working["fingerprints"].pop("struck_reason")
+
+    session, client = _rescore(rubric, tx, man, boundary, working)
+    assert "B6" not in [p.code for p in client.calls]
+    assert session.items["struck_reason"]["source"] == "human"
+    assert session.fails["nothing_struck"]["final_verdict"] is True
+
+
+def test_an_unscored_item_is_retried_next_time(rubric, load_tx, man, boundary):
+    tx = load_tx("clean.vtt")
+    first = scoring.score(rubric, tx, man, boundary, client=FakeClient(fail_on={"B5"}))
+    working = scoring.to_working(first, man, rubric)
+    assert "framework_first" not in working["fingerprints"]
+    _, client = _rescore(rubric, tx, man, boundary, working)
+    assert [p.code for p in client.calls] == ["B5"]
+
+
 # ---- the two halves must agree ------------------------------------------
 
 def _js_rubric():
@@ -0,0 +1,57 @@
+"""
+Benchmark: render every archived digest to HTML.
+================================================
+Times digest_markdown.markdown_to_html (parse and render) over each dated digest in
+literature-monitor/digests/ (best of --repeats), and over the whole
+archive as one document --scale times over to show how it grows.
+
+    python scripts/bench_markdown.py [--repeats 5] [--scale 10]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from digest_markdown import markdown_to_html
+
+DIGESTS = Path(__file__).resolve().parents[1] / 'literature-monitor' / 'digests'
+
+
+def best(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--scale', type=int, default=10,
+                        help='copies of the archive rendered as one document')
+    args = parser.parse_args(argv)
+
+    digests = []
+    for path in sorted(DIGESTS.glob('????-??-??.json')):
+        digests.append((path.stem, json.loads(path.read_text(encoding='utf-8'))['content']))
+
+    print(f"{'digest':<12} {'chars':>8} {'ms':>8}")
+    total = 0.0
+    for name, content in digests:
+        t = best(lambda: markdown_to_html(content), args.repeats)
+        total += t
+        print(f"{name:<12} {len(content):>8} {t * 1000:>8.2f}")
+    chars = sum(len(c) for _, c in digests)
+    print(f"{'archive':<12} {chars:>8} {total * 1000:>8.2f}")
+
+    big = '\n\n'.join(c for _, c in digests) * args.scale
+    t = best(lambda: markdown_to_html(big), args.repeats)
+    print(f"{'x' + str(args.scale):<12} {len(big):>8} {t * 1000:>8.2f}"
+          f"   ({len(big) / t / 1e6:.1f} MB/s)")
+
+
+if __name__ == '__main__':
+    main()
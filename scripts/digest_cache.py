@@ -0,0 +1,51 @@
+"""
+On-disk cache for model results that depend only on their input.
+================================================================
+Structured extraction reads a whole digest and returns the same records
+every time for the same digest, prompt and model. Keyed by a hash of
+all three (plus a version number to bump when the output format
+changes), a rerun after a crash, a second pass over the same content, or
+a backfill over the whole archive costs nothing for content already
+seen. One JSON file per key, written atomically, so concurrent workers
+never see half an entry.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+def cache_key(*parts):
+    """sha256 over `parts`, each length-prefixed so no two splits collide."""
+    h = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part).encode('utf-8')
+        h.update(len(data).to_bytes(8, 'big'))
+        h.update(data)
+    return h.hexdigest()
+
+
+class JsonCache:
+    """JSON values by key under `directory`, fanned out by key prefix."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """The value stored under `key`, or None if missing or unreadable."""
+        path = self._path(key)
+        try:
+            return json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, value):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{id(value)}.tmp")
+        tmp.write_text(json.dumps(value, ensure_ascii=False, indent=1), encoding='utf-8')
+        os.replace(tmp, path)
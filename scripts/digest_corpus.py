@@ -0,0 +1,408 @@
+"""
+Local corpus of candidate articles.
+===================================
+Each digest run used to rediscover, by web search, what the journals in
+JOURNAL_LIST published in its window — a dozen or more searches, each a
+pause_turn round trip. This module keeps what they published in a local
+SQLite database instead, and brings it up to date incrementally:
+
+- PubMed E-utilities (esearch + esummary) for every journal, by NLM
+  title abbreviation, asking only for entries since the journal's
+  last-seen cursor
+- publisher RSS/Atom feeds where configured, fetched with conditional
+  requests (ETag / Last-Modified), so an unchanged feed is a 304
+- articles deduplicated by DOI, then PMID, then URL: the same paper
+  seen in a feed and in PubMed is one row, filled in from both
+
+between(start, end) then gives the triage prompt an explicit list of
+what appeared in the window, so web search is left to check access and
+full text rather than to find the articles.
+
+    python scripts/digest_corpus.py [--since YYYY-MM-DD] [--feed ABBR=URL ...]
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from email.utils import parsedate_to_datetime
+
+from digest_memory import normalize_pmid
+from digest_pdfs import TIMEOUT, make_session, normalize_doi
+
+# Not committed; the scheduled workflow carries it between runs in the actions cache
+CORPUS_FILE = 'literature-monitor/digests/corpus.sqlite'
+EUTILS = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils'
+# NCBI allows three requests a second without an API key
+EUTILS_INTERVAL = 0.34
+RETMAX = 200
+# How far back a journal with no cursor yet is read
+FIRST_DAYS = 28
+
+# NLM title abbreviations, by the abbreviations JOURNAL_LIST (digest_site.py) uses
+JOURNALS = {
+    'PIDJ': 'Pediatr Infect Dis J',
+    'JPIDS': 'J Pediatric Infect Dis Soc',
+    'CID': 'Clin Infect Dis',
+    'Pediatrics': 'Pediatrics',
+    'JAMA Peds': 'JAMA Pediatr',
+    'AAC': 'Antimicrob Agents Chemother',
+    'JAC': 'J Antimicrob Chemother',
+    'JAC-AMR': 'JAC Antimicrob Resist',
+    'IJAA': 'Int J Antimicrob Agents',
+    'CMI': 'Clin Microbiol Infect',
+    'Clin PK': 'Clin Pharmacokinet',
+    'TDM': 'Ther Drug Monit',
+    'Pharmacotherapy': 'Pharmacotherapy',
+    'Pediatric Drugs': 'Paediatr Drugs',
+    'ASHE': 'Antimicrob Steward Healthc Epidemiol',
+    'OFID': 'Open Forum Infect Dis',
+    'NEJM': 'N Engl J Med',
+    'JAMA': 'JAMA',
+    'Lancet ID': 'Lancet Infect Dis',
+    'MMWR': 'MMWR Morb Mortal Wkly Rep',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    doi TEXT UNIQUE,
+    pmid TEXT UNIQUE,
+    url TEXT,
+    title TEXT NOT NULL,
+    journal TEXT NOT NULL,
+    published TEXT,
+    source TEXT NOT NULL,
+    first_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_published ON articles (published);
+CREATE INDEX IF NOT EXISTS articles_url ON articles (url);
+CREATE TABLE IF NOT EXISTS cursors (
+    source TEXT PRIMARY KEY,
+    etag TEXT NOT NULL DEFAULT '',
+    last_modified TEXT NOT NULL DEFAULT '',
+    last_seen TEXT NOT NULL DEFAULT '',
+    checked TEXT NOT NULL DEFAULT ''
+);
+"""
+
+FIELDS = ('doi', 'pmid', 'url', 'title', 'journal', 'published')
+
+
+@dataclass
+class Source:
+    """Where one journal's new articles come from."""
+    name: str                   # the JOURNAL_LIST abbreviation
+    pubmed: str = ''            # NLM title abbreviation
+    rss: str = ''               # RSS or Atom feed URL
+
+    @property
+    def key(self):
+        return f"{self.name}:{'rss' if self.rss else 'pubmed'}"
+
+
+def default_sources(feeds=None):
+    """A PubMed source for every journal, plus a source for each of `feeds` ({abbr: url})."""
+    sources = [Source(name, pubmed=title) for name, title in JOURNALS.items()]
+    sources += [Source(name, rss=url) for name, url in (feeds or {}).items()]
+    return sources
+
+
+class Corpus:
+    """The article database at `path`. Safe to share between threads."""
+
+    def __init__(self, path=CORPUS_FILE):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+
+    def _find(self, article):
+        for column in ('doi', 'pmid', 'url'):
+            if article.get(column):
+                row = self._db.execute(
+                    f'SELECT * FROM articles WHERE {column} = ?', (article[column],)).fetchone()
+                if row:
+                    return row
+        return None
+
+    def add(self, article, source):
+        """Store `article`, or fill in the copy already held. True if it was new."""
+        article = {k: (article.get(k) or '').strip() for k in FIELDS}
+        article['doi'] = normalize_doi(article['doi'])
+        article['pmid'] = normalize_pmid(article['pmid']) or (
+            article['pmid'] if article['pmid'].isdigit() else '')
+        if not article['title'] or not (article['doi'] or article['pmid'] or article['url']):
+            return False
+        with self._lock, self._db:
+            row = self._find(article)
+            if row is None:
+                self._db.execute(
+                    'INSERT INTO articles (doi, pmid, url, title, journal, published, source, first_seen)'
+                    ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (article['doi'] or None, article['pmid'] or None, article['url'], article['title'],
+                     article['journal'], article['published'], source,
+                     datetime.now().isoformat(timespec='seconds')))
+                return True
+            missing = {k: v for k, v in article.items() if v and not row[k]}
+            if missing:
+                sets = ', '.join(f'{k} = ?' for k in missing)
+                try:
+                    self._db.execute(f'UPDATE articles SET {sets} WHERE id = ?',
+                                     (*missing.values(), row['id']))
+                except sqlite3.IntegrityError:
+                    pass            # its DOI or PMID is already on another row
+            return False
+
+    def cursor(self, source):
+        with self._lock:
+            row = self._db.execute('SELECT * FROM cursors WHERE source = ?', (source,)).fetchone()
+        return dict(row) if row else {'source': source, 'etag': '', 'last_modified': '',
+                                      'last_seen': '', 'checked': ''}
+
+    def set_cursor(self, source, **fields):
+        cursor = {**self.cursor(source), **fields,
+                  'checked': datetime.now().isoformat(timespec='seconds')}
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO cursors (source, etag, last_modified, last_seen, checked)'
+                ' VALUES (:source, :etag, :last_modified, :last_seen, :checked)', cursor)
+
+    def between(self, start, end):
+        """Articles published from `start` to `end` (dates or datetimes), newest first."""
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT * FROM articles WHERE published >= ? AND published <= ?'
+                ' ORDER BY published DESC, id',
+                (_day(start), _day(end))).fetchall()
+        return [{k: row[k] or '' for k in FIELDS} for row in rows]
+
+
+def _day(value):
+    return value.strftime('%Y-%m-%d') if isinstance(value, (date, datetime)) else str(value)[:10]
+
+
+# ---------------------------------------------------------------------------
+# Feeds
+# ---------------------------------------------------------------------------
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _date(text):
+    """'YYYY-MM-DD' from an RFC 822 or ISO 8601 date, or '' if neither."""
+    text = (text or '').strip()
+    if not text:
+        return ''
+    try:
+        return parsedate_to_datetime(text).strftime('%Y-%m-%d')
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return datetime.fromisoformat(text.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+    except ValueError:
+        return text[:10] if len(text) >= 10 and text[4] == '-' else ''
+
+
+def parse_feed(body, journal=''):
+    """The articles in an RSS 2.0, RSS 1.0 or Atom feed."""
+    root = ET.fromstring(body)
+    articles = []
+    for item in root.iter():
+        if _local(item.tag) not in ('item', 'entry'):
+            continue
+        article = {'journal': journal, 'title': '', 'url': '', 'doi': '', 'published': ''}
+        for child in item:
+            name = _local(child.tag)
+            text = (child.text or '').strip()
+            if name == 'title':
+                article['title'] = ' '.join(text.split())
+            elif name == 'link' and not article['url']:
+                article['url'] = child.get('href') or text
+            elif name in ('doi', 'identifier') and not article['doi']:
+                article['doi'] = normalize_doi(text)
+            elif name in ('publicationDate', 'coverDate', 'pubDate', 'date', 'published', 'updated'):
+                article['published'] = article['published'] or _date(text)
+        if not article['doi']:
+            article['doi'] = normalize_doi(article['url'])
+        articles.append(article)
+    return articles
+
+
+def ingest_feed(corpus, source, session):
+    """Fetch a feed if it changed since last time; returns the articles new to the corpus."""
+    cursor = corpus.cursor(source.key)
+    headers = {}
+    if cursor['etag']:
+        headers['If-None-Match'] = cursor['etag']
+    if cursor['last_modified']:
+        headers['If-Modified-Since'] = cursor['last_modified']
+    response = session.get(source.rss, headers=headers, timeout=TIMEOUT)
+    if response.status_code == 304:
+        corpus.set_cursor(source.key)
+        return 0
+    response.raise_for_status()
+
+    new = 0
+    newest = cursor['last_seen']
+    for article in parse_feed(response.content, source.name):
+        # a feed lists the same recent items every time; older ones are known
+        if cursor['last_seen'] and article['published'] and article['published'] < cursor['last_seen']:
+            continue
+        new += corpus.add(article, source.key)
+        newest = max(newest, article['published'])
+    corpus.set_cursor(source.key, etag=response.headers.get('etag', ''),
+                      last_modified=response.headers.get('last-modified', ''), last_seen=newest)
+    return new
+
+
+# ---------------------------------------------------------------------------
+# PubMed
+# ---------------------------------------------------------------------------
+
+class _Spacing:
+    """At most one call per `interval` seconds."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._next = 0.0
+
+    def wait(self):
+        now = time.monotonic()
+        if self._next > now:
+            time.sleep(self._next - now)
+        self._next = max(now, self._next) + self.interval
+
+
+def _eutils(session, base, tool, spacing, **params):
+    spacing.wait()
+    response = session.get(f'{base}/{tool}.fcgi', params={**params, 'retmode': 'json'},
+                           timeout=TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+def _summaries(session, base, spacing, ids, journal, extra):
+    summary = _eutils(session, base, 'esummary', spacing, db='pubmed', id=','.join(ids), **extra)
+    result = summary.get('result', {})
+    articles = []
+    for uid in result.get('uids', ids):
+        doc = result.get(uid) or {}
+        doi = next((a.get('value', '') for a in doc.get('articleids', [])
+                    if a.get('idtype') == 'doi'), '')
+        articles.append({
+            'pmid': uid,
+            'doi': doi,
+            'url': f'https://pubmed.ncbi.nlm.nih.gov/{uid}/',
+            'title': (doc.get('title') or '').strip(),
+            'journal': doc.get('fulljournalname') or doc.get('source') or journal,
+            'published': (doc.get('sortpubdate') or '')[:10].replace('/', '-'),
+        })
+    return articles
+
+
+def search_pubmed(session, journal, mindate, maxdate, base=EUTILS, spacing=None, api_key=''):
+    """Articles PubMed added for `journal` (an NLM abbreviation) from `mindate` to `maxdate`.
+
+    Reads every page of the search, RETMAX ids at a time. Raises if the
+    pages run out before the count PubMed reported, so a caller never
+    takes a partial answer for the whole range.
+    """
+    spacing = spacing or _Spacing(EUTILS_INTERVAL)
+    extra = {'api_key': api_key} if api_key else {}
+    articles = []
+    start, count = 0, None
+    while count is None or start < count:
+        found = _eutils(session, base, 'esearch', spacing, db='pubmed', term=f'"{journal}"[ta]',
+                        datetype='edat', mindate=mindate.replace('-', '/'),
+                        maxdate=maxdate.replace('-', '/'), retstart=start, retmax=RETMAX,
+                        **extra).get('esearchresult', {})
+        ids = found.get('idlist', [])
+        count = int(found.get('count', len(ids)) if count is None else count)
+        if not ids:
+            if start < count:
+                raise ValueError(f"PubMed listed {start} of {count} {journal} articles")
+            break
+        articles.extend(_summaries(session, base, spacing, ids, journal, extra))
+        start += len(ids)
+    return articles
+
+
+def ingest_pubmed(corpus, source, session, today, since='', base=EUTILS, spacing=None, api_key=''):
+    """Read PubMed for `source` from its cursor to `today`; returns the articles new to the corpus.
+
+    Without a cursor it reads from FIRST_DAYS ago; `since` reads back at
+    least that far.
+    """
+    cursor = corpus.cursor(source.key)
+    first = (date.fromisoformat(today) - timedelta(days=FIRST_DAYS)).isoformat()
+    mindate = min(filter(None, [cursor['last_seen'] or first, since]))
+    new = 0
+    for article in search_pubmed(session, source.pubmed, mindate, today, base, spacing, api_key):
+        new += corpus.add(article, source.key)
+    # the next run asks again from today: entries dated today may still be arriving
+    corpus.set_cursor(source.key, last_seen=today)
+    return new
+
+
+def ingest(corpus, sources=None, since=None, session=None, base=EUTILS,
+           interval=EUTILS_INTERVAL, api_key=''):
+    """Bring the corpus up to date from every source; returns {source key: new articles}.
+
+    PubMed is read from each journal's cursor, or FIRST_DAYS back for a
+    journal with none; `since` reads every journal back at least to that
+    date (for a backfill). A source that fails is reported and skipped.
+    """
+    sources = default_sources() if sources is None else sources
+    today = date.today().isoformat()
+    since = _day(since) if since else ''
+    own_session = session is None
+    session = session or make_session(1)
+    spacing = _Spacing(interval)
+    counts = {}
+    try:
+        for source in sources:
+            try:
+                if source.rss:
+                    counts[source.key] = ingest_feed(corpus, source, session)
+                else:
+                    counts[source.key] = ingest_pubmed(
+                        corpus, source, session, today, since, base, spacing, api_key)
+            except Exception as e:
+                print(f"  Warning: {source.key} not updated: {e}")
+    finally:
+        if own_session:
+            session.close()
+    return counts
+
+
+if __name__ == '__main__':
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description='Bring the candidate corpus up to date.')
+    parser.add_argument('--db', default=CORPUS_FILE)
+    parser.add_argument('--since', help='read back to this date (YYYY-MM-DD)')
+    parser.add_argument('--feed', action='append', default=[], metavar='ABBR=URL',
+                        help='also read this RSS/Atom feed for a journal')
+    args = parser.parse_args()
+
+    feeds = dict(f.split('=', 1) for f in args.feed)
+    corpus = Corpus(args.db)
+    counts = ingest(corpus, default_sources(feeds), since=args.since,
+                    api_key=os.environ.get('NCBI_API_KEY', ''))
+    print(json.dumps(counts, indent=2))
+    print(f"{sum(counts.values())} new articles; {len(corpus)} in {args.db}")
+    corpus.close()
@@ -0,0 +1,215 @@
+"""
+Digest Markdown as a structured document.
+=========================================
+Everything downstream of generation — the HTML page and its article
+counts, the PDF list, what memory records as reviewed, the repeat check
+— needs to know where each article starts and what its fields say. This
+reads a digest once, line by line, into a Document:
+
+- lines: each source line with its block kind (heading, list item,
+  quote, rule, blank or text), which is all the renderer needs
+- sections: the "## " sections, each with its articles
+- articles: title, citation and journal, DOI, PubMed link, PDF URL,
+  access status, study design and sample size, and the line span the
+  article covers
+
+An article opens at a "### " heading or a line that is a bold title
+alone ("**Title**", not a "**Label:**"), and runs until the next one, a
+section heading or a "---" rule. A heading only counts as an article if
+what follows it looks like one — a citation line, a DOI or PubMed link,
+or one of the Access/Design/PDF fields — so bold call-outs in prose are
+not mistaken for papers.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from digest_memory import normalize_pmid
+from digest_pdfs import normalize_doi
+
+HEADINGS = (('#### ', 'h4'), ('### ', 'h3'), ('## ', 'h2'), ('# ', 'h1'))
+
+BOLD_TITLE = re.compile(r'^\*\*(?P<title>[^*]{15,}[^*:])\*\*\s*$')
+NUMBERED = re.compile(r'^\d+\.\s+')
+
+# "- **Access:** OPEN ACCESS", "**PDF:** https://..."
+FIELD = re.compile(r'^\s*(?:[-*]\s+)?\*\*(?P<label>[^*]{1,40}?):\*\*\s*(?P<value>.*)$')
+URL = re.compile(r'https?://[^\s<>)\]|]+')
+DOI = re.compile(r'\b10\.\d{4,9}/[^\s)\]|>"]+')
+PUBMED = re.compile(r'https?://pubmed\.ncbi\.nlm\.nih\.gov/\d{5,9}/?', re.IGNORECASE)
+PAYWALL_NOTICE = re.compile(r'\[PAYWALL:', re.IGNORECASE)
+
+# "n=1,234", "N = 402", "1,234 children"
+SAMPLE_SIZE = re.compile(
+    r'\b[nN]\s*=\s*(?P<n>\d[\d,]*)'
+    r'|\b(?P<count>\d[\d,]*)\s+(?:[a-z-]+\s+){0,2}?'
+    r'(?:children|patients|participants|infants|neonates|adolescents|adults|subjects|'
+    r'cases|encounters|episodes|admissions|visits|isolates)\b(?!\')')
+
+
+@dataclass(slots=True)
+class Line:
+    kind: str           # h1-h4, quote, item, hr, blank or text
+    text: str           # the line without its block marker
+
+
+@dataclass
+class Article:
+    title: str
+    start: int                      # line of the heading
+    end: int = 0                    # first line after the article
+    citation: str = ''
+    journal: str = ''
+    doi: str = ''
+    pubmed: str = ''
+    pdf_url: str = ''
+    access: str = ''                # 'open', 'paywalled' or '' if not stated
+    design: str = ''
+    n: int | None = None
+    fields: dict = field(default_factory=dict)
+
+    @property
+    def pmid(self):
+        return normalize_pmid(self.pubmed)
+
+    @property
+    def is_article(self):
+        return bool(self.citation or self.doi or self.pubmed or self.pdf_url
+                    or self.access or self.design)
+
+    def record(self):
+        """What memory keeps for an article the digest reviewed."""
+        return {'title': self.title, 'doi': self.doi, 'pmid': self.pmid, 'journal': self.journal}
+
+
+@dataclass
+class Section:
+    title: str
+    start: int
+    articles: list = field(default_factory=list)
+
+
+@dataclass
+class Document:
+    text: str
+    lines: list
+    sections: list
+
+    @property
+    def articles(self):
+        return [a for s in self.sections for a in s.articles]
+
+    def counts(self):
+        """(articles, open access, paywalled)."""
+        articles = self.articles
+        return (len(articles),
+                sum(a.access == 'open' for a in articles),
+                sum(a.access == 'paywalled' for a in articles))
+
+
+def _classify(line):
+    if not line:
+        return Line('blank', line)
+    first = line[0]
+    if first == '#':
+        for prefix, kind in HEADINGS:
+            if line.startswith(prefix):
+                return Line(kind, line[len(prefix):])
+    elif first == '>' and line.startswith('> '):
+        return Line('quote', line[2:])
+    elif first in '-*' and line[1:2] == ' ':
+        return Line('item', line[2:])
+    elif line == '---':
+        return Line('hr', line)
+    return Line('text', line)
+
+
+def _first_url(text):
+    m = URL.search(text)
+    return m.group(0).rstrip('.,;') if m else ''
+
+
+def _sample_size(text):
+    m = SAMPLE_SIZE.search(text)
+    if not m:
+        return None
+    return int((m.group('n') or m.group('count')).replace(',', ''))
+
+
+def _read_field(article, label, value):
+    label = label.strip().lower()
+    article.fields.setdefault(label, value.strip())
+    if label == 'access' and not article.access:
+        upper = value.upper()
+        if 'OPEN' in upper:
+            article.access = 'open'
+        elif 'PAYWALL' in upper:
+            article.access = 'paywalled'
+    elif label == 'pdf' and not article.pdf_url:
+        article.pdf_url = _first_url(value)
+    elif label == 'design' and not article.design:
+        article.design = value.strip()
+        article.n = _sample_size(value)
+
+
+def _read_line(article, raw):
+    """Fold one line of an article's body into it."""
+    m = FIELD.match(raw)
+    if m:
+        _read_field(article, m.group('label'), m.group('value'))
+    elif not article.citation and raw.startswith('*') and not raw.startswith('**'):
+        # "*Journal, Date* | link"
+        article.citation = raw.strip()
+        article.journal = raw[1:].split('*', 1)[0].split(',')[0].strip()
+    if not article.doi:
+        m = DOI.search(raw)
+        if m:
+            article.doi = normalize_doi(m.group(0).rstrip('.,;'))
+    if not article.pubmed:
+        m = PUBMED.search(raw)
+        if m:
+            article.pubmed = m.group(0)
+    if not article.access and PAYWALL_NOTICE.search(raw):
+        article.access = 'paywalled'
+
+
+def _title(line):
+    """The article title a line opens with, or None."""
+    if line.kind == 'h3':
+        title = NUMBERED.sub('', line.text.replace('**', '').strip())
+        return title or None
+    if line.kind == 'text':
+        m = BOLD_TITLE.match(line.text)
+        if m:
+            return NUMBERED.sub('', m.group('title').strip())
+    return None
+
+
+def parse(text):
+    """The Document for a digest's Markdown."""
+    lines = []
+    sections = [Section('', 0)]
+    article = None
+
+    def close(at):
+        if article is not None:
+            article.end = at
+            if article.is_article:
+                sections[-1].articles.append(article)
+
+    for n, raw in enumerate(text.split('\n')):
+        line = _classify(raw)
+        lines.append(line)
+        title = _title(line)
+        if title is not None:
+            close(n)
+            article = Article(title, n)
+        elif line.kind in ('h1', 'h2', 'hr'):
+            close(n)
+            article = None
+            if line.kind == 'h2':
+                sections.append(Section(line.text.strip(), n))
+        elif article is not None:
+            _read_line(article, raw)
+    close(len(lines))
+    return Document(text, lines, [s for s in sections if s.title or s.articles])
@@ -0,0 +1,112 @@
+"""
+The article manifest a digest is written with.
+==============================================
+Topic memory needs structured records for each article — topics, key
+finding, study type — and these used to come from a second model call
+that re-read the finished digest. The model writing the digest already
+knows all of it, so it is asked to end the digest with a fenced block:
+
+    ```json digest-manifest
+    [{"title": "...", "doi": "...", "topics": [...], ...}]
+    ```
+
+split() takes that block off before the digest is rendered or saved,
+and records() checks it against the parsed articles: it must be a JSON
+array of objects with a title, and every article the digest kept must
+have an entry (matched by DOI or title). Entries for articles that were
+dropped as repeats are left out. A missing, truncated or invalid
+manifest raises ManifestError, and the caller falls back to extraction.
+"""
+
+import json
+import re
+
+from digest_memory import normalize_title
+from digest_pdfs import normalize_doi
+
+FENCE = '```json digest-manifest'
+
+STUDY_TYPES = ('rct', 'cohort', 'case-control', 'cross-sectional', 'case-series',
+               'systematic-review', 'meta-analysis', 'narrative-review', 'guideline',
+               'consensus', 'editorial', 'fda-update', 'other')
+TEXT_FIELDS = ('doi', 'journal', 'date', 'key_finding')
+MAX_TOPICS = 8
+
+
+class ManifestError(ValueError):
+    pass
+
+
+def split(text, fence=FENCE):
+    """(text without the fenced block, the block's body or None).
+
+    A block that was opened but never closed — a truncated response —
+    is removed and its body returned as '' so it fails validation.
+    """
+    start = text.find(fence)
+    if start < 0:
+        return text, None
+    block = re.compile(rf'{re.escape(fence)}[ \t]*\n(?P<body>.*?)^```[ \t]*$', re.MULTILINE | re.DOTALL)
+    m = block.match(text, start)
+    body = m.group('body') if m else ''
+    return text[:start].rstrip() + '\n', body
+
+
+def _keys(title, doi):
+    keys = []
+    if normalize_doi(doi):
+        keys.append('doi:' + normalize_doi(doi))
+    if normalize_title(title):
+        keys.append('title:' + normalize_title(title))
+    return keys
+
+
+def _clean(entry, n):
+    if not isinstance(entry, dict):
+        raise ManifestError(f"entry {n} is not an object")
+    title = entry.get('title')
+    if not isinstance(title, str) or not title.strip():
+        raise ManifestError(f"entry {n} has no title")
+    record = {'title': title.strip()}
+    for name in TEXT_FIELDS:
+        value = entry.get(name) or ''
+        if not isinstance(value, str):
+            raise ManifestError(f"entry {n}: {name} is not a string")
+        record[name] = value.strip()
+    topics = entry.get('topics') or []
+    if not isinstance(topics, list) or not all(isinstance(t, str) for t in topics):
+        raise ManifestError(f"entry {n}: topics is not a list of strings")
+    record['topics'] = [t.strip() for t in topics if t.strip()][:MAX_TOPICS]
+    study_type = entry.get('study_type') or 'other'
+    record['study_type'] = study_type if study_type in STUDY_TYPES else 'other'
+    return record
+
+
+def records(body, articles):
+    """Memory records for `articles` (digest_document.Article) from a manifest body."""
+    if not body:
+        raise ManifestError("manifest block is empty or was never closed")
+    try:
+        entries = json.loads(body)
+    except ValueError as e:
+        raise ManifestError(f"manifest is not JSON: {e}") from None
+    if not isinstance(entries, list):
+        raise ManifestError("manifest is not a JSON array")
+
+    by_key = {}
+    for n, entry in enumerate(entries):
+        record = _clean(entry, n)
+        for key in _keys(record['title'], record['doi']):
+            by_key.setdefault(key, record)
+
+    out = []
+    for article in articles:
+        record = next((by_key[k] for k in _keys(article.title, article.doi) if k in by_key), None)
+        if record is None:
+            raise ManifestError(f"no manifest entry for {article.title[:60]!r}")
+        merged = {**article.record(), **{k: v for k, v in record.items() if v}}
+        # the digest's own title and identifiers are what memory knows it by
+        for name in ('title', 'doi', 'pmid'):
+            merged[name] = getattr(article, name) or merged.get(name, '')
+        out.append(merged)
+    return out
@@ -0,0 +1,147 @@
+"""
+Markdown to HTML for digest pages.
+==================================
+A digest is a few hundred lines of a small Markdown dialect: headings,
+bold/italic, links and bare URLs, "- " lists, "> " quotes, "---" rules,
+and two markers of our own, the paywall notice and the open-access
+badge. The block kind of each line comes from the parsed document
+(digest_document.py); its text is escaped and tokenized once — the
+markers, emphasis, links and URLs are alternatives of a single pattern —
+and lists, rules and paragraphs are settled as the lines go by, so the
+page is built in one pass into a list of parts.
+
+The output matches what the regex pipeline this replaced produced for
+every archived digest, except that a link whose text is itself a URL is
+no longer wrapped in a second link.
+"""
+
+import re
+
+from digest_document import parse
+
+PAYWALL_HTML = '<span class="paywall-notice">PAYWALL: Abstract only reviewed</span>'
+OPEN_ACCESS_HTML = '<strong>Access:</strong> <span class="open-access-badge">OPEN ACCESS</span>'
+
+# Matched against escaped text. At any position the first alternative
+# wins, so the markers take precedence over emphasis and links. The
+# lookahead lets the scan skip positions no alternative can start at.
+_INLINE = re.compile(r"""
+  (?=[\[*h])
+  (?:
+    (?P<paywall>(?i:\[PAYWALL:\s*Abstract\ only\ reviewed\]))
+  | (?P<badge>(?i:\*\*Access:\*\*\s*OPEN\s*ACCESS))
+  | \*\*\*(?P<strong_em>.*?)\*\*\*
+  | \*\*(?P<strong>.*?)\*\*
+  | \*(?P<em>.*?)\*
+  | \[(?P<label>[^\]]+)\]\((?P<href>[^)]+)\)
+  | (?P<url>https?://[^\s<>)]+)
+  )
+""", re.VERBOSE)
+
+# A paragraph that opens with one of these is already a block
+BLOCK_TAGS = ('<h', '<ul', '<ol', '<blockquote', '<hr')
+
+
+def _link(href, label):
+    return f'<a href="{href}" target="_blank" rel="noopener">{label}</a>'
+
+
+def _inline(text, out, autolink=True):
+    """Append the HTML for one escaped line of text to `out`."""
+    pos = 0
+    for m in _INLINE.finditer(text):
+        out.append(text[pos:m.start()])
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == 'paywall':
+            out.append(PAYWALL_HTML)
+        elif kind == 'badge':
+            out.append(OPEN_ACCESS_HTML)
+        elif kind == 'strong_em':
+            out.append('<strong><em>')
+            _inline(m.group('strong_em'), out, autolink)
+            out.append('</em></strong>')
+        elif kind == 'strong':
+            out.append('<strong>')
+            _inline(m.group('strong'), out, autolink)
+            out.append('</strong>')
+        elif kind == 'em':
+            out.append('<em>')
+            _inline(m.group('em'), out, autolink)
+            out.append('</em>')
+        elif kind == 'href':
+            label = []
+            _inline(m.group('label'), label, autolink=False)
+            out.append(_link(m.group('href'), ''.join(label)))
+        elif autolink:
+            out.append(_link(m.group('url'), m.group('url')))
+        else:
+            out.append(m.group('url'))
+    out.append(text[pos:])
+
+
+def _render_line(line):
+    """One classified line as HTML, before lists and paragraphs are settled."""
+    html = line.text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    if '*' in html or '[' in html or '://' in html:
+        parts = []
+        _inline(html, parts)
+        html = ''.join(parts)
+    kind = line.kind
+    if kind in ('text', 'blank', 'hr'):
+        return html
+    if kind == 'item':
+        return f'<li>{html}</li>'
+    if kind == 'quote':
+        return f'<blockquote>{html}</blockquote>'
+    return f'<{kind}>{html}</{kind}>'
+
+
+def _paragraph(lines):
+    block = '\n'.join(lines).strip()
+    if block and not block.startswith(BLOCK_TAGS):
+        return '<p>' + block.replace('\n', '<br>') + '</p>'
+    return block
+
+
+def render(doc):
+    """The HTML for a parsed digest (see digest_document.py)."""
+    lines = doc.lines
+    last = len(lines) - 1
+    out = []
+    block = []
+    in_list = False
+    # True when the separator before this line ended a paragraph, so the
+    # line opens the next one whatever it holds
+    opens = True
+
+    for n, line in enumerate(lines):
+        html = _render_line(line)
+        is_item = line.kind == 'item'
+        if is_item and not in_list:
+            html = '<ul>' + html
+        elif in_list and not is_item:
+            # the list takes the newline after its last item with it
+            html = '</ul>' + html
+        in_list = is_item
+        if html == '---':
+            html = '<hr>'
+
+        if opens:
+            block = [html]
+            opens = False
+        elif html == '' and n < last:
+            out.append(_paragraph(block))
+            opens = True
+        else:
+            block.append(html)
+
+    if in_list:
+        block[-1] += '</ul>'
+    out.append(_paragraph(block))
+    return '\n'.join(out)
+
+
+def markdown_to_html(text):
+    """Convert digest Markdown to HTML."""
+    return render(parse(text))
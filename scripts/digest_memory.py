@@ -0,0 +1,219 @@
+"""
+Reviewed-article memory for the literature digest.
+==================================================
+Every article a digest has reviewed, so the next one does not review it
+again. Stored as an append-only JSON-lines log next to the digests —
+the workflow commits it, and appending keeps each run's diff to the
+lines that run added — and indexed in memory on load by normalized DOI,
+PMID and title, so a membership check is a dictionary lookup however
+long the archive gets. Nothing is ever truncated.
+
+Each line is one record with an "id". A later line with the same id
+fills in or updates fields of the earlier one: that is how a bare title
+noted during generation picks up its DOI, journal and topics when the
+structured extraction for the same paper arrives. A line cut short by a
+crash mid-write is skipped on load.
+"""
+
+import json
+import os
+import re
+import threading
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+
+from digest_pdfs import normalize_doi
+
+RECORD_FIELDS = ("title", "doi", "pmid", "journal", "date", "topics",
+                 "key_finding", "study_type", "digest_date")
+
+
+def normalize_pmid(text):
+    """'https://pubmed.ncbi.nlm.nih.gov/41234567/' or 'PMID: 41234567' -> '41234567'."""
+    if not text:
+        return ''
+    m = (re.search(r'pubmed\.ncbi\.nlm\.nih\.gov/(\d{5,9})', text, re.IGNORECASE)
+         or re.search(r'\bPMID:?\s*(\d{5,9})\b', text, re.IGNORECASE))
+    return m.group(1) if m else ''
+
+
+def normalize_title(title):
+    """Lowercase ASCII words only: markup, accents and punctuation removed."""
+    if not title:
+        return ''
+    text = unicodedata.normalize('NFKD', title)
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r'[^a-z0-9]+', ' ', text.lower())
+    return text.strip()
+
+
+def keys_of(record):
+    """The index keys a record is known by."""
+    keys = []
+    doi = normalize_doi(record.get('doi', ''))
+    if doi:
+        keys.append('doi:' + doi)
+    pmid = normalize_pmid(record.get('pmid', '')) or normalize_pmid(record.get('doi', ''))
+    if pmid:
+        keys.append('pmid:' + pmid)
+    title = normalize_title(record.get('title', ''))
+    if title:
+        keys.append('title:' + title)
+    return keys
+
+
+def record_from_text(text):
+    """A memory record from one loose line of digest text.
+
+    The digest notes titles and citation lines as it goes; a line with a
+    DOI or PubMed link is known by that, anything else by its text.
+    """
+    text = text.strip()
+    doi = normalize_doi(text)
+    pmid = normalize_pmid(text)
+    if doi or pmid:
+        return {'title': '', 'doi': doi, 'pmid': pmid, 'citation': text}
+    return {'title': text}
+
+
+class Memory:
+    """The log at `path`, indexed. Safe to share between threads."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._records = {}          # id -> record, in first-seen order
+        self._index = {}            # key -> id
+        self._pending = []
+        self.last_run = None
+        if self.path.exists():
+            self._load()
+
+    def _load(self):
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue            # a write cut short by a crash
+                if entry.get('run'):
+                    self.last_run = entry['run']
+                    continue
+                self._apply(entry)
+
+    def _apply(self, entry):
+        rid = entry['id']
+        record = self._records.setdefault(rid, {})
+        for k, v in entry.items():
+            if k != 'id' and v not in (None, '', []):
+                record[k] = v
+        for key in keys_of(record):
+            self._index.setdefault(key, rid)
+        return rid
+
+    def __len__(self):
+        return len(self._records)
+
+    def find(self, record):
+        """The stored record sharing a DOI, PMID or title with `record`, or None."""
+        with self._lock:
+            for key in keys_of(record):
+                rid = self._index.get(key)
+                if rid is not None:
+                    return self._records[rid]
+        return None
+
+    def seen(self, title='', doi='', pmid=''):
+        return self.find({'title': title, 'doi': doi, 'pmid': pmid}) is not None
+
+    def add(self, record):
+        """Remember `record`. Returns True if it was new, False if it merged into one."""
+        record = {k: v for k, v in record.items() if v not in (None, '', [])}
+        if not keys_of(record):
+            return False
+        with self._lock:
+            rid = None
+            for key in keys_of(record):
+                rid = self._index.get(key)
+                if rid is not None:
+                    break
+            is_new = rid is None
+            if is_new:
+                rid = len(self._records) + 1
+            else:
+                existing = self._records[rid]
+                record = {k: v for k, v in record.items() if existing.get(k) != v}
+                if not record:
+                    return False
+            entry = {'id': rid, **record}
+            self._apply(entry)
+            self._pending.append(entry)
+            return is_new
+
+    def remember_text(self, text):
+        return self.add(record_from_text(text))
+
+    def mark_run(self, when=None):
+        with self._lock:
+            self.last_run = (when or datetime.now()).isoformat()
+            self._pending.append({'run': self.last_run})
+
+    @property
+    def records(self):
+        with self._lock:
+            return list(self._records.values())
+
+    @property
+    def articles(self):
+        """Records with structured metadata (topics), oldest first."""
+        return [r for r in self.records if r.get('topics')]
+
+    def recent_labels(self, n=50):
+        """The last `n` things reviewed, as the digest should name them."""
+        labels = []
+        for r in self.records[-n:]:
+            label = r.get('title') or r.get('citation') or r.get('doi')
+            if label:
+                labels.append(label)
+        return labels
+
+    def save(self):
+        """Append everything added since the last save."""
+        with self._lock:
+            if not self._pending:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for entry in self._pending:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._pending = []
+
+    def import_json(self, path):
+        """Fold in a reviewed_articles.json from before the log. Returns records added."""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        added = 0
+        for text in data.get('reviewed_titles', []) + data.get('reviewed_dois', []):
+            added += self.remember_text(text)
+        for article in data.get('articles', []):
+            added += self.add({k: article.get(k) for k in RECORD_FIELDS})
+        if data.get('last_run') and not self.last_run:
+            self.last_run = data['last_run']
+            self._pending.append({'run': self.last_run})
+        return added
+
+
+def open_memory(path, legacy=None):
+    """The memory at `path`, imported from `legacy` JSON the first time."""
+    memory = Memory(path)
+    if not Path(path).exists() and legacy and Path(legacy).exists():
+        added = memory.import_json(legacy)
+        memory.save()
+        print(f"Imported {added} reviewed articles from {legacy} into {path}")
+    return memory
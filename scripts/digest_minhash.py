@@ -0,0 +1,198 @@
+"""
+Near-duplicate detection for reviewed articles.
+===============================================
+The same paper turns up under slightly different strings — with and
+without a journal/date suffix, "for Infants" added, a citation line in
+place of a title — and an exact-match check on normalized text misses
+every one. This indexes each past article's title and key finding as a
+MinHash signature over word shingles, banded for locality-sensitive
+hashing, so a lookup touches only the handful of past articles that
+share a band and is verified by the Jaccard similarity of their actual
+shingle sets — the quantity the signatures estimate. Titles are
+compared with titles and key findings with key findings; a short title
+is a near-subset of many long findings.
+
+A longer title that merely contains an old one ("... After COVID-19")
+is a different paper as often as not, so it has to clear the threshold
+like any other. Used to keep the "do not repeat" list in the prompt to
+one line per paper and to skip repeats at triage; deleting an article
+from a written digest takes more (see ArticleIndex.repeat).
+"""
+
+import hashlib
+import random
+import re
+
+from digest_memory import keys_of, normalize_title
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.7
+# What a title must reach, without a shared DOI or PMID, to be deleted as a repeat
+NEAR_EXACT = 0.9
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20260209)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+STOPWORDS = frozenset("""
+a an and are as at by for from in into is of on or the to with without vs versus
+""".split())
+
+# Citation trailers the digest appends to a title line: " — Journal, March 2026"
+_SUFFIX = re.compile(r'\s+[|—–-]\s+[^|—]{0,80}\b(?:19|20)\d{2}\b[^|—]{0,20}$')
+
+
+def _stem(word):
+    return word[:-1] if len(word) > 4 and word.endswith('s') and not word.endswith('ss') else word
+
+
+def shingles(text):
+    """Word unigrams and bigrams of the normalized text, stopwords dropped."""
+    text = _SUFFIX.sub('', text or '')
+    words = [_stem(w) for w in normalize_title(text).split() if w not in STOPWORDS]
+    out = set(words)
+    out.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return out
+
+
+def _h(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def signature(shingle_set):
+    hashed = [_h(s) for s in shingle_set]
+    if not hashed:
+        return ()
+    return tuple(min((a * x + b) % _PRIME for x in hashed) for a, b in _PERMS)
+
+
+def similarity(a, b):
+    """Jaccard similarity of two shingle sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHashIndex:
+    """Texts keyed by an id; near-duplicate lookups in roughly constant time."""
+
+    def __init__(self, threshold=THRESHOLD):
+        self.threshold = threshold
+        self._buckets = {}
+        self._sets = {}
+
+    def __len__(self):
+        return len(self._sets)
+
+    def add(self, key, text):
+        sh = shingles(text)
+        if not sh:
+            return
+        entry = (key, len(self._sets))
+        self._sets[entry] = sh
+        for band in self._bands(signature(sh)):
+            self._buckets.setdefault(band, []).append(entry)
+
+    @staticmethod
+    def _bands(sig):
+        for i in range(BANDS):
+            yield (i,) + sig[i * ROWS:(i + 1) * ROWS]
+
+    def query(self, text, threshold=None):
+        """[(key, score)] for every indexed text at or above threshold, best first."""
+        threshold = self.threshold if threshold is None else threshold
+        sh = shingles(text)
+        if not sh:
+            return []
+        best = {}
+        seen = set()
+        for band in self._bands(signature(sh)):
+            for entry in self._buckets.get(band, ()):
+                if entry in seen:
+                    continue
+                seen.add(entry)
+                score = similarity(sh, self._sets[entry])
+                if score >= threshold and score > best.get(entry[0], 0):
+                    best[entry[0]] = score
+        return sorted(best.items(), key=lambda kv: -kv[1])
+
+    def nearest(self, text, threshold=None):
+        hits = self.query(text, threshold)
+        return hits[0] if hits else None
+
+
+class ArticleIndex:
+    """Past articles by title and by key finding, keyed by memory position."""
+
+    def __init__(self, records, threshold=THRESHOLD):
+        self.records = records
+        self.titles = MinHashIndex(threshold)
+        self.findings = MinHashIndex(threshold)
+        self._ids = {}
+        for n, record in enumerate(records):
+            for key in keys_of(record):
+                if not key.startswith('title:'):
+                    self._ids.setdefault(key, n)
+            if record.get('title'):
+                self.titles.add(n, record['title'])
+            if record.get('key_finding'):
+                self.findings.add(n, record['key_finding'])
+
+    def match(self, title='', key_finding=''):
+        """The past record `title` or `key_finding` near-duplicates, or None."""
+        hits = self.titles.query(title) if title else []
+        if key_finding:
+            hits += self.findings.query(key_finding)
+        if not hits:
+            return None
+        best = max(hits, key=lambda kv: kv[1])
+        return self.records[best[0]]
+
+    def repeat(self, record):
+        """The past record `record` is surely a repeat of, or None.
+
+        Only a shared DOI or PMID, or a near-exact title, will do: this
+        decides what is deleted from a digest already written.
+        """
+        for key in keys_of(record):
+            if key in self._ids:
+                return self.records[self._ids[key]]
+        hit = self.titles.nearest(record.get('title', ''), NEAR_EXACT) if record.get('title') else None
+        return self.records[hit[0]] if hit else None
+
+
+def index_memory(memory, threshold=THRESHOLD):
+    """An index over the past articles that are known to be papers.
+
+    Only records with a DOI, PMID or structured metadata: memory also
+    holds bold lines the digest used as labels, and a new article should
+    never be dropped for resembling one of those.
+    """
+    papers = [r for r in memory.records if r.get('doi') or r.get('pmid') or r.get('topics')]
+    return ArticleIndex(papers, threshold)
+
+
+def distinct_labels(memory, n=50, threshold=THRESHOLD):
+    """The last `n` papers reviewed, one label per paper, newest last.
+
+    Walks the memory newest first and skips any label that near-duplicates
+    one already kept, so the prompt's exclusion list names each paper once.
+    """
+    kept = MinHashIndex(threshold)
+    labels = []
+    for record in reversed(memory.records):
+        title = record.get('title')
+        label = title or record.get('citation') or record.get('doi')
+        if not label:
+            continue
+        if title:
+            # citation lines are unique by DOI already, and look alike by design
+            if kept.nearest(title) is not None:
+                continue
+            kept.add(len(labels), title)
+        labels.append(label)
+        if len(labels) == n:
+            break
+    return labels[::-1]
@@ -0,0 +1,529 @@
+"""
+PDF downloads for the literature digest.
+========================================
+Every open-access article in a digest links its PDF. Fetching them one
+after another with a fresh connection each time makes the download phase
+take the sum of every fetch; this module makes it take roughly the
+slowest one:
+
+- one pooled requests.Session (keep-alive) shared by a thread pool
+- at most PER_HOST requests in flight to any one host, so a publisher
+  serving several PDFs is not hammered
+- bodies streamed to a partial file in chunks, capped at MAX_BYTES
+- the %PDF magic bytes checked rather than the content-type, which
+  publishers get wrong in both directions
+- the file renamed into place only once it is complete and valid, so an
+  interrupted run never leaves a truncated PDF that looks finished
+
+The same paper is often linked again in a later digest window, which
+lands it in a different example_inputs/<range>/ folder. A catalog at the
+top of PDF_OUTPUT_DIR remembers every PDF ever fetched — URL, DOI,
+ETag/Last-Modified, SHA-256, size and path — so a repeat is a conditional
+GET (usually a 304) or no request at all, and identical content is
+hard-linked rather than stored twice. A download cut off part way is
+resumed with a Range request on the next run.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+WORKERS = 8
+PER_HOST = 2
+TIMEOUT = 30
+CHUNK_SIZE = 64 * 1024
+MAX_BYTES = 50 * 1024 * 1024
+
+# The header may follow a little junk; readers accept it anywhere in the
+# first kilobyte.
+PDF_MAGIC = b'%PDF-'
+MAGIC_WINDOW = 1024
+
+CATALOG_FILE = 'pdf_catalog.json'
+PARTIAL_DIR = '.partial'
+
+
+class DownloadError(Exception):
+    """A fetch that produced no usable PDF."""
+
+
+class Interrupted(DownloadError):
+    """The connection dropped part way; the partial file is kept."""
+
+    def __init__(self, message, etag='', last_modified=''):
+        super().__init__(message)
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+def safe_filename(title):
+    """The file name a title is saved under."""
+    safe_title = re.sub(r'[<>:"/\\|?*]', '', title)[:80]  # Remove invalid chars, limit length
+    safe_title = safe_title.strip().replace(' ', '_')
+    return f"{safe_title}.pdf"
+
+
+def normalize_doi(doi):
+    """'https://doi.org/10.1000/ABC.' -> '10.1000/abc'. Empty if not a DOI."""
+    if not doi:
+        return ''
+    m = re.search(r'10\.\d{4,9}/\S+', doi)
+    return m.group(0).rstrip('.,;)]').lower() if m else ''
+
+
+def make_session(pool_size=WORKERS):
+    """A keep-alive session with enough pooled connections for the workers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+class HostLimiter:
+    """Caps concurrent requests per host."""
+
+    def __init__(self, per_host=PER_HOST):
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._slots = {}
+
+    @contextmanager
+    def slot(self, url):
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            sem = self._slots.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        with sem:
+            yield
+
+
+# ---------------------------------------------------------------------------
+# Catalog
+# ---------------------------------------------------------------------------
+
+class Catalog:
+    """Every PDF fetched into any folder under `root`, keyed by URL.
+
+    Entries hold the DOI, validators, SHA-256, size and the path relative
+    to `root`. Lookups only return entries whose file is still there and
+    still the recorded size. Safe to share between download threads;
+    `save` writes it atomically.
+    """
+
+    def __init__(self, root, persist=True):
+        self.root = Path(root)
+        self.persist = persist
+        self.path = self.root / CATALOG_FILE
+        self._lock = threading.RLock()
+        self.entries = {}
+        self.partials = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+                self.entries = data.get('entries', {})
+                self.partials = data.get('partials', {})
+            except (OSError, ValueError) as e:
+                print(f"  Warning: ignoring unreadable PDF catalog {self.path}: {e}")
+        self._by_doi = {}
+        self._by_sha = {}
+        for url, entry in self.entries.items():
+            self._index(url, entry)
+
+    def _index(self, url, entry):
+        if entry.get('doi'):
+            self._by_doi[entry['doi']] = url
+        if entry.get('sha256'):
+            self._by_sha[entry['sha256']] = url
+
+    def _live(self, url):
+        entry = self.entries.get(url)
+        if not entry:
+            return None
+        path = self.root / entry['path']
+        try:
+            if path.stat().st_size != entry.get('size'):
+                return None
+        except OSError:
+            return None
+        return entry
+
+    def lookup(self, url):
+        with self._lock:
+            return self._live(url)
+
+    def by_doi(self, doi):
+        with self._lock:
+            url = self._by_doi.get(normalize_doi(doi))
+            return self._live(url) if url else None
+
+    def by_sha(self, sha256):
+        with self._lock:
+            url = self._by_sha.get(sha256)
+            return self._live(url) if url else None
+
+    def file(self, entry):
+        return self.root / entry['path']
+
+    def record(self, url, path, sha256, size, doi='', etag='', last_modified=''):
+        path = Path(path)
+        try:
+            rel = path.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            rel = str(path.resolve())
+        entry = {
+            'url': url,
+            'doi': normalize_doi(doi),
+            'etag': etag or '',
+            'last_modified': last_modified or '',
+            'sha256': sha256,
+            'size': size,
+            'path': rel,
+            'fetched': datetime.now().isoformat(timespec='seconds'),
+        }
+        with self._lock:
+            self.entries[url] = entry
+            self.partials.pop(url, None)
+            self._index(url, entry)
+        return entry
+
+    def partial(self, url):
+        """Where an interrupted download of `url` is kept, and its validators."""
+        name = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32] + '.part'
+        with self._lock:
+            return self.root / PARTIAL_DIR / name, dict(self.partials.get(url, {}))
+
+    def note_partial(self, url, etag='', last_modified=''):
+        """Remember the validators of an interrupted download, on disk at once.
+
+        Saved now rather than with the rest of the catalog, so a process
+        killed before then still knows how to resume it safely.
+        """
+        with self._lock:
+            self.partials[url] = {'etag': etag or '', 'last_modified': last_modified or ''}
+            self.save()
+
+    def drop_partial(self, url):
+        with self._lock:
+            self.partials.pop(url, None)
+
+    def save(self):
+        if not self.persist:
+            return
+        # download threads and queues sharing the catalog all save through
+        # the one .tmp file: write and replace it as a single step
+        with self._lock:
+            blob = json.dumps({'version': 1, 'entries': self.entries,
+                               'partials': self.partials}, indent=2)
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.tmp')
+            tmp.write_text(blob, encoding='utf-8')
+            os.replace(tmp, self.path)
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def place(src, dest):
+    """Put the content of `src` at `dest`: a hard link, or a copy where links fail."""
+    src, dest = Path(src), Path(dest)
+    if dest.exists():
+        try:
+            if os.path.samefile(src, dest):
+                return
+        except OSError:
+            pass
+    tmp = dest.with_name(f".{dest.name}.link")
+    try:
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copy2(src, tmp)
+        os.replace(tmp, dest)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Fetching
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Fetched:
+    status: int                 # 200, 206 (resumed) or 304 (unchanged)
+    etag: str = ''
+    last_modified: str = ''
+    sha256: str = ''
+    size: int = 0
+
+
+def fetch(session, url, part, max_bytes=MAX_BYTES, validators=None, resume=None):
+    """Stream `url` into the partial file `part`.
+
+    `validators` ({'etag', 'last_modified'} of a copy already held) make
+    it a conditional GET; a 304 comes back as status 304 and `part` is
+    untouched. If `part` already holds the start of the body it asks for
+    the rest with a Range request, guarded by `resume` validators, and
+    starts over if the server sends the whole thing instead. Without
+    validators to guard it, the partial is discarded: the rest of a file
+    that changed upstream would be stitched onto stale bytes.
+
+    A body that is not a PDF, too big, or an HTTP error raises
+    DownloadError and the partial is removed; a dropped connection raises
+    Interrupted, carrying the response's validators, and leaves it for
+    next time.
+    """
+    part = Path(part)
+    part.parent.mkdir(parents=True, exist_ok=True)
+    headers = {}
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    have = part.stat().st_size if part.exists() else 0
+    guard = (resume or {}).get('etag') or (resume or {}).get('last_modified')
+    if have and not guard:
+        part.unlink()
+        have = 0
+    if have:
+        headers['Range'] = f'bytes={have}-'
+        headers['If-Range'] = guard
+
+    try:
+        with session.get(url, stream=True, timeout=TIMEOUT, allow_redirects=True,
+                         headers=headers) as response:
+            if response.status_code == 304:
+                return Fetched(304, validators.get('etag', ''), validators.get('last_modified', ''))
+            if response.status_code == 416 and have:
+                part.unlink()
+                return fetch(session, url, part, max_bytes, validators)
+            if response.status_code >= 400:
+                raise _fatal(part, f"HTTP {response.status_code}")
+
+            resumed = response.status_code == 206 and have
+            length = response.headers.get('content-length', '')
+            total = int(length) + (have if resumed else 0) if length.isdigit() else 0
+            if total > max_bytes:
+                raise _fatal(part, f"too large ({total:,} bytes)")
+
+            got = Fetched(206 if resumed else 200,
+                          response.headers.get('etag', ''),
+                          response.headers.get('last-modified', ''))
+            hasher = hashlib.sha256()
+            head = b''
+            size = 0
+            if resumed:
+                with open(part, 'rb') as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                        if len(head) < MAGIC_WINDOW:
+                            head += chunk[:MAGIC_WINDOW]
+                        hasher.update(chunk)
+                        size += len(chunk)
+
+            try:
+                with open(part, 'ab' if resumed else 'wb') as f:
+                    size = _stream(response, f, hasher, size, head, max_bytes)
+            except DownloadError:
+                part.unlink(missing_ok=True)
+                raise
+            except requests.RequestException as e:
+                # keep what arrived; the next run asks for the rest
+                raise Interrupted(f"interrupted after {part.stat().st_size:,} bytes: {e}",
+                                  got.etag, got.last_modified) from e
+
+            got.sha256 = hasher.hexdigest()
+            got.size = size
+            return got
+    except requests.RequestException as e:
+        raise DownloadError(str(e)) from e
+
+
+def _fatal(part, message):
+    part.unlink(missing_ok=True)
+    return DownloadError(message)
+
+
+def _stream(response, f, hasher, size, head, max_bytes):
+    checked = len(head) >= MAGIC_WINDOW
+    if checked:
+        _check_magic(head, response)
+    for chunk in response.iter_content(CHUNK_SIZE):
+        if not chunk:
+            continue
+        size += len(chunk)
+        if size > max_bytes:
+            raise DownloadError(f"larger than {max_bytes:,} bytes")
+        if not checked:
+            head += chunk
+            if len(head) >= MAGIC_WINDOW:
+                # give up on an HTML landing page at the first kilobyte, not the last
+                _check_magic(head, response)
+                checked = True
+        hasher.update(chunk)
+        f.write(chunk)
+    if not checked:
+        _check_magic(head, response)
+    return size
+
+
+def _check_magic(head, response):
+    if PDF_MAGIC not in head[:MAGIC_WINDOW]:
+        content_type = response.headers.get('content-type', '').lower()
+        raise DownloadError(f"not a PDF (content-type: {content_type or 'none'})")
+
+
+# ---------------------------------------------------------------------------
+# Downloading a digest's PDFs
+# ---------------------------------------------------------------------------
+
+class DownloadQueue:
+    """PDF downloads started as links turn up, collected once all are needed.
+
+    submit() starts fetching an article's PDF into `pdf_folder` in the
+    background (once per URL); results() waits for everything submitted.
+    The catalog, per-host limit and failure handling are download_all's.
+    """
+
+    def __init__(self, pdf_folder, workers=WORKERS, per_host=PER_HOST,
+                 max_bytes=MAX_BYTES, session=None, catalog=None):
+        self.pdf_folder = Path(pdf_folder)
+        self.pdf_folder.mkdir(parents=True, exist_ok=True)
+        # without a catalog, nothing is remembered past this queue
+        self.catalog = catalog if catalog is not None else Catalog(self.pdf_folder, persist=False)
+        self.max_bytes = max_bytes
+        self._own_session = session is None
+        self._session = session or make_session(workers)
+        self._limiter = HostLimiter(per_host)
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self._futures = {}          # url -> future, in submission order
+
+    def submit(self, title, url, doi=''):
+        with self._lock:
+            if url not in self._futures:
+                self._futures[url] = self._pool.submit(self._one, title, url, doi)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._futures)
+
+    def _one(self, title, url, doi):
+        filepath = self.pdf_folder / safe_filename(title)
+        try:
+            with self._limiter.slot(url):
+                entry = _obtain(self._session, self.catalog, url, doi, filepath, self.max_bytes)
+        except (DownloadError, OSError) as e:
+            print(f"  Failed to download {url}: {e}")
+            return None
+        return {'title': title, 'url': url, 'path': str(filepath), 'sha256': entry['sha256']}
+
+    def results(self):
+        """Wait for every download and close the queue.
+
+        Returns {'title', 'url', 'path', 'sha256'} for each PDF now on
+        disk, in the order submitted.
+        """
+        try:
+            self._pool.shutdown(wait=True)
+        finally:
+            if self._own_session:
+                self._session.close()
+            self.catalog.save()
+        with self._lock:
+            futures = list(self._futures.values())
+        return [r for r in (f.result() for f in futures) if r]
+
+
+def download_all(articles, pdf_folder, workers=WORKERS, per_host=PER_HOST,
+                 max_bytes=MAX_BYTES, session=None, catalog=None):
+    """Download articles' PDFs concurrently into `pdf_folder`.
+
+    `articles` are (title, url) or (title, url, doi). With a `catalog`
+    shared across folders, a PDF already held anywhere is revalidated or
+    reused rather than fetched again, and identical content is
+    hard-linked. Without one, nothing is remembered past this call.
+
+    Returns {'title', 'url', 'path', 'sha256'} for each PDF now on disk,
+    in the order given. Failures are reported and skipped.
+    """
+    queue = DownloadQueue(pdf_folder, max(1, min(workers, len(articles))), per_host,
+                          max_bytes, session, catalog)
+    for article in articles:
+        queue.submit(*article)
+    return queue.results()
+
+
+def _obtain(session, catalog, url, doi, filepath, max_bytes):
+    """Make `filepath` hold the PDF at `url`; return its catalog entry."""
+    name = filepath.name
+    known = catalog.lookup(url)
+
+    if filepath.exists():
+        if known and catalog.file(known).resolve() == filepath.resolve():
+            print(f"  Already exists: {name}")
+            return known
+        if not known:
+            # fetched before the catalog existed; adopt it
+            print(f"  Already exists: {name}")
+            return catalog.record(url, filepath, file_sha256(filepath),
+                                  filepath.stat().st_size, doi)
+
+    if known is None and doi:
+        same_paper = catalog.by_doi(doi)
+        if same_paper:
+            place(catalog.file(same_paper), filepath)
+            print(f"  Reused (same DOI): {name}")
+            return catalog.record(url, filepath, same_paper['sha256'], same_paper['size'], doi,
+                                  same_paper.get('etag'), same_paper.get('last_modified'))
+
+    part, resume = catalog.partial(url)
+    validators = None
+    if known and not part.exists():
+        validators = {'etag': known.get('etag', ''), 'last_modified': known.get('last_modified', '')}
+        if not (validators['etag'] or validators['last_modified']):
+            validators = None
+    try:
+        got = fetch(session, url, part, max_bytes, validators, resume)
+    except Interrupted as e:
+        catalog.note_partial(url, e.etag, e.last_modified)
+        raise
+    except DownloadError:
+        catalog.drop_partial(url)
+        raise
+
+    if got.status == 304:
+        place(catalog.file(known), filepath)
+        print(f"  Unchanged: {name}")
+        return catalog.record(url, filepath, known['sha256'], known['size'], doi or known.get('doi'),
+                              known.get('etag'), known.get('last_modified'))
+
+    duplicate = catalog.by_sha(got.sha256)
+    if duplicate:
+        part.unlink(missing_ok=True)
+        place(catalog.file(duplicate), filepath)
+        print(f"  Linked (identical content): {name}")
+    else:
+        os.replace(part, filepath)
+        print(f"  {'Resumed' if got.status == 206 else 'Downloaded'}: {name}")
+    return catalog.record(url, filepath, got.sha256, got.size, doi, got.etag, got.last_modified)
+
@@ -0,0 +1,163 @@
+"""
+Checkpoints for digest generation runs.
+=======================================
+A digest is written by a web-searching triage call streamed over
+several segments, then one review call per article it picked, and used
+to live only in memory until the last one finished: any exception threw
+away everything already paid for. A Run keeps, under runs/<run id>/:
+
+- run.json, the checkpoint: the prompts, the triage message history and
+  the text accumulated through the last completed segment, then the
+  selected candidates and each finished review, rewritten atomically
+  after each step
+- partial.md, the triage text so far, appended as it streams in
+
+Resuming a run continues from its last completed segment (the text of
+a segment cut short is discarded with it), or with the reviews not yet
+written. Once generation has ended and the digest has been
+post-processed, the final content and the memory records it adds are
+recorded before memory is written, so a crash while remembering or
+saving resumes without calling the model or filtering the digest
+against its own articles again. The run directory is removed when the
+digest has been saved.
+"""
+
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+class RunError(Exception):
+    pass
+
+
+def _plain(block):
+    """An SDK content block as the JSON the API accepts back."""
+    if isinstance(block, dict):
+        return block
+    return block.to_dict(mode='json', exclude_none=True)
+
+
+class Run:
+    """One generation run's checkpoint directory."""
+
+    def __init__(self, directory, state):
+        self.directory = Path(directory)
+        self.state = state
+        self._partial = None
+        # reviews finish on worker threads
+        self._lock = threading.RLock()
+
+    @classmethod
+    def start(cls, runs_dir, system, user, window, run_id=None):
+        run_id = run_id or datetime.now().strftime('%Y%m%d-%H%M%S')
+        directory = Path(runs_dir) / run_id
+        if directory.exists():
+            raise RunError(f"run {run_id} already exists in {runs_dir}")
+        directory.mkdir(parents=True)
+        run = cls(directory, {
+            'run_id': run_id,
+            'window': window,
+            'system': system,
+            'messages': [{'role': 'user', 'content': user}],
+            'text': '',
+            'segments': 0,
+            'stop_reason': None,
+            'candidates': None,
+            'reviews': {},
+            'final': None,
+            'records': [],
+            'completed': None,
+        })
+        run.save()
+        return run
+
+    @classmethod
+    def resume(cls, runs_dir, run_id):
+        directory = Path(runs_dir) / run_id
+        try:
+            state = json.loads((directory / 'run.json').read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            raise RunError(f"no run {run_id} in {runs_dir}") from None
+        run = cls(directory, state)
+        # drop whatever a segment cut short had streamed
+        (directory / 'partial.md').write_text(state['text'], encoding='utf-8')
+        return run
+
+    @property
+    def run_id(self):
+        return self.state['run_id']
+
+    @property
+    def partial_path(self):
+        return self.directory / 'partial.md'
+
+    @property
+    def generating(self):
+        """True until the model has stopped for good."""
+        return self.state['stop_reason'] in (None, 'pause_turn')
+
+    def stream_text(self, text):
+        """Append streamed text to partial.md."""
+        if self._partial is None:
+            self._partial = open(self.partial_path, 'a', encoding='utf-8')
+        self._partial.write(text)
+        self._partial.flush()
+
+    def complete_segment(self, response):
+        """Record a finished segment and checkpoint."""
+        self._close_partial()
+        text = ''.join(b.text for b in response.content if b.type == 'text')
+        self.state['text'] += text
+        self.state['segments'] += 1
+        self.state['stop_reason'] = response.stop_reason
+        if response.stop_reason == 'pause_turn':
+            self.state['messages'].append(
+                {'role': 'assistant', 'content': [_plain(b) for b in response.content]})
+        self.save()
+        # partial.md now holds exactly the checkpointed text
+        self.partial_path.write_text(self.state['text'], encoding='utf-8')
+
+    def select(self, candidates):
+        """Record the articles triage picked; their reviews come next."""
+        self.state['candidates'] = candidates
+        self.state['reviews'] = {}
+        self.save()
+
+    def complete_review(self, key, review):
+        """Record one article's finished review and checkpoint."""
+        with self._lock:
+            self.state['reviews'][key] = review
+            self.save()
+
+    def complete(self, content, records=()):
+        """Record the post-processed digest and the memory records it adds.
+
+        Checkpointed before memory is touched: a resume returns the
+        content as is and adds the same records again, which memory
+        merges into the ones already there.
+        """
+        self.state['final'] = content
+        self.state['records'] = list(records)
+        self.state['completed'] = datetime.now().isoformat()
+        self.save()
+
+    def finish(self):
+        """The digest is saved: the checkpoint is no longer needed."""
+        self._close_partial()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def save(self):
+        with self._lock:
+            path = self.directory / 'run.json'
+            tmp = path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(self.state, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp, path)
+
+    def _close_partial(self):
+        if self._partial is not None:
+            self._partial.close()
+            self._partial = None
@@ -0,0 +1,1033 @@
+"""
+Static build for the literature-monitor site.
+=============================================
+Renders the site from the digest JSON already on disk — no API calls:
+
+- index.html, the newest digest
+- digests/<date>.html, one page per digest (the archive links to these)
+- archive.html, the list of every digest
+
+Each output is recorded in digests/build_state.json against a hash of
+what it was rendered from: the source JSON and the code of this module,
+the digest parser and the Markdown renderer, so editing a template invalidates every page
+and nothing else does. Outputs whose hash is unchanged (and whose file
+still exists) are skipped, changed pages are rendered in parallel, and a
+page is only written — atomically — if its bytes actually differ.
+
+    python scripts/digest_site.py [--force] [--workers N]
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import digest_document
+from digest_markdown import render
+
+SITE_DIR = "literature-monitor"
+STATE_FILE = "digests/build_state.json"
+
+# Below this many pages to render, starting worker processes costs more
+# than it saves
+PARALLEL_MIN = 8
+
+_CODE = [Path(__file__).resolve()] + [
+    Path(__file__).resolve().with_name(name) for name in ("digest_document.py", "digest_markdown.py")]
+
+
+def _code_hash():
+    h = hashlib.sha256()
+    for path in _CODE:
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def _generated(digest_data):
+    """'August 09, 2026' from the digest's generated_at (or its date)."""
+    stamp = digest_data.get("generated_at") or digest_data.get("date", "")
+    try:
+        return datetime.fromisoformat(stamp).strftime('%B %d, %Y')
+    except ValueError:
+        return digest_data.get("generated", stamp)
+
+
+# Journals searched — single source of truth
+JOURNAL_LIST = [
+    # Pediatric ID
+    ("PIDJ", "Pediatric Infectious Disease Journal"),
+    ("JPIDS", "J. Pediatric Infectious Diseases Society"),
+    ("CID", "Clinical Infectious Diseases"),
+    ("Pediatrics", "Pediatrics (ID-relevant)"),
+    ("JAMA Peds", "JAMA Pediatrics"),
+    # Antimicrobial Pharmacology & Resistance
+    ("AAC", "Antimicrobial Agents &amp; Chemotherapy"),
+    ("JAC", "Journal of Antimicrobial Chemotherapy"),
+    ("JAC-AMR", "JAC-Antimicrobial Resistance"),
+    ("IJAA", "International Journal of Antimicrobial Agents"),
+    ("CMI", "Clinical Microbiology and Infection"),
+    # Precision Dosing / PK/PD
+    ("Clin PK", "Clinical Pharmacokinetics"),
+    ("TDM", "Therapeutic Drug Monitoring"),
+    ("Pharmacotherapy", "Pharmacotherapy"),
+    ("Pediatric Drugs", "Pediatric Drugs"),
+    # ASP / Outcomes
+    ("ASHE", "Antimicrobial Stewardship &amp; Healthcare Epidemiology"),
+    ("OFID", "Open Forum Infectious Diseases"),
+    # High-impact
+    ("NEJM", "New England Journal of Medicine"),
+    ("JAMA", "JAMA"),
+    ("Lancet ID", "Lancet Infectious Diseases"),
+    ("MMWR", "CDC Morbidity &amp; Mortality Weekly"),
+]
+
+
+def render_digest_page(digest_data, root=""):
+    """The HTML page that displays one digest.
+
+    `root` is the path from the page back to literature-monitor/.
+    """
+
+    doc = digest_document.parse(digest_data["content"])
+    total, oa, pw = doc.counts()
+
+    journal_chips = "\n                ".join(
+        f'<div class="journal-chip"><span class="abbr">{abbr}</span> {name}</div>'
+        for abbr, name in JOURNAL_LIST
+    )
+
+    html_content = f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Literature Monitor | Sage Project</title>
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Outfit:wght@300;400;500;600;700&family=Source+Serif+4:opsz,wght@8..60,400;8..60,600&display=swap" rel="stylesheet">
+    <style>
+        :root {{
+            --sage-50: #1a1f1a;
+            --sage-100: #252b25;
+            --sage-200: #333b33;
+            --sage-300: #4a5a4b;
+            --sage-400: #6a806c;
+            --sage-500: #7fa882;
+            --sage-600: #8fbf92;
+            --sage-700: #a8d4ab;
+            --sage-800: #c5e5c7;
+            --sage-900: #e8f5e9;
+
+            --warm-50: #111411;
+            --warm-100: #1a1f1a;
+
+            --accent-lavender: #b8a5d4;
+            --accent-lavender-light: rgba(184, 165, 212, 0.15);
+
+            --text-primary: #e0e8e0;
+            --text-secondary: #9bb09d;
+            --text-muted: #6a806c;
+
+            --surface: #181c18;
+            --surface-raised: #1e231e;
+
+            --shadow-sm: 0 1px 2px rgba(0, 0, 0, 0.2);
+            --shadow-md: 0 4px 12px rgba(0, 0, 0, 0.3);
+            --shadow-lg: 0 12px 32px rgba(0, 0, 0, 0.4);
+
+            --radius-sm: 8px;
+            --radius-md: 12px;
+            --radius-lg: 20px;
+        }}
+
+        * {{
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }}
+
+        body {{
+            font-family: 'Outfit', sans-serif;
+            background: var(--warm-50);
+            color: var(--text-primary);
+            line-height: 1.7;
+            min-height: 100vh;
+        }}
+
+        .bg-gradient {{
+            position: fixed;
+            top: 0;
+            left: 0;
+            right: 0;
+            bottom: 0;
+            background:
+                radial-gradient(ellipse at 20% 20%, rgba(184, 165, 212, 0.06) 0%, transparent 50%),
+                radial-gradient(ellipse at 80% 80%, rgba(127, 168, 130, 0.04) 0%, transparent 50%),
+                var(--warm-50);
+            z-index: -1;
+        }}
+
+        header {{
+            background: rgba(17, 20, 17, 0.9);
+            backdrop-filter: blur(20px);
+            border-bottom: 1px solid var(--sage-100);
+            padding: 1rem 2rem;
+            position: sticky;
+            top: 0;
+            z-index: 100;
+        }}
+
+        .header-content {{
+            max-width: 900px;
+            margin: 0 auto;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+        }}
+
+        .back-link {{
+            display: flex;
+            align-items: center;
+            gap: 8px;
+            text-decoration: none;
+            color: var(--text-secondary);
+            font-weight: 500;
+            transition: color 0.2s;
+        }}
+
+        .back-link:hover {{
+            color: var(--sage-600);
+        }}
+
+        .back-link svg {{
+            width: 20px;
+            height: 20px;
+        }}
+
+        .logo {{
+            display: flex;
+            align-items: center;
+            gap: 10px;
+        }}
+
+        .logo-icon {{
+            width: 36px;
+            height: 36px;
+            background: linear-gradient(135deg, var(--sage-500), var(--sage-600));
+            border-radius: var(--radius-sm);
+            display: flex;
+            align-items: center;
+            justify-content: center;
+        }}
+
+        .logo-icon svg {{
+            width: 20px;
+            height: 20px;
+            color: white;
+        }}
+
+        .logo-text {{
+            font-size: 1.25rem;
+            font-weight: 600;
+            color: var(--sage-700);
+        }}
+
+        main {{
+            max-width: 900px;
+            margin: 0 auto;
+            padding: 2rem;
+        }}
+
+        .page-header {{
+            text-align: center;
+            margin-bottom: 2rem;
+        }}
+
+        .tool-badge {{
+            display: inline-flex;
+            align-items: center;
+            gap: 8px;
+            background: var(--accent-lavender-light);
+            color: var(--accent-lavender);
+            padding: 0.5rem 1rem;
+            border-radius: 100px;
+            font-size: 0.85rem;
+            font-weight: 600;
+            margin-bottom: 1rem;
+        }}
+
+        .tool-badge svg {{
+            width: 16px;
+            height: 16px;
+        }}
+
+        .page-header h1 {{
+            font-family: 'Source Serif 4', serif;
+            font-size: 2.25rem;
+            font-weight: 600;
+            color: var(--sage-800);
+            margin-bottom: 0.5rem;
+        }}
+
+        .page-header p {{
+            color: var(--text-muted);
+            font-size: 1.05rem;
+        }}
+
+        .digest-meta {{
+            display: flex;
+            justify-content: center;
+            gap: 2rem;
+            margin-top: 1rem;
+            font-size: 0.9rem;
+            color: var(--text-muted);
+        }}
+
+        .digest-meta span {{
+            display: flex;
+            align-items: center;
+            gap: 6px;
+        }}
+
+        .digest-meta svg {{
+            width: 16px;
+            height: 16px;
+        }}
+
+        .digest-content {{
+            background: var(--surface-raised);
+            border: 1px solid var(--sage-100);
+            border-radius: var(--radius-lg);
+            padding: 2.5rem;
+            box-shadow: var(--shadow-sm);
+        }}
+
+        .digest-content h1 {{
+            font-family: 'Source Serif 4', serif;
+            font-size: 1.75rem;
+            font-weight: 600;
+            color: var(--sage-800);
+            margin-bottom: 1.5rem;
+            padding-bottom: 1rem;
+            border-bottom: 2px solid var(--sage-100);
+        }}
+
+        .digest-content h2 {{
+            font-size: 1.2rem;
+            font-weight: 600;
+            color: var(--sage-700);
+            margin-top: 2.5rem;
+            margin-bottom: 1rem;
+            padding-bottom: 0.5rem;
+            border-bottom: 1px solid var(--sage-100);
+        }}
+
+        .digest-content h3 {{
+            font-size: 1.05rem;
+            font-weight: 600;
+            color: var(--sage-600);
+            margin-top: 1.5rem;
+            margin-bottom: 0.5rem;
+        }}
+        
+        .digest-content h4 {{
+            font-size: 0.95rem;
+            font-weight: 600;
+            color: var(--sage-600);
+            margin-top: 1.25rem;
+            margin-bottom: 0.5rem;
+        }}
+
+        .digest-content p {{
+            margin-bottom: 1rem;
+            line-height: 1.7;
+        }}
+
+        .digest-content ul, .digest-content ol {{
+            margin-bottom: 1rem;
+            padding-left: 1.5rem;
+        }}
+
+        .digest-content li {{
+            margin-bottom: 0.5rem;
+            line-height: 1.6;
+        }}
+
+        .digest-content a {{
+            color: var(--accent-lavender);
+            text-decoration: none;
+            word-break: break-word;
+        }}
+
+        .digest-content a:hover {{
+            text-decoration: underline;
+        }}
+
+        .digest-content strong {{
+            color: var(--sage-700);
+        }}
+        
+        .digest-content em {{
+            color: var(--text-secondary);
+        }}
+
+        .digest-content blockquote {{
+            border-left: 3px solid var(--accent-lavender);
+            padding-left: 1rem;
+            margin: 1rem 0;
+            color: var(--text-secondary);
+            font-style: italic;
+        }}
+        
+        .digest-content hr {{
+            border: none;
+            border-top: 1px solid var(--sage-100);
+            margin: 2rem 0;
+        }}
+
+        .paywall-notice {{
+            color: #ef5350;
+            font-weight: 600;
+            font-size: 0.9rem;
+            background: rgba(239, 83, 80, 0.12);
+            padding: 0.25rem 0.5rem;
+            border-radius: 4px;
+            display: inline-block;
+            margin-top: 0.5rem;
+        }}
+
+        .open-access-badge {{
+            color: #66bb6a;
+            font-weight: 600;
+            font-size: 0.85rem;
+            background: rgba(102, 187, 106, 0.12);
+            padding: 0.2rem 0.5rem;
+            border-radius: 4px;
+            display: inline-block;
+        }}
+
+        .scan-summary {{ background: var(--sage-50); border: 1px solid var(--sage-100); border-radius: var(--radius-md); padding: 1.25rem 1.5rem; margin-bottom: 1.5rem; display: flex; flex-wrap: wrap; gap: 1.5rem; align-items: center; font-size: 0.9rem; color: var(--text-secondary); }}
+        .scan-summary .stat {{ display: flex; align-items: center; gap: 6px; }}
+        .scan-summary .stat strong {{ color: var(--sage-700); }}
+        .scan-summary svg {{ width: 16px; height: 16px; flex-shrink: 0; }}
+        .scan-summary .journals-toggle {{ color: var(--accent-lavender); cursor: pointer; font-weight: 500; text-decoration: underline dotted; text-underline-offset: 3px; background: none; border: none; font: inherit; padding: 0; }}
+        .scan-summary .journals-toggle:hover {{ color: var(--sage-700); }}
+        .journals-panel {{ max-height: 0; overflow: hidden; transition: max-height 0.35s ease, padding 0.35s ease, margin 0.35s ease; background: var(--surface-raised); border: 1px solid var(--sage-100); border-radius: var(--radius-md); margin-bottom: 0; padding: 0 1.5rem; }}
+        .journals-panel.open {{ max-height: 800px; padding: 1.25rem 1.5rem; margin-bottom: 1.5rem; }}
+        .journals-panel h3 {{ font-size: 0.95rem; font-weight: 600; color: var(--sage-700); margin-bottom: 0.75rem; }}
+        .journal-grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(260px, 1fr)); gap: 0.5rem; margin-bottom: 1rem; }}
+        .journal-chip {{ display: flex; align-items: center; gap: 8px; padding: 0.4rem 0.75rem; background: var(--sage-50); border: 1px solid var(--sage-100); border-radius: 6px; font-size: 0.85rem; }}
+        .journal-chip .abbr {{ font-weight: 600; color: var(--accent-lavender); font-size: 0.75rem; min-width: 48px; }}
+        .suggest-box {{ border-top: 1px solid var(--sage-100); padding-top: 1rem; margin-top: 0.5rem; }}
+        .suggest-box label {{ display: block; font-size: 0.85rem; font-weight: 500; color: var(--text-secondary); margin-bottom: 0.5rem; }}
+        .suggest-row {{ display: flex; gap: 0.5rem; }}
+        .suggest-row input {{ flex: 1; padding: 0.5rem 0.75rem; border: 1px solid var(--sage-200); border-radius: 6px; font: inherit; font-size: 0.85rem; outline: none; background: var(--surface); color: var(--text-primary); }}
+        .suggest-row input:focus {{ border-color: var(--accent-lavender); }}
+        .suggest-row button {{ padding: 0.5rem 1rem; background: var(--sage-600); color: white; border: none; border-radius: 6px; font: inherit; font-size: 0.85rem; font-weight: 500; cursor: pointer; white-space: nowrap; }}
+        .suggest-row button:hover {{ background: var(--sage-700); }}
+        .suggest-results {{ margin-top: 0.5rem; font-size: 0.85rem; }}
+        .suggest-results .result-item {{ display: flex; justify-content: space-between; align-items: center; padding: 0.4rem 0.75rem; background: var(--sage-50); border: 1px solid var(--sage-100); border-radius: 6px; margin-bottom: 0.35rem; }}
+        .suggest-results .result-item .add-btn {{ background: var(--accent-lavender); color: white; border: none; border-radius: 4px; padding: 0.2rem 0.6rem; font-size: 0.8rem; font-weight: 500; cursor: pointer; }}
+        .suggest-status {{ margin-top: 0.5rem; padding: 0.5rem 0.75rem; border-radius: 6px; font-size: 0.85rem; display: none; }}
+        .suggest-status.success {{ display: block; background: rgba(102, 187, 106, 0.12); color: #66bb6a; }}
+        .suggest-status.error {{ display: block; background: rgba(239, 83, 80, 0.12); color: #ef5350; }}
+
+        .archive-link {{
+            text-align: center;
+            margin-top: 2rem;
+            padding-top: 1.5rem;
+            border-top: 1px solid var(--sage-100);
+        }}
+
+        .archive-link a {{
+            color: var(--accent-lavender);
+            text-decoration: none;
+            font-weight: 500;
+        }}
+
+        .archive-link a:hover {{
+            text-decoration: underline;
+        }}
+
+        footer {{
+            max-width: 900px;
+            margin: 3rem auto 0;
+            padding: 2rem;
+            text-align: center;
+            color: var(--text-muted);
+            font-size: 0.9rem;
+            border-top: 1px solid var(--sage-100);
+        }}
+
+        @media (max-width: 768px) {{
+            main {{
+                padding: 1rem;
+            }}
+
+            .digest-content {{
+                padding: 1.5rem;
+            }}
+
+            .page-header h1 {{
+                font-size: 1.75rem;
+            }}
+
+            .digest-meta {{
+                flex-direction: column;
+                gap: 0.5rem;
+            }}
+        }}
+    </style>
+</head>
+<body>
+    <div class="bg-gradient"></div>
+
+    <header>
+        <div class="header-content">
+            <a href="{root}../index.html" class="back-link">
+                <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                    <path d="M19 12H5M12 19l-7-7 7-7"/>
+                </svg>
+                Back to Dashboard
+            </a>
+            <div class="logo">
+                <div class="logo-icon">
+                    <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                        <path d="M12 2L2 7l10 5 10-5-10-5z"/>
+                        <path d="M2 17l10 5 10-5"/>
+                        <path d="M2 12l10 5 10-5"/>
+                    </svg>
+                </div>
+                <span class="logo-text">Sage</span>
+            </div>
+        </div>
+    </header>
+
+    <main>
+        <div class="page-header">
+            <div class="tool-badge">
+                <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                    <path d="M4 19.5A2.5 2.5 0 0 1 6.5 17H20"/>
+                    <path d="M6.5 2H20v20H6.5A2.5 2.5 0 0 1 4 19.5v-15A2.5 2.5 0 0 1 6.5 2z"/>
+                </svg>
+                Literature Monitor
+            </div>
+            <h1>Bi-Weekly Literature Digest</h1>
+            <p>Pediatric ID &amp; Antimicrobial Stewardship</p>
+            <div class="digest-meta">
+                <span>
+                    <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                        <rect x="3" y="4" width="18" height="18" rx="2" ry="2"/>
+                        <line x1="16" y1="2" x2="16" y2="6"/>
+                        <line x1="8" y1="2" x2="8" y2="6"/>
+                        <line x1="3" y1="10" x2="21" y2="10"/>
+                    </svg>
+                    {digest_data['date_range']}
+                </span>
+                <span>
+                    <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                        <circle cx="12" cy="12" r="10"/>
+                        <polyline points="12 6 12 12 16 14"/>
+                    </svg>
+                    Generated {_generated(digest_data)}
+                </span>
+            </div>
+        </div>
+
+        <div class="scan-summary">
+            <span class="stat">
+                <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><rect x="3" y="4" width="18" height="18" rx="2"/><line x1="16" y1="2" x2="16" y2="6"/><line x1="8" y1="2" x2="8" y2="6"/><line x1="3" y1="10" x2="21" y2="10"/></svg>
+                <strong>14-day window</strong> {digest_data['date_range']}
+            </span>
+            <span class="stat">
+                <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M4 19.5A2.5 2.5 0 0 1 6.5 17H20"/><path d="M6.5 2H20v20H6.5A2.5 2.5 0 0 1 4 19.5v-15A2.5 2.5 0 0 1 6.5 2z"/></svg>
+                <button class="journals-toggle" onclick="toggleJournals()"><strong>{len(JOURNAL_LIST)} journals</strong> scanned</button>
+            </span>
+            <span class="stat">
+                <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M14 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2V8z"/><polyline points="14 2 14 8 20 8"/></svg>
+                <strong>{total} articles</strong> reviewed
+            </span>
+            <span class="stat">
+                <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M12 22s8-4 8-10V5l-8-3-8 3v7c0 6 8 10 8 10z"/></svg>
+                <strong>{oa} open access</strong> &middot; {pw} paywalled
+            </span>
+        </div>
+
+        <div class="journals-panel" id="journalsPanel">
+            <h3>Journals Searched</h3>
+            <div class="journal-grid">
+                {journal_chips}
+            </div>
+            <div class="suggest-box">
+                <label>Suggest a journal to add to the scan list</label>
+                <div class="suggest-row">
+                    <input type="text" id="journalSearch" placeholder="Search PubMed journals..." oninput="searchJournals(this.value)">
+                    <button id="searchBtn" onclick="searchJournals(document.getElementById('journalSearch').value)">Search</button>
+                </div>
+                <div class="suggest-results" id="suggestResults"></div>
+                <div class="suggest-status" id="suggestStatus"></div>
+            </div>
+        </div>
+
+        <div class="digest-content" id="digestContent">
+            {render(doc)}
+        </div>
+
+        <div class="archive-link">
+            <a href="{root}archive.html">View Past Digests &rarr;</a>
+        </div>
+    </main>
+
+    <footer>
+        <p>Sage Project &middot; Literature Monitor &middot; Bi-weekly digest for pediatric ID specialists</p>
+    </footer>
+
+    <script>
+    function toggleJournals() {{
+        document.getElementById('journalsPanel').classList.toggle('open');
+    }}
+    let searchTimeout = null;
+    function searchJournals(query) {{
+        clearTimeout(searchTimeout);
+        const results = document.getElementById('suggestResults');
+        const status = document.getElementById('suggestStatus');
+        status.className = 'suggest-status';
+        if (!query || query.length < 3) {{ results.innerHTML = ''; return; }}
+        searchTimeout = setTimeout(async () => {{
+            results.innerHTML = '<span style="color:var(--text-muted)">Searching medical journals...</span>';
+            try {{
+                const searchUrl = `https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi?db=nlmcatalog&term=${{encodeURIComponent(query)}}[Title]+AND+serial[tp]&retmax=10&retmode=json`;
+                const resp = await fetch(searchUrl);
+                const data = await resp.json();
+                const ids = data.esearchresult?.idlist || [];
+                if (!ids.length) {{ results.innerHTML = '<span style="color:var(--text-muted)">No journals found. Try a shorter name.</span>'; return; }}
+                const sUrl = `https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi?db=nlmcatalog&id=${{ids.join(',')}}&retmode=json`;
+                const sResp = await fetch(sUrl);
+                const sData = await sResp.json();
+                let html = '';
+                for (const id of ids) {{
+                    const item = sData.result?.[id];
+                    if (!item) continue;
+                    const te = (item.titlemainlist || [])[0];
+                    const title = (te?.title || item.medlineta || 'Unknown').replace(/\\.$/, '');
+                    const abbr = item.medlineta || '';
+                    html += `<div class="result-item"><span class="journal-name">${{title}}${{abbr && abbr !== title ? ' <em style="color:var(--text-muted);font-size:0.8rem">(' + abbr + ')</em>' : ''}}</span><button class="add-btn" onclick="suggestJournal(this, '${{title.replace(/'/g, "\\\\'")}}', '${{abbr.replace(/'/g, "\\\\'")}}')">+ Add</button></div>`;
+                }}
+                results.innerHTML = html || '<span style="color:var(--text-muted)">No journals found.</span>';
+            }} catch (e) {{
+                results.innerHTML = '<span style="color:#c41e3a">Search failed.</span>';
+            }}
+        }}, 400);
+    }}
+    function suggestJournal(btn, title, abbr) {{
+        const status = document.getElementById('suggestStatus');
+        const suggestions = JSON.parse(localStorage.getItem('sage_journal_suggestions') || '[]');
+        if (suggestions.some(s => s.title === title)) {{
+            status.textContent = `"${{title}}" already suggested.`;
+            status.className = 'suggest-status error';
+            return;
+        }}
+        suggestions.push({{ title, abbr, suggested_at: new Date().toISOString() }});
+        localStorage.setItem('sage_journal_suggestions', JSON.stringify(suggestions));
+        btn.outerHTML = '<span class="added">Added</span>';
+        status.textContent = `"${{title}}" queued — will be included in the next digest run after review.`;
+        status.className = 'suggest-status success';
+    }}
+    </script>
+</body>
+</html>'''
+    return html_content
+
+
+ARCHIVE_ITEM = '''            <a href="digests/{date}.html" class="archive-item">
+                <div class="archive-item-info">
+                    <h3>{date_range}</h3>
+                    <p>Generated {generated}</p>
+                </div>
+                <div class="archive-item-arrow">
+                    <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                        <path d="M5 12h14M12 5l7 7-7 7"/>
+                    </svg>
+                </div>
+            </a>'''
+
+ARCHIVE_EMPTY = '''            <div class="empty-state">
+                <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                    <path d="M4 19.5A2.5 2.5 0 0 1 6.5 17H20"/>
+                    <path d="M6.5 2H20v20H6.5A2.5 2.5 0 0 1 4 19.5v-15A2.5 2.5 0 0 1 6.5 2z"/>
+                </svg>
+                <p>Archive will populate as weekly digests are generated.</p>
+            </div>'''
+
+
+def render_archive_page(digests):
+    """The archive page listing `digests` (dicts with date, date_range, generated_at)."""
+    if digests:
+        items = "\n".join(ARCHIVE_ITEM.format(
+            date=d["date"], date_range=d["date_range"], generated=_generated(d))
+            for d in digests)
+    else:
+        items = ARCHIVE_EMPTY
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Digest Archive | Sage Project</title>
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Outfit:wght@300;400;500;600;700&family=Source+Serif+4:opsz,wght@8..60,400;8..60,600&display=swap" rel="stylesheet">
+    <style>
+        :root {{
+            --sage-50: #1a1f1a;
+            --sage-100: #252b25;
+            --sage-200: #333b33;
+            --sage-300: #4a5a4b;
+            --sage-400: #6a806c;
+            --sage-500: #7fa882;
+            --sage-600: #8fbf92;
+            --sage-700: #a8d4ab;
+            --sage-800: #c5e5c7;
+            --sage-900: #e8f5e9;
+            --warm-50: #111411;
+            --warm-100: #1a1f1a;
+
+            --accent-lavender: #b8a5d4;
+            --accent-lavender-light: rgba(184, 165, 212, 0.15);
+
+            --text-primary: #e0e8e0;
+            --text-secondary: #9bb09d;
+            --text-muted: #6a806c;
+            --surface: #181c18;
+            --surface-raised: #1e231e;
+
+            --shadow-sm: 0 1px 2px rgba(0, 0, 0, 0.2);
+            --shadow-md: 0 4px 12px rgba(0, 0, 0, 0.3);
+            --shadow-lg: 0 12px 32px rgba(0, 0, 0, 0.4);
+
+            --radius-sm: 8px;
+            --radius-md: 12px;
+            --radius-lg: 20px;
+        }}
+
+        * {{
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }}
+
+        body {{
+            font-family: 'Outfit', sans-serif;
+            background: var(--warm-50);
+            color: var(--text-primary);
+            line-height: 1.6;
+            min-height: 100vh;
+        }}
+
+        .bg-gradient {{
+            position: fixed;
+            top: 0;
+            left: 0;
+            right: 0;
+            bottom: 0;
+            background: 
+                radial-gradient(ellipse at 20% 20%, rgba(184, 165, 212, 0.06) 0%, transparent 50%),
+                radial-gradient(ellipse at 80% 80%, rgba(127, 168, 130, 0.04) 0%, transparent 50%),
+                var(--warm-50);
+            z-index: -1;
+        }}
+
+        header {{
+            background: rgba(17, 20, 17, 0.9);
+            backdrop-filter: blur(20px);
+            border-bottom: 1px solid var(--sage-100);
+            padding: 1rem 2rem;
+            position: sticky;
+            top: 0;
+            z-index: 100;
+        }}
+
+        .header-content {{
+            max-width: 900px;
+            margin: 0 auto;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+        }}
+
+        .back-link {{
+            display: flex;
+            align-items: center;
+            gap: 8px;
+            text-decoration: none;
+            color: var(--text-secondary);
+            font-weight: 500;
+            transition: color 0.2s;
+        }}
+
+        .back-link:hover {{
+            color: var(--sage-600);
+        }}
+
+        .back-link svg {{
+            width: 20px;
+            height: 20px;
+        }}
+
+        .logo {{
+            display: flex;
+            align-items: center;
+            gap: 10px;
+        }}
+
+        .logo-icon {{
+            width: 36px;
+            height: 36px;
+            background: linear-gradient(135deg, var(--sage-500), var(--sage-600));
+            border-radius: var(--radius-sm);
+            display: flex;
+            align-items: center;
+            justify-content: center;
+        }}
+
+        .logo-icon svg {{
+            width: 20px;
+            height: 20px;
+            color: white;
+        }}
+
+        .logo-text {{
+            font-size: 1.25rem;
+            font-weight: 600;
+            color: var(--sage-700);
+        }}
+
+        main {{
+            max-width: 900px;
+            margin: 0 auto;
+            padding: 2rem;
+        }}
+
+        .page-header {{
+            text-align: center;
+            margin-bottom: 2rem;
+        }}
+
+        .page-header h1 {{
+            font-family: 'Source Serif 4', serif;
+            font-size: 2rem;
+            font-weight: 600;
+            color: var(--sage-800);
+            margin-bottom: 0.5rem;
+        }}
+
+        .page-header p {{
+            color: var(--text-muted);
+        }}
+
+        .archive-list {{
+            display: flex;
+            flex-direction: column;
+            gap: 1rem;
+        }}
+
+        .archive-item {{
+            background: var(--surface-raised);
+            border: 1px solid var(--sage-100);
+            border-radius: var(--radius-md);
+            padding: 1.25rem 1.5rem;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            text-decoration: none;
+            color: inherit;
+            transition: all 0.2s;
+        }}
+
+        .archive-item:hover {{
+            border-color: var(--accent-lavender);
+            box-shadow: var(--shadow-md);
+            transform: translateX(4px);
+        }}
+
+        .archive-item-info h3 {{
+            font-size: 1.1rem;
+            font-weight: 600;
+            color: var(--sage-700);
+            margin-bottom: 0.25rem;
+        }}
+
+        .archive-item-info p {{
+            font-size: 0.9rem;
+            color: var(--text-muted);
+        }}
+
+        .archive-item-arrow {{
+            color: var(--accent-lavender);
+        }}
+
+        .archive-item-arrow svg {{
+            width: 20px;
+            height: 20px;
+        }}
+
+        .empty-state {{
+            text-align: center;
+            padding: 4rem 2rem;
+            color: var(--text-muted);
+        }}
+
+        .empty-state svg {{
+            width: 64px;
+            height: 64px;
+            margin-bottom: 1rem;
+            opacity: 0.3;
+        }}
+
+        footer {{
+            max-width: 900px;
+            margin: 3rem auto 0;
+            padding: 2rem;
+            text-align: center;
+            color: var(--text-muted);
+            font-size: 0.9rem;
+            border-top: 1px solid var(--sage-100);
+        }}
+    </style>
+</head>
+<body>
+    <div class="bg-gradient"></div>
+
+    <header>
+        <div class="header-content">
+            <a href="index.html" class="back-link">
+                <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                    <path d="M19 12H5M12 19l-7-7 7-7"/>
+                </svg>
+                Back to Latest Digest
+            </a>
+            <div class="logo">
+                <div class="logo-icon">
+                    <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                        <path d="M12 2L2 7l10 5 10-5-10-5z"/>
+                        <path d="M2 17l10 5 10-5"/>
+                        <path d="M2 12l10 5 10-5"/>
+                    </svg>
+                </div>
+                <span class="logo-text">Sage</span>
+            </div>
+        </div>
+    </header>
+
+    <main>
+        <div class="page-header">
+            <h1>Digest Archive</h1>
+            <p>Browse past weekly literature digests</p>
+        </div>
+
+        <div class="archive-list" id="archiveList">
+{items}
+        </div>
+    </main>
+
+    <footer>
+        <p>Sage Project · Literature Monitor Archive</p>
+    </footer>
+</body>
+</html>'''
+
+
+def write_if_changed(path, text):
+    """Atomically write `text` to `path` unless it already holds exactly that.
+
+    Returns True if the file was written.
+    """
+    path = Path(path)
+    data = text.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+
+def _render(job):
+    kind, data = job
+    if kind == "index":
+        return render_digest_page(data)
+    if kind == "digest":
+        return render_digest_page(data, root="../")
+    return render_archive_page(data)
+
+
+def build(site=SITE_DIR, workers=None, force=False):
+    """Bring the site under `site` up to date with its digest JSON.
+
+    Returns {"rendered": [...], "written": [...], "skipped": n}, with
+    output paths relative to `site`.
+    """
+    site = Path(site)
+    state_path = site / STATE_FILE
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = {}
+    code = _code_hash()
+
+    outputs = {}        # output -> (source hash, job)
+    digests = []
+    for path in sorted((site / "digests").glob("????-??-??.json")):
+        raw = path.read_bytes()
+        data = json.loads(raw)
+        data.setdefault("date", path.stem)
+        digests.append(data)
+        source = hashlib.sha256(code.encode() + raw).hexdigest()
+        outputs[f"digests/{path.stem}.html"] = (source, ("digest", data))
+    if digests:
+        source = outputs[f"digests/{digests[-1]['date']}.html"][0]
+        outputs["index.html"] = (source, ("index", digests[-1]))
+    listing = [{k: d.get(k, "") for k in ("date", "date_range", "generated_at")}
+               for d in reversed(digests)]
+    source = hashlib.sha256(code.encode() + json.dumps(listing).encode()).hexdigest()
+    outputs["archive.html"] = (source, ("archive", listing))
+
+    stale = [out for out, (source, _) in outputs.items()
+             if force or state.get(out) != source or not (site / out).exists()]
+    jobs = [outputs[out][1] for out in stale]
+    if len(jobs) >= PARALLEL_MIN and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pages = list(pool.map(_render, jobs))
+    else:
+        pages = [_render(job) for job in jobs]
+
+    written = []
+    for out, html in zip(stale, pages):
+        if write_if_changed(site / out, html):
+            written.append(out)
+        state[out] = outputs[out][0]
+    if stale:
+        write_if_changed(state_path, json.dumps(state, indent=1, sort_keys=True) + "\n")
+    return {"rendered": stale, "written": written, "skipped": len(outputs) - len(stale)}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render the literature-monitor site from digest JSON.")
+    parser.add_argument("--site", default=SITE_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: CPUs)")
+    parser.add_argument("--force", action="store_true", help="render every page, ignoring build state")
+    args = parser.parse_args()
+
+    result = build(args.site, workers=args.workers, force=args.force)
+    for out in result["written"]:
+        print(f"  wrote {out}")
+    print(f"Rendered {len(result['rendered'])}, wrote {len(result['written'])}, "
+          f"skipped {result['skipped']} unchanged")
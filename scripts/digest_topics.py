@@ -0,0 +1,218 @@
+"""
+Topic index over reviewed articles.
+===================================
+Past articles are cited for continuity ("this extends [prior study]"),
+but injecting the last fifty into every system prompt spends thousands
+of input tokens on articles that have nothing to do with this run. This
+keeps an inverted index over each article's topic tags, study type,
+title and key finding, persisted next to the digests and updated as
+records are added, and ranks past articles against a query with BM25 so
+only the most relevant few are injected, under a token budget.
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+
+from digest_memory import keys_of, normalize_title
+
+K1 = 1.2
+B = 0.75
+
+# Topic tags are chosen deliberately; a shared tag says more than a
+# shared word in a finding.
+WEIGHTS = {'topic': 3, 'type': 1, 'title': 2, 'finding': 1}
+
+STOPWORDS = frozenset("""
+a about after against all also among an and any are as at be been between both but by
+can could did do does during each for from had has have how in into is it its may more
+most no not of on or other over per such than that the their these this those through to
+under was were what when which while who with within without would
+""".split())
+
+# Roughly four characters per token for English prose
+CHARS_PER_TOKEN = 4
+
+
+def _words(text):
+    for w in normalize_title(text).split():
+        if w in STOPWORDS or len(w) < 3:
+            continue
+        yield w[:-1] if len(w) > 4 and w.endswith('s') and not w.endswith('ss') else w
+
+
+def terms(record):
+    """{term: weighted frequency} for one article record."""
+    tf = {}
+
+    def bump(term, weight):
+        tf[term] = tf.get(term, 0) + weight
+
+    for topic in record.get('topics') or []:
+        tag = topic.strip().lower()
+        if tag:
+            bump('tag:' + tag, WEIGHTS['topic'])
+            for part in _words(tag.replace('-', ' ')):
+                bump(part, WEIGHTS['topic'])
+    if record.get('study_type'):
+        bump('type:' + record['study_type'].strip().lower(), WEIGHTS['type'])
+    for w in _words(record.get('title', '')):
+        bump(w, WEIGHTS['title'])
+    for w in _words(record.get('key_finding', '')):
+        bump(w, WEIGHTS['finding'])
+    return tf
+
+
+def query_terms(records=(), text=''):
+    """The query a set of records (and any free text) make, as {term: weight}."""
+    q = {}
+    for record in records:
+        for term, n in terms(record).items():
+            q[term] = q.get(term, 0) + n
+    for w in _words(text):
+        q[w] = q.get(w, 0) + 1
+    return q
+
+
+def doc_key(record):
+    keys = keys_of(record)
+    return keys[0] if keys else None
+
+
+class TopicIndex:
+    """A BM25 index over article records, persisted as JSON at `path`."""
+
+    FIELDS = ('title', 'doi', 'journal', 'date', 'study_type', 'topics', 'key_finding', 'digest_date')
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self.docs = {}          # key -> {fields..., 'len': weighted length}
+        self.postings = {}      # term -> {key: weighted tf}
+        self.total_len = 0
+        self._dirty = False
+        if self.path and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+                self.docs = data['docs']
+                self.postings = data['postings']
+                self.total_len = sum(d['len'] for d in self.docs.values())
+            except (OSError, ValueError, KeyError) as e:
+                print(f"  Warning: rebuilding unreadable topic index {self.path}: {e}")
+                self.docs, self.postings = {}, {}
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __contains__(self, record):
+        return doc_key(record) in self.docs
+
+    def add(self, record):
+        """Index one record, replacing any earlier version of it."""
+        key = doc_key(record)
+        if key is None:
+            return False
+        if key in self.docs:
+            self.remove(key)
+        tf = terms(record)
+        doc = {f: record[f] for f in self.FIELDS if record.get(f)}
+        doc['len'] = sum(tf.values())
+        self.docs[key] = doc
+        self.total_len += doc['len']
+        for term, n in tf.items():
+            self.postings.setdefault(term, {})[key] = n
+        self._dirty = True
+        return True
+
+    def remove(self, key):
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        self.total_len -= doc['len']
+        for term in list(terms(doc)):
+            posting = self.postings.get(term)
+            if posting:
+                posting.pop(key, None)
+                if not posting:
+                    del self.postings[term]
+        self._dirty = True
+
+    def sync(self, memory):
+        """Index any article in `memory` that is new or has changed."""
+        added = 0
+        for record in memory.articles:
+            key = doc_key(record)
+            if key is None:
+                continue
+            doc = self.docs.get(key)
+            if doc is None or any(doc.get(f) != record.get(f) for f in self.FIELDS if record.get(f)):
+                added += self.add(record)
+        return added
+
+    def search(self, query, k=10, exclude=()):
+        """The top `k` (score, record) for a {term: weight} query."""
+        n = len(self.docs)
+        if not n or not query:
+            return []
+        avgdl = self.total_len / n
+        excluded = {key for key in (doc_key(r) for r in exclude) if key}
+        scores = {}
+        for term, qweight in query.items():
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for key, tf in posting.items():
+                if key in excluded:
+                    continue
+                dl = self.docs[key]['len']
+                s = idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * dl / avgdl))
+                scores[key] = scores.get(key, 0.0) + s * qweight
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:k]
+        return [(score, self.docs[key]) for key, score in ranked]
+
+    def save(self):
+        if not (self.path and self._dirty):
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        blob = {'version': 1, 'docs': self.docs, 'postings': self.postings}
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(blob, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def format_article(record):
+    topics = ", ".join(record.get('topics', []))
+    return (
+        f"- **{record.get('title', 'Unknown')}** ({record.get('journal', '')}, "
+        f"{record.get('date', '')})\n"
+        f"  Type: {record.get('study_type', 'unknown')} | "
+        f"Topics: {topics}\n"
+        f"  Finding: {record.get('key_finding', 'N/A')}"
+    )
+
+
+def within_budget(header, ranked, budget_tokens):
+    """`header` plus as many ranked articles as fit in `budget_tokens`.
+
+    Returns (text, number of articles included); ("", 0) if none fit.
+    """
+    lines = list(header)
+    used = estimate_tokens("\n".join(lines))
+    count = 0
+    for _, record in ranked:
+        entry = format_article(record)
+        cost = estimate_tokens(entry) + 1
+        if used + cost > budget_tokens:
+            break
+        lines.append(entry)
+        used += cost
+        count += 1
+    if not count:
+        return "", 0
+    return "\n".join(lines), count
@@ -0,0 +1,139 @@
+"""
+Triage: the articles a digest will review, and the digest they make.
+====================================================================
+A digest is written in two phases. One triage call searches the
+journals and answers with a fenced list of candidates instead of
+reviews:
+
+    ```json digest-candidates
+    [{"title": "...", "doi": "...", "url": "...", "journal": "...",
+      "date": "...", "section": "🦠 Pediatric ID Studies", "access": "open"}]
+    ```
+
+candidates() validates that list, select() drops candidates that repeat
+each other or an article memory already holds, and each survivor is then
+reviewed by its own call. stitch() puts the reviews back together in the
+layout the system prompt's OUTPUT FORMAT lays out — title line, the "## "
+sections in order, footer — which layout() reads from the prompt itself,
+so the two never drift apart.
+"""
+
+import json
+import re
+
+from digest_manifest import split
+from digest_memory import keys_of
+from digest_minhash import MinHashIndex
+
+FENCE = '```json digest-candidates'
+FIELDS = ('title', 'doi', 'url', 'journal', 'date', 'section', 'access')
+EMPTY_SECTION = 'No significant publications identified this period.'
+
+
+class TriageError(ValueError):
+    pass
+
+
+def candidates(text):
+    """The validated candidate list from a triage response."""
+    _, body = split(text, FENCE)
+    if not body:
+        raise TriageError("no candidate list in the triage response")
+    try:
+        entries = json.loads(body)
+    except ValueError as e:
+        raise TriageError(f"candidate list is not JSON: {e}") from None
+    if not isinstance(entries, list):
+        raise TriageError("candidate list is not a JSON array")
+    out = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        candidate = {name: str(entry.get(name) or '').strip() for name in FIELDS}
+        # a candidate has to be findable again by the call that reviews it
+        if candidate['title'] and (candidate['doi'] or candidate['url']):
+            out.append(candidate)
+    return out
+
+
+def key(candidate):
+    """The id a candidate's review is checkpointed under."""
+    return keys_of(candidate)[0]
+
+
+def select(candidates, memory, index, limit, claimed=None):
+    """(candidates to review, [(candidate, reason)] for those dropped).
+
+    Drops a candidate that shares a DOI or title with one before it or
+    with an article in `memory`, or whose title near-duplicates a past
+    article in `index` (digest_minhash.ArticleIndex) or an earlier
+    candidate; then keeps at most `limit`, in triage order. `claimed`,
+    a set of keys shared by concurrent windows, drops what another
+    window picked and gains the keys of what this one picks.
+    """
+    selected = []
+    dropped = []
+    keys = set()
+    titles = MinHashIndex(index.titles.threshold)
+    for candidate in candidates:
+        ks = keys_of(candidate)
+        past = memory.find(candidate) or index.match(title=candidate['title'])
+        if past is not None:
+            dropped.append((candidate, f"reviewed {past.get('digest_date', 'before')}"))
+        elif keys.intersection(ks) or titles.nearest(candidate['title']):
+            dropped.append((candidate, "listed twice"))
+        elif claimed is not None and claimed.intersection(ks):
+            dropped.append((candidate, "picked by another window"))
+        elif len(selected) >= limit:
+            dropped.append((candidate, f"over the limit of {limit}"))
+        else:
+            selected.append(candidate)
+            keys.update(ks)
+            titles.add(len(selected), candidate['title'])
+    if claimed is not None:
+        claimed.update(keys)
+    return selected, dropped
+
+
+def layout(system):
+    """(title line, section headings, footer) from the prompt's OUTPUT FORMAT."""
+    template = system.split('## OUTPUT FORMAT:', 1)[-1]
+    template = template.split('\n---\n', 1)
+    footer = template[1].strip().split('\n', 1)[0] if len(template) > 1 else ''
+    title = re.search(r'^# .+$', template[0], re.MULTILINE)
+    sections = re.findall(r'^## (.+?)\s*$', template[0], re.MULTILINE)
+    return (title.group(0) if title else ''), sections, footer
+
+
+def _words(text):
+    return re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
+
+
+def section_of(name, sections, default):
+    """The heading in `sections` that a candidate's `name` for it refers to."""
+    wanted = _words(name)
+    if wanted:
+        for section in sections:
+            words = _words(section)
+            if words and (wanted in words or words in wanted):
+                return section
+    return default
+
+
+def stitch(system, reviews):
+    """A digest from [(section named by triage, review markdown)] in the prompt's layout.
+
+    A review whose section matches none of the prompt's goes under the
+    general one.
+    """
+    title, sections, footer = layout(system)
+    general = next((s for s in sections if 'general' in _words(s)), sections[-1] if sections else '')
+    by_section = {section: [] for section in sections}
+    for name, review in reviews:
+        by_section.setdefault(section_of(name, sections, general), []).append(review.strip())
+    parts = [title] if title else []
+    for section, items in by_section.items():
+        parts.append(f'## {section}\n\n' + ('\n\n'.join(items) if items else EMPTY_SECTION))
+    if footer:
+        parts.append(footer)
+    return '\n\n---\n\n'.join(parts) + '\n'
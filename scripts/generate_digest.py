@@ -10,39 +10,147 @@ Improvements in v3.0:
 - Paywall detection: marks abstract-only reviews in red
 - Enhanced rigor for open access articles (full methods/results/discussion)
 - PDF download for reviewed articles to sage_podcastlm/example_inputs
+  (parallel, pooled and validated; see digest_pdfs.py)
 - Scientific rigor appropriate for ID physicians/scientists
 - Critical analysis of study design and limitations
 - Required links/DOIs for all articles
 - Memory system to avoid repeating articles
 - Strict 14-day date filtering
+- Backfill mode: past windows generated concurrently (--backfill START END)
 - Cost controls and error handling
 """
 
 import anthropic
+import contextlib
 import json
 import os
 import re
-import requests
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from urllib.parse import urlparse
 
-# Initialize the Anthropic client
-client = anthropic.Anthropic()
-
-# Calculate date range for this bi-weekly digest (14 days)
-today = datetime.now()
-digest_start = today - timedelta(days=14)
-date_range = f"{digest_start.strftime('%B %d')} - {today.strftime('%B %d, %Y')}"
-file_date = today.strftime('%Y-%m-%d')
-folder_date_range = f"{digest_start.strftime('%Y-%m-%d')}_to_{today.strftime('%Y-%m-%d')}"
+import digest_cache
+import digest_corpus
+import digest_document
+import digest_manifest
+import digest_memory
+import digest_minhash
+import digest_pdfs
+import digest_runs
+import digest_site
+import digest_topics
+import digest_triage
+
+# The Anthropic client, created on first use so that importing this
+# module (or running a mode that makes no model calls) needs no API key
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The shared Anthropic client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = anthropic.Anthropic()
+        return _client
+
+
+class RateLimiter:
+    """Spaces out requests, across threads, to at most `per_minute`."""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+# Every model request waits its turn here, however many windows run at once
+REQUESTS_PER_MINUTE = 20
+rate_limiter = RateLimiter(REQUESTS_PER_MINUTE)
+
+
+class Window:
+    """The period one digest covers: by default the 14 days ending on `end`."""
+
+    DAYS = 14
+
+    def __init__(self, end, start=None):
+        self.end = end
+        self.start = start or end - timedelta(days=self.DAYS)
+        self.days = (self.end - self.start).days
+        self.date_range = f"{self.start.strftime('%B %d')} - {self.end.strftime('%B %d, %Y')}"
+        self.file_date = self.end.strftime('%Y-%m-%d')
+        self.folder = f"{self.start.strftime('%Y-%m-%d')}_to_{self.file_date}"
+
+    def to_json(self):
+        return {"start": self.start.isoformat(), "end": self.end.isoformat()}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(datetime.fromisoformat(data["end"]), datetime.fromisoformat(data["start"]))
+
+
+def backfill_windows(start, end):
+    """Consecutive windows covering `start` to `end`; the last may be short."""
+    windows = []
+    while start < end:
+        stop = min(start + timedelta(days=Window.DAYS), end)
+        windows.append(Window(stop, start))
+        start = stop
+    return windows
 
 # PDF download directory
 PDF_OUTPUT_DIR = Path("f:/Coding/sage_podcastlm/example_inputs")
 
-# Memory file path
-MEMORY_FILE = "literature-monitor/digests/reviewed_articles.json"
+# Memory file path (an append-only log; see digest_memory.py). The JSON
+# file it replaced is imported the first time the log is missing.
+MEMORY_FILE = "literature-monitor/digests/reviewed_articles.jsonl"
+LEGACY_MEMORY_FILE = "literature-monitor/digests/reviewed_articles.json"
+
+# Inverted index over past articles' topics, rebuilt from memory as needed
+TOPIC_INDEX_FILE = "literature-monitor/digests/topic_index.json"
+TOPIC_CONTEXT_K = 25          # most relevant past articles considered
+TOPIC_CONTEXT_TOKENS = 2500   # and at most this much prompt spent on them
+
+# Checkpoints of generation runs in progress (see digest_runs.py)
+RUNS_DIR = "literature-monitor/digests/runs"
+
+# Past windows generated at once by --backfill
+BACKFILL_WORKERS = 3
+
+# A digest is written in two phases (see digest_triage.py): one streamed
+# triage call searches and picks the articles, then each is reviewed by
+# its own bounded call, several at once
+DIGEST_MODEL = "claude-sonnet-4-6"
+WEB_SEARCH = {"type": "web_search_20250305", "name": "web_search"}
+TRIAGE_MAX_TOKENS = 8000
+MAX_CONTINUATIONS = 10        # web-search pauses allowed in triage
+MAX_REVIEWS = 15
+REVIEW_MAX_TOKENS = 8000
+REVIEW_CONTINUATIONS = 4      # and in each review
+REVIEW_WORKERS = 4
+
+# What the journals published, ingested from PubMed and feeds before each
+# run (see digest_corpus.py) and listed in the triage prompt
+CORPUS_FILE = digest_corpus.CORPUS_FILE
+CORPUS_CANDIDATES = 80        # most listed in one prompt
+
+# Structured extraction results, keyed by digest content + prompt + model
+EXTRACTION_CACHE_DIR = "literature-monitor/digests/extraction_cache"
+EXTRACTION_MODEL = "claude-haiku-4-5-20251001"
+EXTRACTION_WORKERS = 4
 
 
 def _configure_stdio_utf8():
@@ -61,47 +169,83 @@ def _configure_stdio_utf8():
 
 def load_memory():
     """Load previously reviewed articles from memory file."""
-    if Path(MEMORY_FILE).exists():
-        with open(MEMORY_FILE, 'r', encoding="utf-8") as f:
-            return json.load(f)
-    return {"reviewed_dois": [], "reviewed_titles": [], "articles": []}
+    return digest_memory.open_memory(MEMORY_FILE, legacy=LEGACY_MEMORY_FILE)
 
 
 def save_memory(memory):
-    """Save reviewed articles to memory file."""
-    # Keep only last 6 months of memory to prevent file from growing too large
-    max_entries = 500
-    memory["reviewed_dois"] = memory["reviewed_dois"][-max_entries:]
-    memory["reviewed_titles"] = memory["reviewed_titles"][-max_entries:]
-    # Keep last 200 structured article records (about 2 years of bi-weekly digests)
-    memory["articles"] = memory.get("articles", [])[-200:]
+    """Save reviewed articles to memory file.
 
-    with open(MEMORY_FILE, 'w', encoding="utf-8") as f:
-        json.dump(memory, f, indent=2)
+    Appends what this run added; nothing older is ever dropped.
+    """
+    memory.save()
 
 
 # ---------------------------------------------------------------------------
 # Article topic extraction + retrieval
 # ---------------------------------------------------------------------------
 
-TOPIC_EXTRACTION_PROMPT = """Extract structured metadata from this literature digest. Return a JSON array where each element represents one article reviewed. For each article include:
-
-- "title": article title
+# The record each article is described by, whether the digest model
+# writes it into its manifest or extraction recovers it afterwards
+ARTICLE_RECORD_FIELDS = """- "title": article title
 - "doi": DOI or URL (empty string if none)
 - "journal": journal name
 - "date": publication date as mentioned
 - "topics": array of 3-8 specific topic tags (e.g. "group-a-streptococcus", "antimicrobial-stewardship", "otitis-media", "meningococcal-vaccine", "delphi-consensus", "pediatric-icu", "diagnostic-stewardship"). Be specific — "GAS-invasive-disease" is better than "infectious-disease".
 - "key_finding": one-sentence summary of the most important result or recommendation
-- "study_type": one of "rct", "cohort", "case-control", "cross-sectional", "case-series", "systematic-review", "meta-analysis", "narrative-review", "guideline", "consensus", "editorial", "fda-update", "other"
+- "study_type": one of "rct", "cohort", "case-control", "cross-sectional", "case-series", "systematic-review", "meta-analysis", "narrative-review", "guideline", "consensus", "editorial", "fda-update", "other\""""
+
+TOPIC_EXTRACTION_PROMPT = f"""Extract structured metadata from this literature digest. Return a JSON array where each element represents one article reviewed. For each article include:
+
+{ARTICLE_RECORD_FIELDS}
 
 Return ONLY the JSON array, no other text."""
 
+# Appended to the system prompt: the digest carries its own records, so
+# extraction only runs when this block is missing or invalid
+MANIFEST_PROMPT = f"""
+
+## ARTICLE MANIFEST
+After the final line of the digest, append one fenced block listing every article you reviewed, in the order they appear, exactly like this:
+
+{digest_manifest.FENCE}
+[{{"title": "...", "doi": "...", "journal": "...", "date": "...", "topics": ["..."], "key_finding": "...", "study_type": "..."}}]
+```
+
+Each element has these fields:
+{ARTICLE_RECORD_FIELDS}
+
+Use each article's title exactly as in its heading. The block is removed before the digest is published; write nothing after it."""
+
+# Bump when TOPIC_EXTRACTION_PROMPT or the record format changes, so
+# cached extractions from the old prompt are not reused.
+EXTRACTION_VERSION = 1
 
-def extract_article_records(digest_content: str) -> list[dict]:
-    """Use Claude to extract structured article records from a digest."""
+
+def _extraction_key(digest_content: str, model: str = EXTRACTION_MODEL) -> str:
+    return digest_cache.cache_key(EXTRACTION_VERSION, model, TOPIC_EXTRACTION_PROMPT, digest_content)
+
+
+def extract_article_records(digest_content: str, cache=None) -> list[dict]:
+    """Use Claude to extract structured article records from a digest.
+
+    Results are cached on disk; the same digest is only sent once.
+    """
+    cache = cache or digest_cache.JsonCache(EXTRACTION_CACHE_DIR)
+    key = _extraction_key(digest_content)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    records = _request_article_records(digest_content)
+    if records:
+        cache.put(key, records)
+    return records
+
+
+def _request_article_records(digest_content: str) -> list[dict]:
     try:
-        response = client.messages.create(
-            model="claude-haiku-4-5-20251001",
+        rate_limiter.wait()
+        response = get_client().messages.create(
+            model=EXTRACTION_MODEL,
             max_tokens=4000,
             messages=[{
                 "role": "user",
@@ -119,16 +263,72 @@ def extract_article_records(digest_content: str) -> list[dict]:
     return []
 
 
-def _build_past_topic_context(articles: list[dict]) -> str:
-    """Build a system-prompt section listing all past articles with topics.
+def backfill_article_records(digests_dir="literature-monitor/digests", workers=EXTRACTION_WORKERS):
+    """Extract records for every saved digest and fold them into memory.
+
+    Digests already extracted come from the cache; the rest are sent
+    `workers` at a time. Returns the number of articles new to memory.
+    """
+    paths = sorted(Path(digests_dir).glob("????-??-??.json"))
+    digests = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("content"):
+            digests.append((data.get("date") or path.stem, data["content"]))
+
+    cache = digest_cache.JsonCache(EXTRACTION_CACHE_DIR)
+    print(f"Extracting article records from {len(digests)} digests...")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda d: extract_article_records(d[1], cache), digests))
+
+    memory = load_memory()
+    added = 0
+    for (date, _), records in zip(digests, results):
+        print(f"  {date}: {len(records)} records")
+        for rec in records:
+            # an article keeps the date of the first digest that reviewed it
+            rec["digest_date"] = (memory.find(rec) or {}).get("digest_date") or date
+            added += memory.add(rec)
+    topic_index = load_topic_index(memory)
+    topic_index.sync(memory)
+    save_memory(memory)
+    topic_index.save()
+    return added
+
+
+def load_topic_index(memory):
+    """The persisted topic index, brought up to date with memory."""
+    index = digest_topics.TopicIndex(TOPIC_INDEX_FILE)
+    added = index.sync(memory)
+    if added:
+        print(f"  Indexed {added} article records by topic.")
+    return index
+
+
+def _recent_query(memory, digests=2):
+    """What the last few digests were about: the query for this run's context.
+
+    Before generation there is nothing new to match against; recent
+    topics are the best guess at what this run will cover, and they pull
+    in older articles that share them.
+    """
+    articles = memory.articles
+    dates = sorted({a.get('digest_date', '') for a in articles if a.get('digest_date')})[-digests:]
+    recent = [a for a in articles if a.get('digest_date') in dates] or articles[-10:]
+    return digest_topics.query_terms(recent)
+
+
+def _build_past_topic_context(memory, index) -> str:
+    """Build a system-prompt section listing the most relevant past articles.
 
     The LLM uses this to cross-reference when reviewing new articles on
     similar topics (e.g. 'This builds on [prior GAS study] which found X').
+    Articles are ranked against recent topics and cut off at
+    TOPIC_CONTEXT_TOKENS.
     """
-    if not articles:
-        return ""
-
-    lines = [
+    ranked = index.search(_recent_query(memory), k=TOPIC_CONTEXT_K)
+    header = [
         "\n\n### PREVIOUSLY REVIEWED ARTICLES WITH TOPIC TAGS",
         "When reviewing new articles, check if any of these past reviews cover "
         "similar topics. If so, reference them to provide continuity (e.g. "
@@ -136,60 +336,32 @@ def _build_past_topic_context(articles: list[dict]) -> str:
         "'Unlike the [prior study] in [journal], this study found Y'). "
         "Do NOT re-review these — just cite them where they add context.\n",
     ]
-    for article in articles[-50:]:  # Last 50 to keep prompt manageable
-        topics = ", ".join(article.get("topics", []))
-        lines.append(
-            f"- **{article.get('title', 'Unknown')}** "
-            f"({article.get('journal', '')}, {article.get('date', '')})"
-            f" [{article.get('study_type', '')}]"
-            f"\n  Topics: {topics}"
-            f"\n  Key finding: {article.get('key_finding', 'N/A')}"
-        )
-    return "\n".join(lines)
+    text, count = digest_topics.within_budget(header, ranked, TOPIC_CONTEXT_TOKENS)
+    if count:
+        print(f"  Injected {count} of {len(index)} past article records for cross-referencing.")
+    return text
 
 
-def find_related_articles(new_digest_content: str, memory: dict) -> str:
+def find_related_articles(new_digest_content: str, memory: digest_memory.Memory,
+                          index=None) -> str:
     """Find previously reviewed articles related to topics in the new digest.
 
     Returns a formatted string to inject into the system prompt so the LLM
     can reference prior reviews when writing about similar topics.
     """
-    past_articles = memory.get("articles", [])
-    if not past_articles:
+    index = index or load_topic_index(memory)
+    if not len(index):
         return ""
 
-    # Build a compact topic index from past articles
-    topic_index: dict[str, list[dict]] = {}
-    for article in past_articles:
-        for topic in article.get("topics", []):
-            topic_index.setdefault(topic.lower(), []).append(article)
-
     # Extract topics from the new digest to find overlaps
     new_records = extract_article_records(new_digest_content)
     if not new_records:
         return ""
 
-    new_topics = set()
-    new_titles = set()
-    for rec in new_records:
-        new_topics.update(t.lower() for t in rec.get("topics", []))
-        new_titles.add(rec.get("title", "").lower())
-
-    # Find past articles that share topics with new articles
-    related: dict[str, dict] = {}  # keyed by title to dedupe
-    for topic in new_topics:
-        for article in topic_index.get(topic, []):
-            title = article.get("title", "")
-            # Don't include articles that are in the new digest
-            if title.lower() not in new_titles:
-                related[title] = article
-
-    if not related:
-        return ""
-
-    # Format as context for the system prompt (limit to 15 most relevant)
-    items = list(related.values())[:15]
-    lines = [
+    # Rank past articles by how much they share with the new ones,
+    # leaving out the new articles themselves
+    ranked = index.search(digest_topics.query_terms(new_records), k=15, exclude=new_records)
+    header = [
         "\n### PREVIOUSLY REVIEWED RELATED ARTICLES",
         "The following articles from past digests share topics with articles "
         "in this digest. When writing reviews, reference these where relevant "
@@ -197,129 +369,67 @@ def find_related_articles(new_digest_content: str, memory: dict) -> str:
         "'Unlike [prior study], this study found Y'). Do NOT re-review these — "
         "just cite them when they provide useful context.\n",
     ]
-    for article in items:
-        topics = ", ".join(article.get("topics", []))
-        lines.append(
-            f"- **{article.get('title', 'Unknown')}** ({article.get('journal', '')}, "
-            f"{article.get('date', '')})\n"
-            f"  Type: {article.get('study_type', 'unknown')} | "
-            f"Topics: {topics}\n"
-            f"  Finding: {article.get('key_finding', 'N/A')}"
-        )
-    return "\n".join(lines)
+    text, _ = digest_topics.within_budget(header, ranked, TOPIC_CONTEXT_TOKENS)
+    return text
 
 
-def create_pdf_folder():
+def create_pdf_folder(window):
     """Create the folder for this digest's PDFs."""
-    pdf_folder = PDF_OUTPUT_DIR / folder_date_range
+    pdf_folder = PDF_OUTPUT_DIR / window.folder
     pdf_folder.mkdir(parents=True, exist_ok=True)
     return pdf_folder
 
 
-def download_pdf(url, pdf_folder, title):
-    """Download a PDF from a URL to the specified folder."""
-    try:
-        # Clean the title for use as filename
-        safe_title = re.sub(r'[<>:"/\\|?*]', '', title)[:80]  # Remove invalid chars, limit length
-        safe_title = safe_title.strip().replace(' ', '_')
-        filename = f"{safe_title}.pdf"
-        filepath = pdf_folder / filename
-
-        # Skip if already downloaded
-        if filepath.exists():
-            print(f"  Already exists: {filename}")
-            return str(filepath)
-
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-
-        response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)
-
-        # Check if we got a PDF
-        content_type = response.headers.get('content-type', '').lower()
-        if 'pdf' in content_type or url.endswith('.pdf'):
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
-            print(f"  Downloaded: {filename}")
-            return str(filepath)
-        else:
-            print(f"  Not a PDF (content-type: {content_type}): {url}")
-            return None
-
-    except Exception as e:
-        print(f"  Failed to download {url}: {e}")
-        return None
-
-
-def extract_pdf_urls(response_text):
-    """Extract PDF URLs from the digest response."""
-    pdf_urls = []
-
-    # Pattern to match PDF links in the format **PDF:** [url] or PDF: url
-    pdf_pattern = r'\*\*PDF:\*\*\s*\[?([^\]\s]+\.pdf[^\s\]]*)\]?'
-    matches = re.findall(pdf_pattern, response_text, re.IGNORECASE)
-
-    # Also look for direct PDF URLs
-    direct_pdf_pattern = r'(https?://[^\s<>"]+\.pdf[^\s<>"]*)'
-    direct_matches = re.findall(direct_pdf_pattern, response_text, re.IGNORECASE)
+def extract_pdf_urls(doc):
+    """The PDF URLs of the articles in a parsed digest, in order."""
+    return list(dict.fromkeys(a.pdf_url for a in doc.articles if a.pdf_url))
 
-    pdf_urls.extend(matches)
-    pdf_urls.extend(direct_matches)
 
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_urls = []
-    for url in pdf_urls:
-        if url not in seen and url.lower() != 'paywalled':
-            seen.add(url)
-            unique_urls.append(url)
+def extract_article_titles_for_pdfs(doc):
+    """Extract (title, PDF URL, DOI) for each article with a PDF link."""
+    # The DOI lets the PDF catalog recognise the paper under another URL
+    return [(a.title, a.pdf_url, a.doi) for a in doc.articles if a.pdf_url]
 
-    return unique_urls
 
+def pdf_queue(window, catalog=None):
+    """A background download queue for this digest's PDFs."""
+    # One catalog across every <range>/ folder: a paper linked again in a
+    # later window is revalidated or hard-linked, not stored twice
+    return digest_pdfs.DownloadQueue(create_pdf_folder(window),
+                                     catalog=catalog or digest_pdfs.Catalog(PDF_OUTPUT_DIR))
 
-def extract_article_titles_for_pdfs(response_text):
-    """Extract article titles paired with their PDF URLs."""
-    articles = []
 
-    # Split by article headers (bold titles)
-    article_blocks = re.split(r'\n\*\*([^*]+)\*\*\n', response_text)
+def queue_pdfs(queue, markdown):
+    """Start downloading the PDFs linked in a piece of digest Markdown."""
+    for article in extract_article_titles_for_pdfs(digest_document.parse(markdown)):
+        queue.submit(*article)
 
-    for i in range(1, len(article_blocks), 2):
-        if i+1 < len(article_blocks):
-            title = article_blocks[i].strip()
-            content = article_blocks[i+1]
 
-            # Look for PDF URL in this block
-            pdf_match = re.search(r'\*\*PDF:\*\*\s*\[?([^\]\s]+\.pdf[^\s\]]*)\]?', content, re.IGNORECASE)
-            if pdf_match:
-                pdf_url = pdf_match.group(1)
-                if pdf_url.lower() != 'paywalled':
-                    articles.append((title, pdf_url))
+def download_all_pdfs(response_text, window, queue=None):
+    """Download all PDFs mentioned in the digest.
 
-    return articles
-
-
-def download_all_pdfs(response_text):
-    """Download all PDFs mentioned in the digest."""
-    pdf_folder = create_pdf_folder()
-    print(f"\nDownloading PDFs to: {pdf_folder}")
-
-    articles = extract_article_titles_for_pdfs(response_text)
-    downloaded = []
-
-    for title, url in articles:
-        print(f"\nProcessing: {title[:50]}...")
-        filepath = download_pdf(url, pdf_folder, title)
-        if filepath:
-            downloaded.append({'title': title, 'url': url, 'path': filepath})
+    With a `queue` the reviews already fed as they were written, this
+    only adds what is missing and waits for the downloads in flight.
+    """
+    queue = queue or pdf_queue(window)
+    print(f"\nDownloading PDFs to: {queue.pdf_folder}")
+
+    articles = extract_article_titles_for_pdfs(digest_document.parse(response_text))
+    started = len(queue)
+    queue_pdfs(queue, response_text)
+    print(f"Fetching {len(articles)} PDFs ({started} started during generation)...")
+    # A review dropped as a repeat may have started a download; the
+    # manifest lists only the digest's own PDFs
+    wanted = {url for _, url, _ in articles}
+    downloaded = [pdf for pdf in queue.results() if pdf["url"] in wanted]
+    pdf_folder = queue.pdf_folder
 
     # Save manifest of downloaded PDFs
     if downloaded:
         manifest_path = pdf_folder / 'manifest.json'
         with open(manifest_path, 'w', encoding="utf-8") as f:
             json.dump({
-                'date_range': date_range,
+                'date_range': window.date_range,
                 'generated': datetime.now().isoformat(),
                 'pdfs': downloaded
             }, f, indent=2)
@@ -328,21 +438,32 @@ def download_all_pdfs(response_text):
     return downloaded
 
 
-def extract_articles_from_response(response_text):
-    """Extract article titles and DOIs from the response for memory."""
-    # This is a simple extraction - the AI will format articles consistently
-    articles = []
-    lines = response_text.split('\n')
-    for line in lines:
-        # Look for DOI patterns
-        if 'doi.org' in line.lower() or 'DOI:' in line:
-            articles.append(line.strip())
-        # Look for article title patterns (usually bold or in headers)
-        if line.startswith('**') and '**' in line[2:]:
-            title = line.split('**')[1] if len(line.split('**')) > 1 else ""
-            if title and len(title) > 20:  # Likely an article title
-                articles.append(title)
-    return articles
+def extract_articles_from_response(articles):
+    """Memory records (title, DOI, PMID, journal) for parsed digest articles."""
+    return [a.record() for a in articles]
+
+
+def drop_repeated_articles(doc, index):
+    """Remove articles that repeat ones already reviewed.
+
+    Only an article sharing a DOI or PMID with a past one, or with a
+    near-exact title, is removed (digest_minhash.ArticleIndex.repeat).
+    Returns the digest without them, the articles kept and [(title, past
+    record)] for each dropped.
+    """
+    kept = []
+    dropped = []
+    skip = set()
+    for article in doc.articles:
+        past = index.repeat(article.record())
+        if past is None:
+            kept.append(article)
+        else:
+            dropped.append((article.title, past))
+            skip.update(range(article.start, article.end))
+    lines = doc.text.split('\n')
+    content = '\n'.join(line for n, line in enumerate(lines) if n not in skip)
+    return content, kept, dropped
 
 
 SYSTEM_PROMPT = """You are a literature monitoring assistant for PEDIATRIC INFECTIOUS DISEASE PHYSICIANS AND SCIENTISTS. Your audience is highly trained specialists who expect rigorous, critical analysis.
@@ -384,7 +505,7 @@ For open access articles, also provide the PDF URL if available:
 - **PDF:** [direct PDF link if available]
 
 ### 4. DATE RESTRICTION — EXTREMELY IMPORTANT
-- ONLY include articles published or posted in the LAST 14 DAYS (bi-weekly digest)
+- ONLY include articles published or posted in the LAST {days} DAYS (bi-weekly digest)
 - Today's date is {today_date}
 - Only include articles from {start_date} to {today_date}
 - DO NOT include anything published before {start_date}
@@ -490,17 +611,14 @@ Do NOT summarize a 7-recommendation guideline as "Seven key priorities emerged."
 """
 
 
-USER_PROMPT = """Generate the bi-weekly literature digest for {date_range}.
+TRIAGE_PROMPT = """Triage the bi-weekly literature digest for {date_range}: find the articles worth reviewing, but do not review them yet.
 
 IMPORTANT REMINDERS:
-1. ONLY articles from the last 14 days ({start_date} to {today_date})
+1. ONLY articles from the last {days} days ({start_date} to {today_date})
 2. Every article MUST have a working link (DOI or direct URL)
-3. For OPEN ACCESS articles: provide FULL critical analysis of methods, results, and discussion
-4. For PAYWALLED articles: review abstract only and clearly mark with [PAYWALL: Abstract only reviewed]
-5. Include PDF links for open access articles when available
-6. If a category has no recent publications, state that clearly
-7. Do NOT include previously reviewed articles listed in the system prompt
-8. Limit your web searches to be efficient - focus on the most important sources
+3. Do NOT include previously reviewed articles listed in the system prompt
+4. Limit your web searches to be efficient - focus on the most important sources
+5. At most {max_reviews} articles — quality over quantity
 
 Search strategy:
 1. Pediatric ID journals: search "PIDJ {search_month} 2026", "JPIDS {search_month} 2026", "Clinical Infectious Diseases {search_month} 2026", "Pediatrics infectious disease {search_month} 2026", "JAMA Pediatrics infectious disease {search_month} 2026"
@@ -510,181 +628,486 @@ Search strategy:
 5. Guidelines: search "IDSA guidelines 2026", "ESCMID guidelines 2026", "CDC MMWR {search_month} 2026"
 6. Stewardship: search "pediatric antimicrobial stewardship 2026"
 7. Check PMC (PubMed Central) for open access versions of any article
-8. Be selective — quality over quantity; prefer articles with direct pediatric relevance or clear ASP/PK applicability
+8. Be selective — prefer articles with direct pediatric relevance or clear ASP/PK applicability
+
+For each article you select, note whether the full text is freely available (open access) or paywalled, and which digest section it belongs in. Each article will be reviewed separately afterwards.
+
+Answer with ONLY this fenced block — no digest, no reviews, no article manifest:
+
+{fence}
+[{{"title": "...", "doi": "...", "url": "...", "journal": "...", "date": "...", "section": "...", "access": "open or paywalled"}}]
+```
+
+"section" is one of: {sections}. An empty list is the right answer if nothing qualifies."""
+
+
+REVIEW_PROMPT = """Review one article for the bi-weekly literature digest for {date_range}. Triage found:
+
+{candidate}
+
+Find it and confirm it was published between {start_date} and {today_date}. If it was not, or you cannot verify that it exists, answer with only the word SKIP.
 
-For each article:
+Otherwise:
 - Determine if full text is freely available (open access) or paywalled
-- If open access: READ THE FULL PAPER and provide a journal-club-level review. Include actual numbers, effect sizes, CIs, p-values. The reader is an ID physician — they want the data, not just a paragraph summary. Each open-access article review should be 300-500 words minimum.
-- If paywalled: clearly indicate abstract-only review, extract maximum detail from the abstract
-- Include direct PDF links for open access articles
+- If open access: READ THE FULL PAPER and provide a journal-club-level review. Include actual numbers, effect sizes, CIs, p-values. The reader is an ID physician — they want the data, not just a paragraph summary. The review should be 300-500 words minimum.
+- If paywalled: extract maximum detail from the abstract and clearly mark the review with [PAYWALL: Abstract only reviewed]
+- Include a direct PDF link if it is open access
 
-Write each review as if you are presenting at journal club to attending physicians. Be thorough — a short, vague review is worse than no review."""
+Write ONLY this article's review, in the article format from the OUTPUT FORMAT section and starting with its bold title line — no digest title, section headings or footer — then the article manifest block with this article's one entry.
 
+Write the review as if you are presenting at journal club to attending physicians. Be thorough — a short, vague review is worse than no review."""
 
-def generate_digest():
-    """Generate the bi-weekly literature digest using Claude with web search."""
 
-    print(f"Generating bi-weekly literature digest for {date_range}...")
-    print(f"Date range: {digest_start.strftime('%Y-%m-%d')} to {today.strftime('%Y-%m-%d')}")
+CORPUS_PROMPT = """
 
-    # Load memory of previously reviewed articles
-    memory = load_memory()
-    previously_reviewed = "\n".join(memory.get("reviewed_titles", [])[-50:])  # Last 50 titles
+Already found for you: these articles appeared in the journals above between {start_date} and {today_date} (from PubMed and the journals' feeds) and have not been reviewed before. Consider them first. Use web search to check their access and full text rather than to find them again, and search only for what this list cannot cover (guidelines, FDA communications, preprints, other sources):
+
+{articles}"""
+
+
+def update_corpus(since=None):
+    """Bring the candidate corpus up to date; a failure only costs the shortcut."""
+    print("Updating the candidate corpus...")
+    try:
+        corpus = digest_corpus.Corpus(CORPUS_FILE)
+        try:
+            counts = digest_corpus.ingest(corpus, since=since,
+                                          api_key=os.environ.get("NCBI_API_KEY", ""))
+            print(f"  {sum(counts.values())} new articles; {len(corpus)} in the corpus.")
+        finally:
+            corpus.close()
+    except Exception as e:
+        print(f"  Warning: candidate corpus not updated: {e}")
+
+
+def _corpus_candidates(window, memory):
+    """The corpus articles published in `window` that memory does not hold."""
+    if not Path(CORPUS_FILE).exists():
+        return []
+    corpus = digest_corpus.Corpus(CORPUS_FILE)
+    try:
+        articles = corpus.between(window.start, window.end)
+    finally:
+        corpus.close()
+    return [a for a in articles if memory.find(a) is None][:CORPUS_CANDIDATES]
+
+
+def _system(text):
+    """The system prompt, marked for caching: triage and every review share it."""
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+
+def start_run(window, memory, topic_index):
+    """Build the prompts for `window` and open a checkpointed run for them."""
+
+    # Last 50 papers reviewed, each named once however many ways it was written
+    previously_reviewed = "\n".join(digest_minhash.distinct_labels(memory, 50))
     if not previously_reviewed:
         previously_reviewed = "None - this is the first digest."
 
-    # Get search month (use current month name)
-    search_month = today.strftime('%B')
+    # Get search month (the month the window ends in)
+    search_month = window.end.strftime('%B')
 
     # Format the prompts with dates
     system = SYSTEM_PROMPT.format(
-        today_date=today.strftime('%B %d, %Y'),
-        start_date=digest_start.strftime('%B %d, %Y'),
-        date_range=date_range,
+        today_date=window.end.strftime('%B %d, %Y'),
+        start_date=window.start.strftime('%B %d, %Y'),
+        date_range=window.date_range,
+        days=window.days,
         previously_reviewed=previously_reviewed
+    ) + MANIFEST_PROMPT
+
+    _, sections, _ = digest_triage.layout(system)
+    user = TRIAGE_PROMPT.format(
+        date_range=window.date_range,
+        start_date=window.start.strftime('%B %d, %Y'),
+        today_date=window.end.strftime('%B %d, %Y'),
+        days=window.days,
+        search_month=search_month,
+        max_reviews=MAX_REVIEWS,
+        fence=digest_triage.FENCE,
+        sections=", ".join(f'"{s}"' for s in sections)
     )
 
-    user = USER_PROMPT.format(
-        date_range=date_range,
-        start_date=digest_start.strftime('%B %d, %Y'),
-        today_date=today.strftime('%B %d, %Y'),
-        search_month=search_month
-    )
+    # List what the journals published in the window, so triage need not
+    # search for it
+    candidates = _corpus_candidates(window, memory)
+    if candidates:
+        print(f"Listing {len(candidates)} corpus articles for triage.")
+        user += CORPUS_PROMPT.format(
+            start_date=window.start.strftime('%B %d, %Y'),
+            today_date=window.end.strftime('%B %d, %Y'),
+            articles="\n".join(
+                f"- {a['title']} — {a['journal']}, {a['published']} | "
+                + (f"https://doi.org/{a['doi']}" if a['doi'] else a['url'])
+                for a in candidates)
+        )
 
     # Inject related past articles for cross-referencing (if any exist)
-    if memory.get("articles"):
+    if len(topic_index):
         print("Searching for related past articles...")
-        # We don't have the new digest yet, so we pass the user prompt topics.
-        # The actual cross-referencing happens post-generation for the NEXT run.
-        # For this run, we append the full topic context from past articles.
-        past_context = _build_past_topic_context(memory.get("articles", []))
+        # We don't have the new digest yet, so past articles are ranked
+        # against what recent digests covered, within a token budget.
+        past_context = _build_past_topic_context(memory, topic_index)
         if past_context:
             system += past_context
-            print(f"  Injected {len(memory['articles'])} past article records for cross-referencing.")
-    
-    try:
-        # Call Claude with web search enabled.
-        #
-        # 1. Streaming is required: with max_tokens=32000 the SDK refuses a
-        #    non-streaming request (>10-min timeout).
-        #
-        # 2. Server-side web_search uses pause_turn to signal mid-loop pauses.
-        #    We must re-send the assistant turn so Claude resumes, looping
-        #    until end_turn.
-        messages = [{"role": "user", "content": user}]
-        digest_content = ""
-        max_continuations = 10
-        response = None
-
-        for _ in range(max_continuations):
-            with client.messages.stream(
-                model="claude-sonnet-4-6",
-                max_tokens=32000,
-                tools=[{
-                    "type": "web_search_20250305",
-                    "name": "web_search"
-                }],
-                system=system,
-                messages=messages
-            ) as stream:
-                response = stream.get_final_message()
-
-            # Accumulate any text emitted in this segment
-            for block in response.content:
-                if block.type == "text":
-                    digest_content += block.text
-
-            if response.stop_reason == "pause_turn":
-                messages.append({"role": "assistant", "content": response.content})
-                continue
-            break
-        else:
-            raise RuntimeError(
-                f"Claude did not finish after {max_continuations} continuations "
-                "(still pausing for web search). The digest may be incomplete."
-            )
 
-        # Fail fast if Claude ran out of tokens before finishing
-        if response.stop_reason == "max_tokens":
-            raise RuntimeError(
-                "Claude hit max_tokens before completing the digest. "
-                "The response was truncated — no partial output saved. "
-                "Consider increasing max_tokens or tightening the prompt."
-            )
+    run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{window.file_date}"
+    run = digest_runs.Run.start(RUNS_DIR, system, user, window.to_json(), run_id=run_id)
+    print(f"Run {run.run_id}: streaming triage to {run.partial_path}")
+    return run
 
-        # Strip AI chain-of-thought preamble (search narration before the
-        # actual digest).  The real content starts at the first markdown
-        # heading, e.g. "# 📚 Literature Digest".
-        heading_match = re.search(r'^#\s', digest_content, re.MULTILINE)
-        if heading_match:
-            digest_content = digest_content[heading_match.start():]
-        else:
+
+def stream_triage(run):
+    """Call Claude until the run's triage is finished; returns its text."""
+
+    # Server-side web_search uses pause_turn to signal mid-loop pauses.
+    # We must re-send the assistant turn so Claude resumes, looping until
+    # end_turn. Each finished segment is checkpointed (and streamed to
+    # partial.md as it arrives), so a failure costs at most the segment
+    # in flight.
+    while run.generating:
+        if run.state["segments"] >= MAX_CONTINUATIONS:
             raise RuntimeError(
-                "Claude returned a response but it contained no markdown heading — "
-                "the digest body was never written. stop_reason was "
-                f"'{response.stop_reason}'. Raw output (first 500 chars):\n"
-                + digest_content[:500]
+                f"Claude did not finish triage after {MAX_CONTINUATIONS} continuations "
+                "(still pausing for web search)."
             )
+        rate_limiter.wait()
+        with get_client().messages.stream(
+            model=DIGEST_MODEL,
+            max_tokens=TRIAGE_MAX_TOKENS,
+            tools=[WEB_SEARCH],
+            system=_system(run.state["system"]),
+            messages=run.state["messages"]
+        ) as stream:
+            for text in stream.text_stream:
+                run.stream_text(text)
+            response = stream.get_final_message()
+        run.complete_segment(response)
+
+    # Fail fast if Claude ran out of tokens before finishing
+    if run.state["stop_reason"] == "max_tokens":
+        raise RuntimeError(
+            "Claude hit max_tokens before completing triage. "
+            f"The truncated response is in {run.partial_path}."
+        )
+    return run.state["text"]
 
-        print("Digest generated successfully!")
 
-        # Update memory with newly reviewed articles
-        new_articles = extract_articles_from_response(digest_content)
-        memory["reviewed_titles"].extend(new_articles)
-        memory["last_run"] = today.isoformat()
+def triage_articles(run, memory, claims=None):
+    """The candidates the run will review, picking them first if need be.
 
-        # Extract structured article records for topic-linking
+    `claims`, a (set of candidate keys, lock) shared by concurrent
+    windows, keeps two windows from reviewing the same article.
+    """
+    if run.state.get("candidates") is None:
+        found = digest_triage.candidates(stream_triage(run))
+        claimed, lock = claims or (None, contextlib.nullcontext())
+        with lock:
+            selected, dropped = digest_triage.select(
+                found, memory, digest_minhash.index_memory(memory), MAX_REVIEWS, claimed)
+        for candidate, reason in dropped:
+            print(f"  Skipped candidate: {candidate['title'][:60]} ({reason})")
+        run.select(selected)
+        print(f"Triage picked {len(selected)} of {len(found)} candidates.")
+    return run.state["candidates"]
+
+
+def review_article(system, candidate, window):
+    """One article's review: {"review": Markdown, "manifest": entries or None}.
+
+    The review is empty if Claude found the article out of the window
+    or could not verify it.
+    """
+    user = REVIEW_PROMPT.format(
+        date_range=window.date_range,
+        start_date=window.start.strftime('%B %d, %Y'),
+        today_date=window.end.strftime('%B %d, %Y'),
+        candidate=json.dumps(candidate, ensure_ascii=False, indent=2)
+    )
+    messages = [{"role": "user", "content": user}]
+    text = ""
+    for _ in range(REVIEW_CONTINUATIONS):
+        rate_limiter.wait()
+        response = get_client().messages.create(
+            model=DIGEST_MODEL,
+            max_tokens=REVIEW_MAX_TOKENS,
+            tools=[WEB_SEARCH],
+            system=_system(system),
+            messages=messages
+        )
+        text += "".join(b.text for b in response.content if b.type == "text")
+        if response.stop_reason != "pause_turn":
+            break
+        messages.append({"role": "assistant", "content": response.content})
+    else:
+        raise RuntimeError(f"still searching after {REVIEW_CONTINUATIONS} continuations")
+    if response.stop_reason == "max_tokens":
+        raise RuntimeError("hit max_tokens before finishing the review")
+
+    text, manifest = digest_manifest.split(text)
+    doc = digest_document.parse(text)
+    if not doc.articles:
+        if re.search(r'\bSKIP\s*$', text):
+            return {"review": "", "manifest": None}
+        raise RuntimeError("the response holds no article review")
+    # drop search narration before the review itself
+    review = "\n".join(doc.text.split("\n")[doc.articles[0].start:]).strip()
+    try:
+        entries = json.loads(manifest) if manifest else None
+    except ValueError:
+        entries = None
+    return {"review": review, "manifest": entries if isinstance(entries, list) else None}
+
+
+def review_articles(run, workers=REVIEW_WORKERS, pdfs=None):
+    """Review every candidate not reviewed yet, `workers` at a time.
+
+    A review that fails is reported and left out; returns the candidates
+    whose review failed. Raises if that leaves no review at all, so the
+    run can be resumed instead of publishing an empty digest. Each review
+    hands its PDF links to the `pdfs` queue as soon as it is written.
+    """
+    window = Window.from_json(run.state["window"])
+    todo = [c for c in run.state["candidates"] if digest_triage.key(c) not in run.state["reviews"]]
+    if pdfs is not None:
+        for done in list(run.state["reviews"].values()):
+            queue_pdfs(pdfs, done["review"])
+
+    def review(candidate):
+        done = review_article(run.state["system"], candidate, window)
+        run.complete_review(digest_triage.key(candidate), done)
+        if pdfs is not None:
+            queue_pdfs(pdfs, done["review"])
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(c, pool.submit(review, c)) for c in todo]
+        for candidate, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"  Warning: review of {candidate['title'][:60]} failed: {e}")
+                failed.append(candidate)
+    if failed and not any(r["review"] for r in run.state["reviews"].values()):
+        raise RuntimeError(f"{len(failed)} reviews failed and none succeeded")
+    return failed
+
+
+def assemble_digest(run):
+    """The digest from the run's reviews, in the prompt's section layout."""
+    reviews = []
+    entries = []
+    for candidate in run.state["candidates"]:
+        done = run.state["reviews"].get(digest_triage.key(candidate))
+        if done and done["review"]:
+            reviews.append((candidate["section"], done["review"]))
+            entries.extend(done["manifest"] or [])
+    content = digest_triage.stitch(run.state["system"], reviews)
+    if entries:
+        # one manifest for the whole digest, as commit_digest expects
+        content += f"\n{digest_manifest.FENCE}\n{json.dumps(entries, ensure_ascii=False, indent=1)}\n```\n"
+    return content
+
+
+def write_digest(run, memory, workers=REVIEW_WORKERS, pdfs=None, claims=None):
+    """Triage, review and assemble the run's digest; returns its Markdown.
+
+    PDFs the reviews link to start downloading into `pdfs`, a
+    digest_pdfs.DownloadQueue, while the remaining reviews are written.
+    `claims` is passed on to triage_articles.
+    """
+    candidates = triage_articles(run, memory, claims)
+    print(f"Reviewing {len(candidates)} articles ({workers} at a time)...")
+    failed = review_articles(run, workers, pdfs)
+    if failed:
+        print(f"  {len(failed)} reviews failed and are left out of the digest.")
+    return assemble_digest(run)
+
+
+def commit_digest(digest_content, window, memory, topic_index, run):
+    """Drop articles already reviewed, checkpoint, and remember the rest.
+
+    Concurrent windows commit one at a time, so each checks against
+    everything the ones before it reviewed.
+    """
+    # The manifest is for memory, not for readers
+    digest_content, manifest = digest_manifest.split(digest_content)
+
+    # The prompt says not to repeat past articles; make sure of it
+    doc = digest_document.parse(digest_content)
+    digest_content, kept, repeats = drop_repeated_articles(
+        doc, digest_minhash.index_memory(memory))
+    for title, past in repeats:
+        print(f"  Dropped repeat: {title[:60]} (reviewed {past.get('digest_date', 'before')})")
+
+    # Memory records for the newly reviewed articles
+    records = extract_articles_from_response(kept)
+
+    # Structured article records for topic-linking: from the manifest the
+    # digest was written with, or extracted from the digest without one
+    new_records = None
+    if not kept:
+        new_records = []
+    elif manifest is None:
+        print("  No article manifest in the digest.")
+    else:
+        try:
+            new_records = digest_manifest.records(manifest, kept)
+        except digest_manifest.ManifestError as e:
+            print(f"  Warning: article manifest rejected: {e}")
+    if new_records is None:
         print("Extracting structured article records for topic memory...")
         new_records = extract_article_records(digest_content)
-        if new_records:
-            for rec in new_records:
-                rec["digest_date"] = today.strftime("%Y-%m-%d")
-            memory.setdefault("articles", []).extend(new_records)
-            print(f"  Saved {len(new_records)} article records with topic tags.")
-        else:
-            print("  Warning: no structured records extracted.")
+    if new_records:
+        records.extend(new_records)
+        print(f"  Saving {len(new_records)} article records with topic tags.")
+    elif kept:
+        print("  Warning: no structured records extracted.")
+    for rec in records:
+        rec["digest_date"] = window.file_date
+
+    # Checkpoint first: a resume re-applies these records rather than
+    # filtering the digest against memory that already holds them
+    run.complete(digest_content, records)
+    remember_digest(run, memory, topic_index)
+    return digest_content
+
+
+def remember_digest(run, memory, topic_index):
+    """Add a completed run's records to memory and save it; safe to repeat."""
+    for rec in run.state.get("records", []):
+        memory.add(rec)
+    completed = run.state.get("completed")
+    memory.mark_run(datetime.fromisoformat(completed) if completed else datetime.now())
+    topic_index.sync(memory)
+    save_memory(memory)
+    topic_index.save()
+
+
+def generate_digest(window, run=None, pdfs=None):
+    """Generate the bi-weekly literature digest using Claude with web search.
+
+    Triage and then one review per article it picked, checkpointed after
+    every triage segment and every review (see digest_runs.py); pass the
+    `run` to continue one, and a `pdfs` queue to start PDF downloads as
+    reviews come in. Returns (content, run).
+    """
+
+    print(f"Generating bi-weekly literature digest for {window.date_range}...")
+    print(f"Date range: {window.start.strftime('%Y-%m-%d')} to {window.end.strftime('%Y-%m-%d')}")
+
+    # Load memory of previously reviewed articles
+    memory = load_memory()
+    topic_index = load_topic_index(memory)
+
+    if run and run.state["final"] is not None:
+        # Generated and checked already; remembering or saving was cut short
+        remember_digest(run, memory, topic_index)
+        return run.state["final"], run
+    if run is None:
+        run = start_run(window, memory, topic_index)
+
+    try:
+        digest_content = write_digest(run, memory, pdfs=pdfs)
+        print("Digest generated successfully!")
+        return commit_digest(digest_content, window, memory, topic_index, run), run
 
-        save_memory(memory)
-        
-        return digest_content
-        
     except anthropic.APIError as e:
         print(f"API Error: {e}")
+        print(f"Progress is checkpointed; continue with --resume {run.run_id}")
         raise
     except Exception as e:
         print(f"Error generating digest: {e}")
+        print(f"Progress is checkpointed; continue with --resume {run.run_id}")
         raise
 
 
-def save_digest(content):
-    """Save the digest as both JSON (for data) and update the HTML page."""
+def backfill_digests(windows, workers=BACKFILL_WORKERS):
+    """Generate and save a digest for each of `windows`, `workers` at a time.
+
+    Generation runs concurrently; committing to memory and saving happen
+    in window order, so an article two windows both found stays with the
+    earlier one. Windows that already have a digest are skipped. Returns
+    the windows that failed.
+    """
+    todo = []
+    for window in windows:
+        if Path(f"literature-monitor/digests/{window.file_date}.json").exists():
+            print(f"  Skipping {window.date_range}: a digest for {window.file_date} exists")
+        else:
+            todo.append(window)
+
+    memory = load_memory()
+    topic_index = load_topic_index(memory)
+    lock = threading.Lock()
+    catalog = digest_pdfs.Catalog(PDF_OUTPUT_DIR)
+    queues = {window: pdf_queue(window, catalog) for window in todo}
+    # candidates picked by any window, so no two review the same article
+    claims = (set(), lock)
+
+    def generate(window):
+        with lock:
+            run = start_run(window, memory, topic_index)
+        try:
+            return run, write_digest(run, memory, pdfs=queues[window], claims=claims)
+        except Exception as e:
+            print(f"  {window.date_range}: {e}")
+            print(f"  Progress is checkpointed; continue with --resume {run.run_id}")
+            raise
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(window, pool.submit(generate, window)) for window in todo]
+        for window, future in futures:
+            try:
+                run, digest_content = future.result()
+                with lock:
+                    digest_content = commit_digest(digest_content, window, memory, topic_index, run)
+                save_digest(digest_content, window)
+                download_all_pdfs(digest_content, window, queues[window])
+                run.finish()
+                print(f"✅ {window.date_range}")
+            except Exception as e:
+                print(f"❌ {window.date_range}: {e}")
+                failed.append(window)
+                # keep what was fetched; the resumed run will find it in the catalog
+                queues[window].results()
+    return failed
+
+
+def save_digest(content, window):
+    """Save the digest as both JSON (for data) and update the HTML pages."""
     
     # Create directories if they don't exist
     os.makedirs("literature-monitor/digests", exist_ok=True)
     
     # Save as JSON
     digest_data = {
-        "date": file_date,
-        "date_range": date_range,
+        "date": window.file_date,
+        "date_range": window.date_range,
         "generated_at": datetime.now().isoformat(),
         "content": content
     }
     
-    json_path = f"literature-monitor/digests/{file_date}.json"
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(digest_data, f, indent=2)
+    json_path = f"literature-monitor/digests/{window.file_date}.json"
+    digest_site.write_if_changed(json_path, json.dumps(digest_data, indent=2))
     print(f"Saved JSON digest to {json_path}")
     
-    # Also save as latest.json for easy access
-    with open("literature-monitor/digests/latest.json", "w", encoding="utf-8") as f:
-        json.dump(digest_data, f, indent=2)
-    print("Updated latest.json")
+    # Also save as latest.json for easy access (unless a backfill is
+    # filling in a window older than the newest digest)
+    newest = max(p.stem for p in Path("literature-monitor/digests").glob("????-??-??.json"))
+    if window.file_date >= newest:
+        digest_site.write_if_changed("literature-monitor/digests/latest.json", json.dumps(digest_data, indent=2))
+        print("Updated latest.json")
     
     # Update the archive manifest
     update_archive_manifest(digest_data)
     
-    # Generate the HTML page
-    generate_html_page(digest_data)
+    # Render the index, this digest's page and the archive (see digest_site.py)
+    result = digest_site.build()
+    for out in result["written"]:
+        print(f"Updated literature-monitor/{out}")
 
 
 def update_archive_manifest(new_digest):
@@ -697,706 +1120,94 @@ def update_archive_manifest(new_digest):
     else:
         manifest = {"digests": []}
     
-    # Add new digest to the beginning
-    manifest["digests"].insert(0, {
+    # Add new digest (replacing any earlier one for the same date), newest first
+    digests = [d for d in manifest["digests"] if d["date"] != new_digest["date"]]
+    digests.append({
         "date": new_digest["date"],
         "date_range": new_digest["date_range"],
         "generated": datetime.now().strftime('%B %d, %Y')
     })
+    digests.sort(key=lambda d: d["date"], reverse=True)
     
     # Keep only last 52 weeks
-    manifest["digests"] = manifest["digests"][:52]
+    manifest["digests"] = digests[:52]
     
     with open(manifest_path, 'w', encoding="utf-8") as f:
         json.dump(manifest, f, indent=2)
     print("Updated archive manifest")
 
 
-def markdown_to_html(text):
-    """Convert markdown to HTML for display."""
-
-    html = text
-
-    # Escape HTML entities (but preserve our markdown)
-    html = html.replace('&', '&amp;')
-    html = html.replace('<', '&lt;')
-    html = html.replace('>', '&gt;')
-
-    # Convert paywall notices to styled HTML (do this before other processing)
-    html = re.sub(
-        r'\[PAYWALL:\s*Abstract only reviewed\]',
-        '<span class="paywall-notice">PAYWALL: Abstract only reviewed</span>',
-        html,
-        flags=re.IGNORECASE
-    )
-
-    # Convert open access badges
-    html = re.sub(
-        r'\*\*Access:\*\*\s*OPEN\s*ACCESS',
-        '<strong>Access:</strong> <span class="open-access-badge">OPEN ACCESS</span>',
-        html,
-        flags=re.IGNORECASE
-    )
-    
-    # Headers
-    html = re.sub(r'^#### (.*$)', r'<h4>\1</h4>', html, flags=re.MULTILINE)
-    html = re.sub(r'^### (.*$)', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-    html = re.sub(r'^## (.*$)', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-    html = re.sub(r'^# (.*$)', r'<h1>\1</h1>', html, flags=re.MULTILINE)
-    
-    # Bold and italic
-    html = re.sub(r'\*\*\*(.*?)\*\*\*', r'<strong><em>\1</em></strong>', html)
-    html = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', html)
-    html = re.sub(r'\*(.*?)\*', r'<em>\1</em>', html)
-    
-    # Links - convert markdown links to HTML
-    html = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2" target="_blank" rel="noopener">\1</a>', html)
-    
-    # Also convert bare URLs to links
-    html = re.sub(r'(?<!href=")(https?://[^\s<>\)]+)', r'<a href="\1" target="_blank" rel="noopener">\1</a>', html)
-    
-    # Blockquotes
-    html = re.sub(r'^&gt; (.*$)', r'<blockquote>\1</blockquote>', html, flags=re.MULTILINE)
-    
-    # Unordered lists
-    html = re.sub(r'^\- (.*$)', r'<li>\1</li>', html, flags=re.MULTILINE)
-    html = re.sub(r'^\* (.*$)', r'<li>\1</li>', html, flags=re.MULTILINE)
-    
-    # Wrap consecutive li elements in ul
-    html = re.sub(r'(<li>.*?</li>\n?)+', lambda m: '<ul>' + m.group(0) + '</ul>', html)
-    
-    # Horizontal rules
-    html = re.sub(r'^---$', r'<hr>', html, flags=re.MULTILINE)
-    
-    # Paragraphs - wrap text blocks
-    paragraphs = html.split('\n\n')
-    processed = []
-    for p in paragraphs:
-        p = p.strip()
-        if p and not p.startswith('<h') and not p.startswith('<ul') and not p.startswith('<ol') and not p.startswith('<blockquote') and not p.startswith('<hr'):
-            p = f'<p>{p}</p>'
-        processed.append(p)
-    
-    html = '\n'.join(processed)
-    
-    # Clean up newlines within paragraphs
-    html = re.sub(r'<p>(.*?)</p>', lambda m: '<p>' + m.group(1).replace('\n', '<br>') + '</p>', html, flags=re.DOTALL)
-    
-    return html
-
-
-def _count_articles(content: str) -> tuple[int, int, int]:
-    """Count total articles, open access, and paywalled from markdown."""
-    # Each article starts with a bold title line
-    titles = re.findall(r'^\*\*[^*]{15,}\*\*$', content, re.MULTILINE)
-    total = len(titles)
-    open_access = len(re.findall(r'OPEN\s*ACCESS', content, re.IGNORECASE))
-    paywalled = len(re.findall(r'PAYWALL', content, re.IGNORECASE))
-    # Some articles may not be tagged either way
-    return total, open_access, paywalled
-
-
-# Journals searched — single source of truth
-JOURNAL_LIST = [
-    # Pediatric ID
-    ("PIDJ", "Pediatric Infectious Disease Journal"),
-    ("JPIDS", "J. Pediatric Infectious Diseases Society"),
-    ("CID", "Clinical Infectious Diseases"),
-    ("Pediatrics", "Pediatrics (ID-relevant)"),
-    ("JAMA Peds", "JAMA Pediatrics"),
-    # Antimicrobial Pharmacology & Resistance
-    ("AAC", "Antimicrobial Agents &amp; Chemotherapy"),
-    ("JAC", "Journal of Antimicrobial Chemotherapy"),
-    ("JAC-AMR", "JAC-Antimicrobial Resistance"),
-    ("IJAA", "International Journal of Antimicrobial Agents"),
-    ("CMI", "Clinical Microbiology and Infection"),
-    # Precision Dosing / PK/PD
-    ("Clin PK", "Clinical Pharmacokinetics"),
-    ("TDM", "Therapeutic Drug Monitoring"),
-    ("Pharmacotherapy", "Pharmacotherapy"),
-    ("Pediatric Drugs", "Pediatric Drugs"),
-    # ASP / Outcomes
-    ("ASHE", "Antimicrobial Stewardship &amp; Healthcare Epidemiology"),
-    ("OFID", "Open Forum Infectious Diseases"),
-    # High-impact
-    ("NEJM", "New England Journal of Medicine"),
-    ("JAMA", "JAMA"),
-    ("Lancet ID", "Lancet Infectious Diseases"),
-    ("MMWR", "CDC Morbidity &amp; Mortality Weekly"),
-]
-
-
-def generate_html_page(digest_data):
-    """Generate the HTML page that displays the digest."""
-
-    total, oa, pw = _count_articles(digest_data["content"])
-
-    journal_chips = "\n                ".join(
-        f'<div class="journal-chip"><span class="abbr">{abbr}</span> {name}</div>'
-        for abbr, name in JOURNAL_LIST
-    )
-
-    html_content = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Literature Monitor | Sage Project</title>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Outfit:wght@300;400;500;600;700&family=Source+Serif+4:opsz,wght@8..60,400;8..60,600&display=swap" rel="stylesheet">
-    <style>
-        :root {{
-            --sage-50: #1a1f1a;
-            --sage-100: #252b25;
-            --sage-200: #333b33;
-            --sage-300: #4a5a4b;
-            --sage-400: #6a806c;
-            --sage-500: #7fa882;
-            --sage-600: #8fbf92;
-            --sage-700: #a8d4ab;
-            --sage-800: #c5e5c7;
-            --sage-900: #e8f5e9;
-
-            --warm-50: #111411;
-            --warm-100: #1a1f1a;
-
-            --accent-lavender: #b8a5d4;
-            --accent-lavender-light: rgba(184, 165, 212, 0.15);
-
-            --text-primary: #e0e8e0;
-            --text-secondary: #9bb09d;
-            --text-muted: #6a806c;
-
-            --surface: #181c18;
-            --surface-raised: #1e231e;
-
-            --shadow-sm: 0 1px 2px rgba(0, 0, 0, 0.2);
-            --shadow-md: 0 4px 12px rgba(0, 0, 0, 0.3);
-            --shadow-lg: 0 12px 32px rgba(0, 0, 0, 0.4);
-
-            --radius-sm: 8px;
-            --radius-md: 12px;
-            --radius-lg: 20px;
-        }}
-
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: 'Outfit', sans-serif;
-            background: var(--warm-50);
-            color: var(--text-primary);
-            line-height: 1.7;
-            min-height: 100vh;
-        }}
-
-        .bg-gradient {{
-            position: fixed;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            background:
-                radial-gradient(ellipse at 20% 20%, rgba(184, 165, 212, 0.06) 0%, transparent 50%),
-                radial-gradient(ellipse at 80% 80%, rgba(127, 168, 130, 0.04) 0%, transparent 50%),
-                var(--warm-50);
-            z-index: -1;
-        }}
-
-        header {{
-            background: rgba(17, 20, 17, 0.9);
-            backdrop-filter: blur(20px);
-            border-bottom: 1px solid var(--sage-100);
-            padding: 1rem 2rem;
-            position: sticky;
-            top: 0;
-            z-index: 100;
-        }}
-
-        .header-content {{
-            max-width: 900px;
-            margin: 0 auto;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }}
-
-        .back-link {{
-            display: flex;
-            align-items: center;
-            gap: 8px;
-            text-decoration: none;
-            color: var(--text-secondary);
-            font-weight: 500;
-            transition: color 0.2s;
-        }}
-
-        .back-link:hover {{
-            color: var(--sage-600);
-        }}
-
-        .back-link svg {{
-            width: 20px;
-            height: 20px;
-        }}
-
-        .logo {{
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }}
-
-        .logo-icon {{
-            width: 36px;
-            height: 36px;
-            background: linear-gradient(135deg, var(--sage-500), var(--sage-600));
-            border-radius: var(--radius-sm);
-            display: flex;
-            align-items: center;
-            justify-content: center;
-        }}
-
-        .logo-icon svg {{
-            width: 20px;
-            height: 20px;
-            color: white;
-        }}
-
-        .logo-text {{
-            font-size: 1.25rem;
-            font-weight: 600;
-            color: var(--sage-700);
-        }}
-
-        main {{
-            max-width: 900px;
-            margin: 0 auto;
-            padding: 2rem;
-        }}
-
-        .page-header {{
-            text-align: center;
-            margin-bottom: 2rem;
-        }}
-
-        .tool-badge {{
-            display: inline-flex;
-            align-items: center;
-            gap: 8px;
-            background: var(--accent-lavender-light);
-            color: var(--accent-lavender);
-            padding: 0.5rem 1rem;
-            border-radius: 100px;
-            font-size: 0.85rem;
-            font-weight: 600;
-            margin-bottom: 1rem;
-        }}
-
-        .tool-badge svg {{
-            width: 16px;
-            height: 16px;
-        }}
-
-        .page-header h1 {{
-            font-family: 'Source Serif 4', serif;
-            font-size: 2.25rem;
-            font-weight: 600;
-            color: var(--sage-800);
-            margin-bottom: 0.5rem;
-        }}
-
-        .page-header p {{
-            color: var(--text-muted);
-            font-size: 1.05rem;
-        }}
-
-        .digest-meta {{
-            display: flex;
-            justify-content: center;
-            gap: 2rem;
-            margin-top: 1rem;
-            font-size: 0.9rem;
-            color: var(--text-muted);
-        }}
-
-        .digest-meta span {{
-            display: flex;
-            align-items: center;
-            gap: 6px;
-        }}
-
-        .digest-meta svg {{
-            width: 16px;
-            height: 16px;
-        }}
-
-        .digest-content {{
-            background: var(--surface-raised);
-            border: 1px solid var(--sage-100);
-            border-radius: var(--radius-lg);
-            padding: 2.5rem;
-            box-shadow: var(--shadow-sm);
-        }}
-
-        .digest-content h1 {{
-            font-family: 'Source Serif 4', serif;
-            font-size: 1.75rem;
-            font-weight: 600;
-            color: var(--sage-800);
-            margin-bottom: 1.5rem;
-            padding-bottom: 1rem;
-            border-bottom: 2px solid var(--sage-100);
-        }}
-
-        .digest-content h2 {{
-            font-size: 1.2rem;
-            font-weight: 600;
-            color: var(--sage-700);
-            margin-top: 2.5rem;
-            margin-bottom: 1rem;
-            padding-bottom: 0.5rem;
-            border-bottom: 1px solid var(--sage-100);
-        }}
-
-        .digest-content h3 {{
-            font-size: 1.05rem;
-            font-weight: 600;
-            color: var(--sage-600);
-            margin-top: 1.5rem;
-            margin-bottom: 0.5rem;
-        }}
-        
-        .digest-content h4 {{
-            font-size: 0.95rem;
-            font-weight: 600;
-            color: var(--sage-600);
-            margin-top: 1.25rem;
-            margin-bottom: 0.5rem;
-        }}
-
-        .digest-content p {{
-            margin-bottom: 1rem;
-            line-height: 1.7;
-        }}
-
-        .digest-content ul, .digest-content ol {{
-            margin-bottom: 1rem;
-            padding-left: 1.5rem;
-        }}
-
-        .digest-content li {{
-            margin-bottom: 0.5rem;
-            line-height: 1.6;
-        }}
-
-        .digest-content a {{
-            color: var(--accent-lavender);
-            text-decoration: none;
-            word-break: break-word;
-        }}
-
-        .digest-content a:hover {{
-            text-decoration: underline;
-        }}
-
-        .digest-content strong {{
-            color: var(--sage-700);
-        }}
-        
-        .digest-content em {{
-            color: var(--text-secondary);
-        }}
-
-        .digest-content blockquote {{
-            border-left: 3px solid var(--accent-lavender);
-            padding-left: 1rem;
-            margin: 1rem 0;
-            color: var(--text-secondary);
-            font-style: italic;
-        }}
-        
-        .digest-content hr {{
-            border: none;
-            border-top: 1px solid var(--sage-100);
-            margin: 2rem 0;
-        }}
-
-        .paywall-notice {{
-            color: #ef5350;
-            font-weight: 600;
-            font-size: 0.9rem;
-            background: rgba(239, 83, 80, 0.12);
-            padding: 0.25rem 0.5rem;
-            border-radius: 4px;
-            display: inline-block;
-            margin-top: 0.5rem;
-        }}
-
-        .open-access-badge {{
-            color: #66bb6a;
-            font-weight: 600;
-            font-size: 0.85rem;
-            background: rgba(102, 187, 106, 0.12);
-            padding: 0.2rem 0.5rem;
-            border-radius: 4px;
-            display: inline-block;
-        }}
-
-        .scan-summary {{ background: var(--sage-50); border: 1px solid var(--sage-100); border-radius: var(--radius-md); padding: 1.25rem 1.5rem; margin-bottom: 1.5rem; display: flex; flex-wrap: wrap; gap: 1.5rem; align-items: center; font-size: 0.9rem; color: var(--text-secondary); }}
-        .scan-summary .stat {{ display: flex; align-items: center; gap: 6px; }}
-        .scan-summary .stat strong {{ color: var(--sage-700); }}
-        .scan-summary svg {{ width: 16px; height: 16px; flex-shrink: 0; }}
-        .scan-summary .journals-toggle {{ color: var(--accent-lavender); cursor: pointer; font-weight: 500; text-decoration: underline dotted; text-underline-offset: 3px; background: none; border: none; font: inherit; padding: 0; }}
-        .scan-summary .journals-toggle:hover {{ color: var(--sage-700); }}
-        .journals-panel {{ max-height: 0; overflow: hidden; transition: max-height 0.35s ease, padding 0.35s ease, margin 0.35s ease; background: var(--surface-raised); border: 1px solid var(--sage-100); border-radius: var(--radius-md); margin-bottom: 0; padding: 0 1.5rem; }}
-        .journals-panel.open {{ max-height: 800px; padding: 1.25rem 1.5rem; margin-bottom: 1.5rem; }}
-        .journals-panel h3 {{ font-size: 0.95rem; font-weight: 600; color: var(--sage-700); margin-bottom: 0.75rem; }}
-        .journal-grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(260px, 1fr)); gap: 0.5rem; margin-bottom: 1rem; }}
-        .journal-chip {{ display: flex; align-items: center; gap: 8px; padding: 0.4rem 0.75rem; background: var(--sage-50); border: 1px solid var(--sage-100); border-radius: 6px; font-size: 0.85rem; }}
-        .journal-chip .abbr {{ font-weight: 600; color: var(--accent-lavender); font-size: 0.75rem; min-width: 48px; }}
-        .suggest-box {{ border-top: 1px solid var(--sage-100); padding-top: 1rem; margin-top: 0.5rem; }}
-        .suggest-box label {{ display: block; font-size: 0.85rem; font-weight: 500; color: var(--text-secondary); margin-bottom: 0.5rem; }}
-        .suggest-row {{ display: flex; gap: 0.5rem; }}
-        .suggest-row input {{ flex: 1; padding: 0.5rem 0.75rem; border: 1px solid var(--sage-200); border-radius: 6px; font: inherit; font-size: 0.85rem; outline: none; background: var(--surface); color: var(--text-primary); }}
-        .suggest-row input:focus {{ border-color: var(--accent-lavender); }}
-        .suggest-row button {{ padding: 0.5rem 1rem; background: var(--sage-600); color: white; border: none; border-radius: 6px; font: inherit; font-size: 0.85rem; font-weight: 500; cursor: pointer; white-space: nowrap; }}
-        .suggest-row button:hover {{ background: var(--sage-700); }}
-        .suggest-results {{ margin-top: 0.5rem; font-size: 0.85rem; }}
-        .suggest-results .result-item {{ display: flex; justify-content: space-between; align-items: center; padding: 0.4rem 0.75rem; background: var(--sage-50); border: 1px solid var(--sage-100); border-radius: 6px; margin-bottom: 0.35rem; }}
-        .suggest-results .result-item .add-btn {{ background: var(--accent-lavender); color: white; border: none; border-radius: 4px; padding: 0.2rem 0.6rem; font-size: 0.8rem; font-weight: 500; cursor: pointer; }}
-        .suggest-status {{ margin-top: 0.5rem; padding: 0.5rem 0.75rem; border-radius: 6px; font-size: 0.85rem; display: none; }}
-        .suggest-status.success {{ display: block; background: rgba(102, 187, 106, 0.12); color: #66bb6a; }}
-        .suggest-status.error {{ display: block; background: rgba(239, 83, 80, 0.12); color: #ef5350; }}
-
-        .archive-link {{
-            text-align: center;
-            margin-top: 2rem;
-            padding-top: 1.5rem;
-            border-top: 1px solid var(--sage-100);
-        }}
-
-        .archive-link a {{
-            color: var(--accent-lavender);
-            text-decoration: none;
-            font-weight: 500;
-        }}
-
-        .archive-link a:hover {{
-            text-decoration: underline;
-        }}
-
-        footer {{
-            max-width: 900px;
-            margin: 3rem auto 0;
-            padding: 2rem;
-            text-align: center;
-            color: var(--text-muted);
-            font-size: 0.9rem;
-            border-top: 1px solid var(--sage-100);
-        }}
-
-        @media (max-width: 768px) {{
-            main {{
-                padding: 1rem;
-            }}
-
-            .digest-content {{
-                padding: 1.5rem;
-            }}
-
-            .page-header h1 {{
-                font-size: 1.75rem;
-            }}
-
-            .digest-meta {{
-                flex-direction: column;
-                gap: 0.5rem;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="bg-gradient"></div>
-
-    <header>
-        <div class="header-content">
-            <a href="../index.html" class="back-link">
-                <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
-                    <path d="M19 12H5M12 19l-7-7 7-7"/>
-                </svg>
-                Back to Dashboard
-            </a>
-            <div class="logo">
-                <div class="logo-icon">
-                    <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
-                        <path d="M12 2L2 7l10 5 10-5-10-5z"/>
-                        <path d="M2 17l10 5 10-5"/>
-                        <path d="M2 12l10 5 10-5"/>
-                    </svg>
-                </div>
-                <span class="logo-text">Sage</span>
-            </div>
-        </div>
-    </header>
-
-    <main>
-        <div class="page-header">
-            <div class="tool-badge">
-                <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
-                    <path d="M4 19.5A2.5 2.5 0 0 1 6.5 17H20"/>
-                    <path d="M6.5 2H20v20H6.5A2.5 2.5 0 0 1 4 19.5v-15A2.5 2.5 0 0 1 6.5 2z"/>
-                </svg>
-                Literature Monitor
-            </div>
-            <h1>Bi-Weekly Literature Digest</h1>
-            <p>Pediatric ID &amp; Antimicrobial Stewardship</p>
-            <div class="digest-meta">
-                <span>
-                    <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
-                        <rect x="3" y="4" width="18" height="18" rx="2" ry="2"/>
-                        <line x1="16" y1="2" x2="16" y2="6"/>
-                        <line x1="8" y1="2" x2="8" y2="6"/>
-                        <line x1="3" y1="10" x2="21" y2="10"/>
-                    </svg>
-                    {digest_data['date_range']}
-                </span>
-                <span>
-                    <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
-                        <circle cx="12" cy="12" r="10"/>
-                        <polyline points="12 6 12 12 16 14"/>
-                    </svg>
-                    Generated {datetime.now().strftime('%B %d, %Y')}
-                </span>
-            </div>
-        </div>
-
-        <div class="scan-summary">
-            <span class="stat">
-                <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><rect x="3" y="4" width="18" height="18" rx="2"/><line x1="16" y1="2" x2="16" y2="6"/><line x1="8" y1="2" x2="8" y2="6"/><line x1="3" y1="10" x2="21" y2="10"/></svg>
-                <strong>14-day window</strong> {digest_data['date_range']}
-            </span>
-            <span class="stat">
-                <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M4 19.5A2.5 2.5 0 0 1 6.5 17H20"/><path d="M6.5 2H20v20H6.5A2.5 2.5 0 0 1 4 19.5v-15A2.5 2.5 0 0 1 6.5 2z"/></svg>
-                <button class="journals-toggle" onclick="toggleJournals()"><strong>{len(JOURNAL_LIST)} journals</strong> scanned</button>
-            </span>
-            <span class="stat">
-                <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M14 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2V8z"/><polyline points="14 2 14 8 20 8"/></svg>
-                <strong>{total} articles</strong> reviewed
-            </span>
-            <span class="stat">
-                <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M12 22s8-4 8-10V5l-8-3-8 3v7c0 6 8 10 8 10z"/></svg>
-                <strong>{oa} open access</strong> &middot; {pw} paywalled
-            </span>
-        </div>
-
-        <div class="journals-panel" id="journalsPanel">
-            <h3>Journals Searched</h3>
-            <div class="journal-grid">
-                {journal_chips}
-            </div>
-            <div class="suggest-box">
-                <label>Suggest a journal to add to the scan list</label>
-                <div class="suggest-row">
-                    <input type="text" id="journalSearch" placeholder="Search PubMed journals..." oninput="searchJournals(this.value)">
-                    <button id="searchBtn" onclick="searchJournals(document.getElementById('journalSearch').value)">Search</button>
-                </div>
-                <div class="suggest-results" id="suggestResults"></div>
-                <div class="suggest-status" id="suggestStatus"></div>
-            </div>
-        </div>
-
-        <div class="digest-content" id="digestContent">
-            {markdown_to_html(digest_data['content'])}
-        </div>
-
-        <div class="archive-link">
-            <a href="archive.html">View Past Digests &rarr;</a>
-        </div>
-    </main>
-
-    <footer>
-        <p>Sage Project &middot; Literature Monitor &middot; Bi-weekly digest for pediatric ID specialists</p>
-    </footer>
-
-    <script>
-    function toggleJournals() {{
-        document.getElementById('journalsPanel').classList.toggle('open');
-    }}
-    let searchTimeout = null;
-    function searchJournals(query) {{
-        clearTimeout(searchTimeout);
-        const results = document.getElementById('suggestResults');
-        const status = document.getElementById('suggestStatus');
-        status.className = 'suggest-status';
-        if (!query || query.length < 3) {{ results.innerHTML = ''; return; }}
-        searchTimeout = setTimeout(async () => {{
-            results.innerHTML = '<span style="color:var(--text-muted)">Searching medical journals...</span>';
-            try {{
-                const searchUrl = `https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi?db=nlmcatalog&term=${{encodeURIComponent(query)}}[Title]+AND+serial[tp]&retmax=10&retmode=json`;
-                const resp = await fetch(searchUrl);
-                const data = await resp.json();
-                const ids = data.esearchresult?.idlist || [];
-                if (!ids.length) {{ results.innerHTML = '<span style="color:var(--text-muted)">No journals found. Try a shorter name.</span>'; return; }}
-                const sUrl = `https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi?db=nlmcatalog&id=${{ids.join(',')}}&retmode=json`;
-                const sResp = await fetch(sUrl);
-                const sData = await sResp.json();
-                let html = '';
-                for (const id of ids) {{
-                    const item = sData.result?.[id];
-                    if (!item) continue;
-                    const te = (item.titlemainlist || [])[0];
-                    const title = (te?.title || item.medlineta || 'Unknown').replace(/\\.$/, '');
-                    const abbr = item.medlineta || '';
-                    html += `<div class="result-item"><span class="journal-name">${{title}}${{abbr && abbr !== title ? ' <em style="color:var(--text-muted);font-size:0.8rem">(' + abbr + ')</em>' : ''}}</span><button class="add-btn" onclick="suggestJournal(this, '${{title.replace(/'/g, "\\\\'")}}', '${{abbr.replace(/'/g, "\\\\'")}}')">+ Add</button></div>`;
-                }}
-                results.innerHTML = html || '<span style="color:var(--text-muted)">No journals found.</span>';
-            }} catch (e) {{
-                results.innerHTML = '<span style="color:#c41e3a">Search failed.</span>';
-            }}
-        }}, 400);
-    }}
-    function suggestJournal(btn, title, abbr) {{
-        const status = document.getElementById('suggestStatus');
-        const suggestions = JSON.parse(localStorage.getItem('sage_journal_suggestions') || '[]');
-        if (suggestions.some(s => s.title === title)) {{
-            status.textContent = `"${{title}}" already suggested.`;
-            status.className = 'suggest-status error';
-            return;
-        }}
-        suggestions.push({{ title, abbr, suggested_at: new Date().toISOString() }});
-        localStorage.setItem('sage_journal_suggestions', JSON.stringify(suggestions));
-        btn.outerHTML = '<span class="added">Added</span>';
-        status.textContent = `"${{title}}" queued — will be included in the next digest run after review.`;
-        status.className = 'suggest-status success';
-    }}
-    </script>
-</body>
-</html>'''
-    
-    # Save the HTML page
-    with open("literature-monitor/index.html", "w", encoding="utf-8") as f:
-        f.write(html_content)
-    print("Updated literature-monitor/index.html")
+def _date(text):
+    return datetime.strptime(text, "%Y-%m-%d")
 
 
 if __name__ == "__main__":
+    import argparse
+
     _configure_stdio_utf8()
 
-    # Generate the digest
-    digest_content = generate_digest()
+    parser = argparse.ArgumentParser(description="Generate the bi-weekly literature digest.")
+    parser.add_argument("--backfill", nargs=2, type=_date, metavar=("START", "END"),
+                        help="generate a digest for every 14-day window from START to END "
+                             "(YYYY-MM-DD), then exit")
+    parser.add_argument("--backfill-records", action="store_true",
+                        help="extract article records for every saved digest, then exit")
+    parser.add_argument("--workers", type=int,
+                        help=f"windows generated at once for --backfill (default {BACKFILL_WORKERS}), "
+                             f"or extraction requests for --backfill-records (default {EXTRACTION_WORKERS})")
+    parser.add_argument("--rpm", type=int, default=REQUESTS_PER_MINUTE,
+                        help="model requests per minute, shared by all workers")
+    parser.add_argument("--no-ingest", action="store_true",
+                        help="do not update the candidate corpus before generating")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help=f"continue an interrupted run from its checkpoint in {RUNS_DIR}")
+    args = parser.parse_args()
+
+    rate_limiter = RateLimiter(args.rpm)
+
+    if args.backfill_records:
+        added = backfill_article_records(workers=args.workers or EXTRACTION_WORKERS)
+        print(f"\n✅ Backfill complete: {added} new articles in memory")
+        sys.exit(0)
+
+    if args.backfill:
+        windows = backfill_windows(*args.backfill)
+        if not args.no_ingest:
+            update_corpus(since=windows[0].start if windows else None)
+        print(f"Backfilling {len(windows)} windows, {args.workers or BACKFILL_WORKERS} at a time...")
+        failed = backfill_digests(windows, workers=args.workers or BACKFILL_WORKERS)
+        print(f"\n{'❌' if failed else '✅'} Backfill complete: "
+              f"{len(windows) - len(failed)} of {len(windows)} digests saved")
+        sys.exit(1 if failed else 0)
+
+    if args.resume:
+        run = digest_runs.Run.resume(RUNS_DIR, args.resume)
+        window = Window.from_json(run.state["window"])
+        print(f"Resuming run {run.run_id} after {run.state['segments']} segments...")
+    else:
+        run = None
+        window = Window(datetime.now())
+        if not args.no_ingest:
+            update_corpus()
+
+    # Generate the digest, downloading PDFs as the reviews link them
+    pdfs = pdf_queue(window)
+    try:
+        digest_content, run = generate_digest(window, run, pdfs)
+    except Exception:
+        pdfs.results()
+        raise
 
     # Save the digest (JSON and HTML)
-    save_digest(digest_content)
+    save_digest(digest_content, window)
 
     # Download PDFs for open access articles
     print("\n" + "="*50)
     print("Downloading open access PDFs...")
     print("="*50)
-    downloaded_pdfs = download_all_pdfs(digest_content)
+    downloaded_pdfs = download_all_pdfs(digest_content, window, pdfs)
     print(f"\nDownloaded {len(downloaded_pdfs)} PDFs")
 
+    run.finish()
+
     print("\n✅ Bi-weekly digest generation complete!")
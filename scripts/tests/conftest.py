@@ -0,0 +1,97 @@
+"""Shared fixtures for the digest scripts' tests.
+
+The scripts run as `python scripts/<name>.py`, so their sibling modules
+import by bare name; the tests put scripts/ on the path the same way.
+Nothing here talks to the network — HTTP tests use a local server.
+"""
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+class Route:
+    """One canned response. `delay` is seconds before the body is sent."""
+
+    def __init__(self, body=b'', status=200, headers=None, delay=0.0):
+        self.body = body
+        self.status = status
+        self.headers = headers or {}
+        self.delay = delay
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # clients that hang up early (size caps, aborted downloads) are expected
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class StubServer:
+    """A threaded local HTTP server serving canned routes, logging requests."""
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append((self.path, dict(self.headers)))
+                    server.active += 1
+                    server.peak = max(server.peak, server.active)
+                try:
+                    # a route without a query string serves any query
+                    route = server.routes.get(self.path, server.routes.get(self.path.split('?')[0]))
+                    if callable(route):
+                        route = route(self)
+                    if route is None:
+                        route = Route(b'not found', status=404)
+                    time.sleep(route.delay)
+                    self.send_response(route.status)
+                    headers = {'Content-Length': str(len(route.body)), **route.headers}
+                    for k, v in headers.items():
+                        self.send_header(k, v)
+                    self.end_headers()
+                    self.wfile.write(route.body)
+                finally:
+                    with server._lock:
+                        server.active -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = _QuietServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    s = StubServer()
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def route():
+    return Route
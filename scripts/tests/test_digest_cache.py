@@ -0,0 +1,31 @@
+import json
+
+from digest_cache import JsonCache, cache_key
+
+
+def test_key_depends_on_every_part():
+    base = cache_key(1, 'model', 'prompt', 'digest')
+    assert cache_key(1, 'model', 'prompt', 'digest') == base
+    assert cache_key(2, 'model', 'prompt', 'digest') != base
+    assert cache_key(1, 'other', 'prompt', 'digest') != base
+    assert cache_key(1, 'model', 'prompt!', 'digest') != base
+    assert cache_key(1, 'model', 'prompt', 'digest ') != base
+    # moving text across a boundary is a different key
+    assert cache_key('ab', 'c') != cache_key('a', 'bc')
+
+
+def test_round_trip_and_unreadable_entries(tmp_path):
+    cache = JsonCache(tmp_path / 'cache')
+    key = cache_key('digest')
+    assert cache.get(key) is None
+
+    records = [{'title': 'Nirsevimab and RSV admissions', 'topics': ['rsv']}]
+    cache.put(key, records)
+    assert cache.get(key) == records
+    assert JsonCache(tmp_path / 'cache').get(key) == records
+    assert not list((tmp_path / 'cache').rglob('*.tmp'))
+
+    cache._path(key).write_text('[{"title": "cut sho', encoding='utf-8')
+    assert cache.get(key) is None
+    cache.put(key, records)
+    assert json.loads(cache._path(key).read_text(encoding='utf-8')) == records
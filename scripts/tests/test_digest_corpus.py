@@ -0,0 +1,133 @@
+import json
+from datetime import date, timedelta
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip('requests')
+
+import digest_corpus  # noqa: E402
+from digest_corpus import Corpus, Source  # noqa: E402
+
+FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:prism="http://prismstandard.org/namespaces/basic/2.0/"
+     xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel><title>PIDJ - Published Ahead-of-Print</title>
+<item>
+  <title>Nirsevimab Effectiveness Against RSV
+    Hospitalization</title>
+  <link>https://journals.lww.com/pidj/fulltext/2026/08000/nirsevimab.1.aspx</link>
+  <prism:doi>10.1097/INF.0000000000005045</prism:doi>
+  <pubDate>Wed, 05 Aug 2026 00:00:00 GMT</pubDate>
+</item>
+<item>
+  <title>Duration of Bacteremia in Children With Osteomyelitis</title>
+  <link>https://journals.lww.com/pidj/fulltext/2026/08000/bacteremia.2.aspx</link>
+  <dc:date>2026-07-20</dc:date>
+</item>
+</channel></rss>"""
+
+
+def test_feed_is_fetched_conditionally(server, route, tmp_path):
+    def feed(handler):
+        if handler.headers.get('If-None-Match') == '"v1"':
+            return route(status=304)
+        return route(FEED, headers={'ETag': '"v1"', 'Content-Type': 'application/rss+xml'})
+
+    server.routes['/pidj.rss'] = feed
+    corpus = Corpus(tmp_path / 'corpus.sqlite')
+    source = Source('PIDJ', rss=f'{server.url}/pidj.rss')
+
+    assert digest_corpus.ingest(corpus, [source]) == {'PIDJ:rss': 2}
+    assert digest_corpus.ingest(corpus, [source]) == {'PIDJ:rss': 0}
+    assert [h.get('If-None-Match') for _, h in server.requests] == [None, '"v1"']
+
+    first, second = corpus.between('2026-07-01', '2026-08-31')
+    assert first['title'] == 'Nirsevimab Effectiveness Against RSV Hospitalization'
+    assert (first['doi'], first['published']) == ('10.1097/inf.0000000000005045', '2026-08-05')
+    assert (second['doi'], second['published']) == ('', '2026-07-20')
+    assert corpus.between('2026-08-01', '2026-08-31') == [first]
+    assert corpus.cursor('PIDJ:rss')['last_seen'] == '2026-08-05'
+
+
+def test_pubmed_is_read_from_the_cursor_and_deduplicated_by_doi(server, route, tmp_path):
+    searches = []
+
+    def esearch(handler):
+        query = parse_qs(urlparse(handler.path).query)
+        searches.append((query['term'][0], query['mindate'][0], query['maxdate'][0]))
+        return route(json.dumps({'esearchresult': {'idlist': ['41803094', '41800001']}}).encode())
+
+    server.routes['/esearch.fcgi'] = esearch
+    server.routes['/esummary.fcgi'] = route(json.dumps({'result': {
+        'uids': ['41803094', '41800001'],
+        '41803094': {'title': 'Nirsevimab Effectiveness Against RSV Hospitalization',
+                     'fulljournalname': 'The Pediatric infectious disease journal',
+                     'sortpubdate': '2026/08/05 00:00',
+                     'articleids': [{'idtype': 'pubmed', 'value': '41803094'},
+                                    {'idtype': 'doi', 'value': '10.1097/INF.0000000000005045'}]},
+        '41800001': {'title': 'Clindamycin for Invasive GAS in Children',
+                     'source': 'Pediatr Infect Dis J', 'sortpubdate': '2026/08/01 00:00',
+                     'articleids': []},
+    }}).encode())
+
+    corpus = Corpus(tmp_path / 'corpus.sqlite')
+    corpus.add({'title': 'Nirsevimab Effectiveness Against RSV Hospitalization',
+                'doi': 'https://doi.org/10.1097/INF.0000000000005045',
+                'url': 'https://journals.lww.com/pidj/x', 'published': '2026-08-05'}, 'PIDJ:rss')
+    source = Source('PIDJ', pubmed='Pediatr Infect Dis J')
+    today = date.today()
+
+    assert digest_corpus.ingest(corpus, [source], base=server.url, interval=0) == {'PIDJ:pubmed': 1}
+    digest_corpus.ingest(corpus, [source], base=server.url, interval=0,
+                         since=today - timedelta(days=90))
+    digest_corpus.ingest(corpus, [source], base=server.url, interval=0)
+
+    day = lambda d: d.isoformat().replace('-', '/')  # noqa: E731
+    assert searches == [
+        ('"Pediatr Infect Dis J"[ta]', day(today - timedelta(days=digest_corpus.FIRST_DAYS)), day(today)),
+        ('"Pediatr Infect Dis J"[ta]', day(today - timedelta(days=90)), day(today)),
+        ('"Pediatr Infect Dis J"[ta]', day(today), day(today)),
+    ]
+    assert len(corpus) == 2
+    nirsevimab = corpus.between('2026-08-05', '2026-08-05')[0]
+    # the feed's copy, filled in with the PMID PubMed knows it by
+    assert (nirsevimab['pmid'], nirsevimab['url']) == ('41803094', 'https://journals.lww.com/pidj/x')
+
+
+def test_every_listed_journal_has_a_pubmed_title():
+    digest_site = pytest.importorskip('digest_site')
+    assert [abbr for abbr, _ in digest_site.JOURNAL_LIST] == list(digest_corpus.JOURNALS)
+
+
+def test_pubmed_is_read_page_by_page(server, route, tmp_path, monkeypatch):
+    monkeypatch.setattr(digest_corpus, 'RETMAX', 2)
+    ids = ['41800001', '41800002', '41800003']
+    served = {'count': str(len(ids))}
+    starts = []
+
+    def esearch(handler):
+        start = int(parse_qs(urlparse(handler.path).query)['retstart'][0])
+        starts.append(start)
+        page = ids[start:start + 2] if served['count'] == str(len(ids)) else []
+        return route(json.dumps({'esearchresult': {'count': served['count'], 'idlist': page}}).encode())
+
+    def esummary(handler):
+        uids = parse_qs(urlparse(handler.path).query)['id'][0].split(',')
+        return route(json.dumps({'result': {'uids': uids, **{
+            uid: {'title': f'Article {uid}', 'sortpubdate': '2026/08/01 00:00'} for uid in uids}}}).encode())
+
+    server.routes['/esearch.fcgi'] = esearch
+    server.routes['/esummary.fcgi'] = esummary
+    corpus = Corpus(tmp_path / 'corpus.sqlite')
+    source = Source('CID', pubmed='Clin Infect Dis')
+
+    assert digest_corpus.ingest(corpus, [source], base=server.url, interval=0) == {'CID:pubmed': 3}
+    assert starts == [0, 2]
+    assert corpus.cursor('CID:pubmed')['last_seen'] == date.today().isoformat()
+
+    # pages that stop short of the count leave the cursor where it was
+    corpus.set_cursor('CID:pubmed', last_seen='2026-08-01')
+    served['count'] = '5'
+    assert digest_corpus.ingest(corpus, [source], base=server.url, interval=0) == {}
+    assert corpus.cursor('CID:pubmed')['last_seen'] == '2026-08-01'
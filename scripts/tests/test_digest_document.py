@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+
+from digest_document import parse
+
+DIGESTS = Path(__file__).resolve().parents[2] / 'literature-monitor' / 'digests'
+
+DIGEST = """# 📚 Literature Digest
+
+## 🚨 Practice-Changing / Action Required
+
+**Nirsevimab Effectiveness Against RSV Hospitalization**
+*The Pediatric Infectious Disease Journal, June 2026* | [PubMed](https://pubmed.ncbi.nlm.nih.gov/41803094/)
+**PDF:** https://example.org/nirsevimab.pdf
+- **Access:** OPEN ACCESS
+- **Design:** Test-negative case-control study, n=1,242 infants across 22 sites
+- **DOI:** [https://doi.org/10.1097/INF.0000000000005045](https://doi.org/10.1097/INF.0000000000005045).
+
+**Bottom line:** not an article of its own.
+
+---
+
+## 🦠 Pediatric ID Studies
+
+### 2. **Duration of Bacteremia in Children**
+*Clinical Infectious Diseases, July 2026*
+Retrospective cohort of 402 children.
+[PAYWALL: Abstract only reviewed]
+
+### Methodological Note
+Nothing here is a paper.
+"""
+
+
+def test_parses_articles_and_their_fields():
+    doc = parse(DIGEST)
+    assert [s.title for s in doc.sections] == [
+        '🚨 Practice-Changing / Action Required', '🦠 Pediatric ID Studies']
+    first, second = doc.articles
+    assert first.title == 'Nirsevimab Effectiveness Against RSV Hospitalization'
+    assert first.journal == 'The Pediatric Infectious Disease Journal'
+    assert first.doi == '10.1097/inf.0000000000005045'
+    assert first.pmid == '41803094'
+    assert first.pdf_url == 'https://example.org/nirsevimab.pdf'
+    assert (first.access, first.n) == ('open', 1242)
+    assert first.design.startswith('Test-negative')
+    # the article runs up to the rule, taking the bold call-out with it
+    assert doc.lines[first.end].kind == 'hr'
+
+    assert second.title == 'Duration of Bacteremia in Children'
+    assert (second.access, second.doi, second.pdf_url) == ('paywalled', '', '')
+    assert doc.counts() == (2, 1, 1)
+    assert first.record() == {'title': first.title, 'doi': first.doi, 'pmid': '41803094',
+                              'journal': 'The Pediatric Infectious Disease Journal'}
+
+
+def test_every_archived_digest_parses():
+    for path in sorted(DIGESTS.glob('????-??-??.json')):
+        content = json.loads(path.read_text(encoding='utf-8'))['content']
+        doc = parse(content)
+        assert len(doc.lines) == content.count('\n') + 1
+        for article in doc.articles:
+            assert article.title and article.start < article.end
+            assert article.access in ('', 'open', 'paywalled')
+            assert not article.pdf_url or article.pdf_url.startswith('http')
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+import digest_manifest
+from digest_document import parse
+from digest_manifest import ManifestError
+
+DIGEST = """# 📚 Literature Digest
+
+## 🦠 Pediatric ID Studies
+
+**Nirsevimab Effectiveness Against RSV Hospitalization**
+*The Pediatric Infectious Disease Journal, June 2026* | https://doi.org/10.1097/INF.0000000000005045
+- **Access:** OPEN ACCESS
+
+**Duration of Bacteremia in Children With Osteomyelitis**
+*Clinical Infectious Diseases, July 2026*
+[PAYWALL: Abstract only reviewed]
+"""
+
+ENTRIES = [
+    {'title': 'Nirsevimab effectiveness against RSV hospitalization', 'doi': '',
+     'journal': 'PIDJ', 'topics': ['rsv', 'nirsevimab', ' '], 'key_finding': 'It works.',
+     'study_type': 'case-control'},
+    {'title': 'Something else', 'doi': '10.1093/cid/ciag411', 'study_type': 'trial'},
+    {'title': 'Duration of Bacteremia in Children With Osteomyelitis', 'topics': []},
+]
+
+
+def with_manifest(entries):
+    return DIGEST + '\n```json digest-manifest\n' + json.dumps(entries) + '\n```\n'
+
+
+def test_split_removes_the_block():
+    text, body = digest_manifest.split(with_manifest(ENTRIES))
+    assert text == DIGEST
+    assert json.loads(body) == ENTRIES
+    assert digest_manifest.split(DIGEST) == (DIGEST, None)
+    # cut off before the closing fence
+    text, body = digest_manifest.split(DIGEST + '\n```json digest-manifest\n[{"title": "Nirse')
+    assert (text, body) == (DIGEST, '')
+
+
+def test_records_match_the_articles_kept():
+    _, body = digest_manifest.split(with_manifest(ENTRIES))
+    articles = parse(DIGEST).articles
+    first, second = digest_manifest.records(body, articles)
+    # the digest's title and DOI win; the manifest fills in the rest
+    assert first['title'] == 'Nirsevimab Effectiveness Against RSV Hospitalization'
+    assert first['doi'] == '10.1097/inf.0000000000005045'
+    assert (first['journal'], first['topics'], first['study_type']) == (
+        'PIDJ', ['rsv', 'nirsevimab'], 'case-control')
+    assert (second['journal'], second['study_type']) == ('Clinical Infectious Diseases', 'other')
+
+    # an article dropped as a repeat needs no entry, and its entry is unused
+    assert len(digest_manifest.records(body, articles[1:])) == 1
+
+
+@pytest.mark.parametrize('body', [
+    '',
+    '{"title": "x"}',
+    'not json',
+    json.dumps([{'doi': '10.1/x'}]),
+    json.dumps([{'title': 'x', 'topics': 'rsv'}]),
+    json.dumps(ENTRIES[:1]),        # the second article has no entry
+])
+def test_invalid_manifests_are_rejected(body):
+    with pytest.raises(ManifestError):
+        digest_manifest.records(body, parse(DIGEST).articles)
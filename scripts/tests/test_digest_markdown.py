@@ -0,0 +1,56 @@
+"""The renderer against golden pages for every archived digest.
+
+The golden files under golden/markdown/ are the pages the regex
+pipeline produced before the single-pass renderer replaced it, with
+links whose text is a URL no longer double-wrapped. After a deliberate
+change to the output, regenerate them with
+
+    UPDATE_GOLDEN=1 python -m pytest scripts/tests/test_digest_markdown.py
+
+and review the diff.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from digest_markdown import markdown_to_html
+
+DIGESTS = Path(__file__).resolve().parents[2] / 'literature-monitor' / 'digests'
+GOLDEN = Path(__file__).resolve().parent / 'golden' / 'markdown'
+
+
+@pytest.mark.parametrize('path', sorted(DIGESTS.glob('????-??-??.json')), ids=lambda p: p.stem)
+def test_matches_golden(path):
+    html = markdown_to_html(json.loads(path.read_text(encoding='utf-8'))['content'])
+    golden = GOLDEN / f'{path.stem}.html'
+    if os.environ.get('UPDATE_GOLDEN'):
+        golden.write_bytes(html.encode('utf-8'))
+    assert golden.exists(), f'no golden page for {path.name}; run with UPDATE_GOLDEN=1'
+    assert html == golden.read_bytes().decode('utf-8')
+
+
+def test_badges_links_and_blocks():
+    text = (
+        '*Pediatrics* | see https://example.org/a?b=1&c=2\n'
+        'second line\n'
+        '\n'
+        '---\n'
+        '\n'
+        '### 1. Nirsevimab & RSV <2 years\n'
+        '- **Access:** OPEN ACCESS\n'
+        '- [PAYWALL: Abstract only reviewed]\n'
+        '- **DOI:** [https://doi.org/10.1/x](https://doi.org/10.1/x)'
+    )
+    assert markdown_to_html(text) == (
+        '<p><em>Pediatrics</em> | see <a href="https://example.org/a?b=1&amp;c=2" target="_blank" '
+        'rel="noopener">https://example.org/a?b=1&amp;c=2</a><br>second line</p>\n'
+        '<hr>\n'
+        '<h3>1. Nirsevimab &amp; RSV &lt;2 years</h3>\n'
+        '<ul><li><strong>Access:</strong> <span class="open-access-badge">OPEN ACCESS</span></li>\n'
+        '<li><span class="paywall-notice">PAYWALL: Abstract only reviewed</span></li>\n'
+        '<li><strong>DOI:</strong> <a href="https://doi.org/10.1/x" target="_blank" rel="noopener">'
+        'https://doi.org/10.1/x</a></li></ul>'
+    )
@@ -0,0 +1,56 @@
+import json
+
+import digest_memory
+
+
+def test_normalized_keys():
+    assert digest_memory.keys_of({'doi': 'https://doi.org/10.3390/Antibiotics14101011.',
+                                  'title': '**Severe Group A *Streptococcus* — in Children**'}) == [
+        'doi:10.3390/antibiotics14101011', 'title:severe group a streptococcus in children']
+    assert digest_memory.normalize_pmid('https://pubmed.ncbi.nlm.nih.gov/41234567/') == '41234567'
+    assert digest_memory.normalize_pmid('PMID: 41234567') == '41234567'
+
+
+def test_merges_and_survives_a_reload(tmp_path):
+    path = tmp_path / 'memory.jsonl'
+    m = digest_memory.Memory(path)
+    assert m.remember_text('*Antibiotics, October 11, 2025* | https://doi.org/10.3390/antibiotics14101011')
+    assert not m.add({'title': 'Priority Pediatric Stewardship Interventions',
+                      'doi': '10.3390/ANTIBIOTICS14101011', 'topics': ['delphi-consensus']})
+    m.mark_run()
+    m.save()
+
+    again = digest_memory.Memory(path)
+    assert len(again) == 1
+    assert again.seen(title='priority pediatric stewardship interventions')
+    assert again.articles[0]['topics'] == ['delphi-consensus']
+    assert again.last_run == m.last_run
+
+
+def test_nothing_is_truncated_and_a_torn_line_is_skipped(tmp_path):
+    path = tmp_path / 'memory.jsonl'
+    m = digest_memory.Memory(path)
+    for n in range(800):
+        m.add({'title': f'Article number {n}', 'doi': f'10.1000/{n}'})
+    m.save()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"id": 801, "title": "half a li')
+    again = digest_memory.Memory(path)
+    assert len(again) == 800
+    assert again.seen(doi='10.1000/0')
+
+
+def test_imports_legacy_json_once(tmp_path):
+    legacy = tmp_path / 'reviewed_articles.json'
+    legacy.write_text(json.dumps({
+        'reviewed_dois': [],
+        'reviewed_titles': ['Severe GAS in French Children', 'Severe GAS in French Children'],
+        'last_run': '2026-08-09T06:34:28',
+        'articles': [{'title': 'Severe GAS in French Children', 'doi': 'https://doi.org/10.1/x',
+                      'topics': ['gas']}],
+    }))
+    path = tmp_path / 'memory.jsonl'
+    m = digest_memory.open_memory(path, legacy=legacy)
+    assert len(m) == 1 and m.last_run == '2026-08-09T06:34:28'
+    assert path.exists()
+    assert len(digest_memory.open_memory(path, legacy=legacy)) == 1
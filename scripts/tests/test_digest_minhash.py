@@ -0,0 +1,64 @@
+import digest_memory
+import digest_minhash
+
+
+def test_variants_of_one_title_match():
+    index = digest_minhash.MinHashIndex()
+    index.add('fda', 'FDA Meningococcal Vaccine Expansion')
+    index.add('measles', 'Measles Outbreak in a Child Care Facility')
+    index.add('gas', 'Severe Group A Streptococcus Infections in French Children')
+
+    assert index.nearest('FDA Meningococcal Vaccine Expansion for Infants')[0] == 'fda'
+    assert index.nearest('Measles Outbreak in a Child Care Facility — Lubbock, Texas, March–April 2026')[0] == 'measles'
+    assert index.nearest('**Severe Group A Streptococcus Infections in French Children Study**')[0] == 'gas'
+    assert index.nearest('Nirsevimab Effectiveness Against RSV Hospitalization in Infants') is None
+
+
+def test_titles_are_not_matched_against_findings(tmp_path):
+    memory = digest_memory.Memory(tmp_path / 'm.jsonl')
+    memory.add({'title': 'Impact of mNGS on Antibiotic Management in Pediatric Sepsis',
+                'doi': '10.1/a', 'topics': ['mngs'],
+                'key_finding': 'Measles outbreak in child care was contained by vaccination.'})
+    memory.add({'title': 'PICO Questions and Recommendations for Practice'})       # a label, not a paper
+    index = digest_minhash.index_memory(memory)
+
+    assert index.match(title='Impact of mNGS on Antibiotic Management in Pediatric Sepsis Cohorts')
+    assert index.match(title='Measles outbreak in child care') is None
+    assert index.match(title='PICO Questions and Recommendations for Practice') is None
+
+
+def test_distinct_labels_name_each_paper_once(tmp_path):
+    memory = digest_memory.Memory(tmp_path / 'm.jsonl')
+    memory.add({'title': 'FDA Meningococcal Vaccine Expansion'})
+    memory.add({'title': 'Severe Group A Streptococcus Infections in French Children'})
+    memory.add({'title': 'FDA Meningococcal Vaccine Expansion for Infants'})
+    assert digest_minhash.distinct_labels(memory) == [
+        'Severe Group A Streptococcus Infections in French Children',
+        'FDA Meningococcal Vaccine Expansion for Infants',
+    ]
+
+
+def test_a_longer_title_extending_an_old_one_is_another_paper(tmp_path):
+    memory = digest_memory.Memory(tmp_path / 'm.jsonl')
+    memory.add({'title': 'Antimicrobial Stewardship in Pediatric Hospitals', 'doi': '10.1017/ash.2026.11'})
+    index = digest_minhash.index_memory(memory)
+
+    for title in ('Antimicrobial Stewardship in Pediatric Hospitals After COVID-19',
+                  'Impact of Antimicrobial Stewardship in Pediatric Hospitals on Resistance',
+                  'Antimicrobial Stewardship in Pediatric Hospitals: A Multicenter '
+                  'Cluster-Randomized Trial of Audit and Feedback'):
+        assert index.titles.query(title) == []
+        assert index.match(title=title) is None
+        assert index.repeat({'title': title}) is None
+
+
+def test_only_sure_repeats_are_deleted(tmp_path):
+    memory = digest_memory.Memory(tmp_path / 'm.jsonl')
+    memory.add({'title': 'FDA Meningococcal Vaccine Expansion', 'doi': '10.15585/mmwr.mm7512a1'})
+    index = digest_minhash.index_memory(memory)
+
+    variant = 'FDA Meningococcal Vaccine Expansion for Infants'
+    assert index.match(title=variant)                   # enough to skip at triage
+    assert index.repeat({'title': variant}) is None     # not to delete a written review
+    assert index.repeat({'title': variant, 'doi': 'https://doi.org/10.15585/MMWR.mm7512a1'})
+    assert index.repeat({'title': '**FDA Meningococcal Vaccine Expansion**'})
@@ -0,0 +1,174 @@
+import os
+import threading
+import time
+
+import digest_pdfs
+
+PDF = b'%PDF-1.7\n' + b'x' * 200_000 + b'\n%%EOF\n'
+
+
+def test_downloads_concurrently(server, route, tmp_path):
+    for n in range(6):
+        server.routes[f'/p{n}.pdf'] = route(PDF, headers={'Content-Type': 'application/pdf'}, delay=0.4)
+    articles = [(f'Article number {n}', f'{server.url}/p{n}.pdf') for n in range(6)]
+
+    t = time.perf_counter()
+    got = digest_pdfs.download_all(articles, tmp_path, workers=6, per_host=6)
+    elapsed = time.perf_counter() - t
+
+    assert [g['title'] for g in got] == [a[0] for a in articles]
+    assert all((tmp_path / digest_pdfs.safe_filename(t)).read_bytes() == PDF for t, _ in articles)
+    assert elapsed < 6 * 0.4 / 2          # nearer the slowest fetch than the sum
+    assert server.peak > 1
+
+
+def test_per_host_limit(server, route, tmp_path):
+    for n in range(6):
+        server.routes[f'/p{n}.pdf'] = route(PDF, delay=0.2)
+    articles = [(f'Article {n}', f'{server.url}/p{n}.pdf') for n in range(6)]
+    digest_pdfs.download_all(articles, tmp_path, workers=6, per_host=2)
+    assert server.peak <= 2
+
+
+def test_magic_bytes_not_content_type(server, route, tmp_path):
+    server.routes['/landing.pdf'] = route(b'<html>Sign in to read</html>',
+                                          headers={'Content-Type': 'application/pdf'})
+    server.routes['/octet'] = route(PDF, headers={'Content-Type': 'application/octet-stream'})
+    got = digest_pdfs.download_all([('A landing page', f'{server.url}/landing.pdf'),
+                                    ('A real PDF', f'{server.url}/octet')], tmp_path)
+    assert [g['title'] for g in got] == ['A real PDF']
+    assert not (tmp_path / 'A_landing_page.pdf').exists()
+    assert not list(tmp_path.rglob('*.part'))
+
+
+def test_size_cap_and_errors_leave_nothing_behind(server, route, tmp_path):
+    server.routes['/big.pdf'] = route(PDF)
+    got = digest_pdfs.download_all([('Too big', f'{server.url}/big.pdf'),
+                                    ('Missing', f'{server.url}/gone.pdf')],
+                                   tmp_path, max_bytes=10_000)
+    assert got == []
+    assert not list(tmp_path.glob('*.pdf')) and not list(tmp_path.rglob('*.part'))
+
+
+def test_existing_file_is_not_refetched(server, route, tmp_path):
+    (tmp_path / 'Already_here.pdf').write_bytes(PDF)
+    got = digest_pdfs.download_all([('Already here', f'{server.url}/x.pdf')], tmp_path)
+    assert got[0]['path'].endswith('Already_here.pdf')
+    assert server.requests == []
+
+
+def _etagged(route, body, etag='"v1"'):
+    def respond(handler):
+        if handler.headers.get('If-None-Match') == etag:
+            return route(b'', status=304, headers={'ETag': etag})
+        return route(body, headers={'ETag': etag})
+    return respond
+
+
+def test_catalog_revalidates_across_folders(server, route, tmp_path):
+    server.routes['/a.pdf'] = _etagged(route, PDF)
+    catalog = digest_pdfs.Catalog(tmp_path)
+    first = digest_pdfs.download_all([('Paper A', f'{server.url}/a.pdf')], tmp_path / 'w1', catalog=catalog)
+    catalog = digest_pdfs.Catalog(tmp_path)                 # as a later run would load it
+    second = digest_pdfs.download_all([('Paper A', f'{server.url}/a.pdf')], tmp_path / 'w2', catalog=catalog)
+
+    assert [h.get('If-None-Match') for _, h in server.requests] == [None, '"v1"']
+    assert os.path.samefile(first[0]['path'], second[0]['path'])
+    assert second[0]['sha256'] == first[0]['sha256']
+
+
+def test_catalog_dedupes_by_doi_and_by_content(server, route, tmp_path):
+    server.routes['/a.pdf'] = route(PDF)
+    server.routes['/mirror.pdf'] = route(PDF)
+    catalog = digest_pdfs.Catalog(tmp_path)
+    digest_pdfs.download_all([('Paper A', f'{server.url}/a.pdf', 'https://doi.org/10.1000/XYZ.1')],
+                             tmp_path / 'w1', catalog=catalog)
+    got = digest_pdfs.download_all([
+        ('Paper A again', f'{server.url}/elsewhere.pdf', '10.1000/xyz.1'),   # same DOI: no request
+        ('Paper A mirror', f'{server.url}/mirror.pdf'),                      # same bytes: linked
+    ], tmp_path / 'w2', catalog=catalog)
+
+    assert [p for p, _ in server.requests] == ['/a.pdf', '/mirror.pdf']
+    original = tmp_path / 'w1' / 'Paper_A.pdf'
+    assert all(os.path.samefile(original, g['path']) for g in got)
+
+
+def test_resumes_a_partial_download(server, route, tmp_path):
+    def ranged(handler):
+        rng = handler.headers.get('Range')
+        if rng and handler.headers.get('If-Range') == '"v1"':
+            start = int(rng.split('=')[1].rstrip('-'))
+            return route(PDF[start:], status=206, headers={'ETag': '"v1"'})
+        return route(PDF, headers={'ETag': '"v1"'})
+
+    server.routes['/a.pdf'] = ranged
+    catalog = digest_pdfs.Catalog(tmp_path)
+    url = f'{server.url}/a.pdf'
+    part, _ = catalog.partial(url)
+    part.parent.mkdir(parents=True)
+    part.write_bytes(PDF[:70_000])
+    catalog.note_partial(url, etag='"v1"')
+
+    got = digest_pdfs.download_all([('Paper A', url)], tmp_path / 'w1', catalog=catalog)
+    assert server.requests[0][1]['Range'] == 'bytes=70000-'
+    assert (tmp_path / 'w1' / 'Paper_A.pdf').read_bytes() == PDF
+    assert got[0]['sha256'] == digest_pdfs.file_sha256(tmp_path / 'w1' / 'Paper_A.pdf')
+    assert not part.exists() and catalog.partials == {}
+
+
+def test_queue_downloads_while_links_arrive(server, route, tmp_path):
+    for n in range(3):
+        server.routes[f'/p{n}.pdf'] = route(PDF, delay=0.3)
+    queue = digest_pdfs.DownloadQueue(tmp_path, workers=3, per_host=3)
+
+    t = time.perf_counter()
+    queue.submit('Article 0', f'{server.url}/p0.pdf')
+    time.sleep(0.2)                       # the next review is still being written
+    queue.submit('Article 1', f'{server.url}/p1.pdf')
+    queue.submit('Article 0 again', f'{server.url}/p0.pdf')
+    queue.submit('Article 2', f'{server.url}/p2.pdf')
+    got = queue.results()
+    elapsed = time.perf_counter() - t
+
+    assert [g['title'] for g in got] == ['Article 0', 'Article 1', 'Article 2']
+    assert [p for p, _ in server.requests].count('/p0.pdf') == 1
+    assert elapsed < 0.2 + 2 * 0.3        # the first fetch overlapped the wait
+
+
+def test_unguarded_partial_is_not_resumed(server, route, tmp_path):
+    server.routes['/a.pdf'] = route(PDF, headers={'ETag': '"v2"'})
+    catalog = digest_pdfs.Catalog(tmp_path)
+    url = f'{server.url}/a.pdf'
+    catalog.note_partial(url, etag='"v1"')
+    # noted validators reach disk without waiting for the download to end
+    assert digest_pdfs.Catalog(tmp_path).partials == {url: {'etag': '"v1"', 'last_modified': ''}}
+
+    # a partial left by a process killed before its validators were saved
+    catalog = digest_pdfs.Catalog(tmp_path / 'fresh')
+    part, _ = catalog.partial(url)
+    part.parent.mkdir(parents=True)
+    part.write_bytes(b'%PDF-1.4\nstale bytes of another version')
+    digest_pdfs.download_all([('Paper A', url)], tmp_path / 'w1', catalog=catalog)
+    assert 'Range' not in server.requests[0][1]
+    assert (tmp_path / 'w1' / 'Paper_A.pdf').read_bytes() == PDF
+
+
+def test_catalog_saves_from_many_threads(tmp_path):
+    catalog = digest_pdfs.Catalog(tmp_path)
+    errors = []
+
+    def save(n):
+        try:
+            for i in range(100):
+                catalog.note_partial(f'https://example.org/{n}/{i}.pdf', etag=f'"{i}"')
+                catalog.save()
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(digest_pdfs.Catalog(tmp_path).partials) == 400
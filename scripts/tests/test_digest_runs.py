@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from digest_runs import Run, RunError
+
+types = pytest.importorskip('anthropic.types')
+
+
+def _response(stop_reason, *blocks):
+    return types.Message(id='msg_1', type='message', role='assistant', model='claude-sonnet-4-6',
+                         content=list(blocks), stop_reason=stop_reason, stop_sequence=None,
+                         usage=types.Usage(input_tokens=1, output_tokens=1))
+
+
+def test_resume_continues_from_last_completed_segment(tmp_path):
+    run = Run.start(tmp_path, 'system prompt', 'user prompt', '2026-08-09T06:00:00', run_id='r1')
+    run.stream_text('Searching... ')
+    run.complete_segment(_response(
+        'pause_turn',
+        types.TextBlock(type='text', text='Searching... ', citations=None),
+        types.ServerToolUseBlock(type='server_tool_use', id='srvtoolu_1', name='web_search',
+                                 input={'query': 'PIDJ August 2026'}),
+    ))
+    run.stream_text('# Digest\n\nhalf a sent')     # the next segment dies here
+    assert run.partial_path.read_text(encoding='utf-8') == 'Searching... # Digest\n\nhalf a sent'
+
+    with pytest.raises(RunError):
+        Run.resume(tmp_path, 'nope')
+    resumed = Run.resume(tmp_path, 'r1')
+    assert resumed.generating and resumed.state['segments'] == 1
+    assert resumed.partial_path.read_text(encoding='utf-8') == 'Searching... '
+    # the assistant turn is stored as the JSON the API takes back
+    assert resumed.state['messages'][1] == {'role': 'assistant', 'content': [
+        {'type': 'text', 'text': 'Searching... '},
+        {'type': 'server_tool_use', 'id': 'srvtoolu_1', 'name': 'web_search',
+         'input': {'query': 'PIDJ August 2026'}},
+    ]}
+    json.dumps(resumed.state)
+
+    resumed.complete_segment(_response('end_turn', types.TextBlock(type='text', text='# Digest\n')))
+    assert not resumed.generating
+    assert len(resumed.state['messages']) == 2
+    resumed.complete('# Digest\n')
+    assert Run.resume(tmp_path, 'r1').state['final'] == '# Digest\n'
+
+    resumed.finish()
+    assert not (tmp_path / 'r1').exists()
+
+
+def test_reviews_are_checkpointed_as_they_finish(tmp_path):
+    run = Run.start(tmp_path, 'system prompt', 'user prompt', '2026-08-09T06:00:00', run_id='r2')
+    run.select([{'title': 'A'}, {'title': 'B'}])
+    run.complete_review('title:a', {'review': '**A**', 'manifest': None})
+
+    resumed = Run.resume(tmp_path, 'r2')
+    assert resumed.state['candidates'] == [{'title': 'A'}, {'title': 'B'}]
+    assert resumed.state['reviews'] == {'title:a': {'review': '**A**', 'manifest': None}}
@@ -0,0 +1,61 @@
+import json
+import shutil
+from pathlib import Path
+
+import digest_site
+
+
+def _digest(site, date, content, generated_at=None):
+    data = {'date': date, 'date_range': f'Range ending {date}',
+            'generated_at': generated_at or f'{date}T07:00:00', 'content': content}
+    (site / 'digests' / f'{date}.json').write_text(json.dumps(data, indent=2), encoding='utf-8')
+
+
+def test_builds_pages_then_skips_unchanged(tmp_path):
+    (tmp_path / 'digests').mkdir()
+    _digest(tmp_path, '2026-07-26', '**An older article title here**\n- **Access:** OPEN ACCESS')
+    _digest(tmp_path, '2026-08-09', '**The newest article title here**\n[PAYWALL: Abstract only reviewed]')
+
+    first = digest_site.build(tmp_path, workers=1)
+    assert sorted(first['written']) == ['archive.html', 'digests/2026-07-26.html',
+                                        'digests/2026-08-09.html', 'index.html']
+    index = (tmp_path / 'index.html').read_text(encoding='utf-8')
+    assert 'The newest article title here' in index and 'Generated August 09, 2026' in index
+    page = (tmp_path / 'digests' / '2026-07-26.html').read_text(encoding='utf-8')
+    assert 'href="../../index.html"' in page and 'href="../archive.html"' in page
+    assert 'open-access-badge' in page
+    archive = (tmp_path / 'archive.html').read_text(encoding='utf-8')
+    assert archive.index('digests/2026-08-09.html') < archive.index('digests/2026-07-26.html')
+
+    mtimes = {p: p.stat().st_mtime_ns for p in tmp_path.rglob('*.html')}
+    again = digest_site.build(tmp_path, workers=1)
+    assert again == {'rendered': [], 'written': [], 'skipped': 4}
+
+    # an edit to the older digest touches its page only
+    _digest(tmp_path, '2026-07-26', '**An older article title, corrected**')
+    edited = digest_site.build(tmp_path, workers=1)
+    assert edited['written'] == ['digests/2026-07-26.html']
+    assert {p: p.stat().st_mtime_ns for p in tmp_path.rglob('*.html')
+            if p.name != '2026-07-26.html'} == {p: t for p, t in mtimes.items()
+                                                 if p.name != '2026-07-26.html'}
+
+    # a forced rebuild renders everything but rewrites nothing identical
+    forced = digest_site.build(tmp_path, workers=1, force=True)
+    assert len(forced['rendered']) == 4 and forced['written'] == []
+
+
+def test_missing_output_is_rebuilt(tmp_path):
+    (tmp_path / 'digests').mkdir()
+    _digest(tmp_path, '2026-08-09', 'Nothing notable this period.')
+    digest_site.build(tmp_path, workers=1)
+    (tmp_path / 'digests' / '2026-08-09.html').unlink()
+    assert digest_site.build(tmp_path, workers=1)['written'] == ['digests/2026-08-09.html']
+
+
+def test_committed_site_is_up_to_date(tmp_path):
+    # the committed build state must match the committed code and digests,
+    # or the next publish re-renders every page
+    site = Path(__file__).resolve().parents[2] / digest_site.SITE_DIR
+    shutil.copytree(site, tmp_path / 'site')
+    result = digest_site.build(tmp_path / 'site', workers=1)
+    assert result['rendered'] == []
@@ -0,0 +1,53 @@
+import digest_memory
+import digest_topics
+
+GAS = {'title': 'Invasive Group A Streptococcal Disease in Children', 'doi': '10.1/gas',
+       'topics': ['group-a-streptococcus', 'invasive-disease'], 'study_type': 'cohort',
+       'key_finding': 'iGAS incidence doubled after 2022.'}
+RSV = {'title': 'Nirsevimab and Antibiotic Use', 'doi': '10.1/rsv',
+       'topics': ['rsv', 'nirsevimab', 'antimicrobial-stewardship'], 'study_type': 'cohort',
+       'key_finding': 'Nirsevimab cut antibiotic prescribing in infants.'}
+ASP = {'title': 'Delphi Priorities for Pediatric Stewardship', 'doi': '10.1/asp',
+       'topics': ['antimicrobial-stewardship', 'delphi-consensus'], 'study_type': 'consensus',
+       'key_finding': 'Seven stewardship interventions were prioritised.'}
+
+
+def _memory(tmp_path, *records):
+    memory = digest_memory.Memory(tmp_path / 'memory.jsonl')
+    for r in records:
+        memory.add(dict(r))
+    return memory
+
+
+def test_ranks_by_shared_topics(tmp_path):
+    index = digest_topics.TopicIndex()
+    index.sync(_memory(tmp_path, GAS, RSV, ASP))
+    query = digest_topics.query_terms([{'topics': ['antimicrobial-stewardship', 'delphi-consensus']}])
+    ranked = [r['doi'] for _, r in index.search(query, k=3)]
+    assert ranked[:2] == ['10.1/asp', '10.1/rsv']
+    assert '10.1/gas' not in ranked
+    assert [r['doi'] for _, r in index.search(query, exclude=[ASP])][0] == '10.1/rsv'
+
+
+def test_persists_and_updates_incrementally(tmp_path):
+    path = tmp_path / 'topic_index.json'
+    memory = _memory(tmp_path, GAS, RSV)
+    index = digest_topics.TopicIndex(path)
+    assert index.sync(memory) == 2
+    index.save()
+
+    memory.add(dict(ASP))
+    again = digest_topics.TopicIndex(path)
+    assert len(again) == 2
+    assert again.sync(memory) == 1          # only the new record
+    assert again.sync(memory) == 0
+    query = digest_topics.query_terms(text='delphi consensus')
+    assert again.search(query, k=1)[0][1]['doi'] == '10.1/asp'
+
+
+def test_context_stays_within_budget():
+    ranked = [(1.0, dict(GAS, title=f'Article {n} ' + 'x' * 200)) for n in range(50)]
+    text, count = digest_topics.within_budget(['### PAST ARTICLES'], ranked, budget_tokens=500)
+    assert 0 < count < 50
+    assert digest_topics.estimate_tokens(text) <= 500
+    assert digest_topics.within_budget(['header'], ranked, budget_tokens=5) == ('', 0)
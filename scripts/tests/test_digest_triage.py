@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+import digest_memory
+import digest_minhash
+import digest_triage
+from digest_document import parse
+from digest_triage import TriageError
+
+SYSTEM = """You are a literature monitoring assistant.
+
+## OUTPUT FORMAT:
+
+# 📚 Literature Digest: July 26 - August 09, 2026
+
+## 📋 Guideline Updates
+[New guidelines with links.]
+
+## 🦠 Pediatric ID Studies
+**[Article Title]**
+
+## 📰 Notable General ID
+
+---
+*Bi-weekly digest generated August 09, 2026.*
+
+
+## ARTICLE MANIFEST
+After the final line of the digest, append one fenced block.
+"""
+
+
+def response(entries):
+    return ('I searched PIDJ and CID.\n\n' + digest_triage.FENCE + '\n'
+            + json.dumps(entries) + '\n```\n')
+
+
+def test_candidates_need_a_title_and_a_link():
+    found = digest_triage.candidates(response([
+        {'title': 'Nirsevimab Effectiveness Against RSV', 'doi': '10.1097/inf.0000000000005045'},
+        {'title': 'No link at all'},
+        {'title': 'ESPID iGAS Guideline', 'url': 'https://journals.lww.com/pidj', 'date': None},
+        'not an object',
+    ]))
+    assert [c['title'] for c in found] == ['Nirsevimab Effectiveness Against RSV', 'ESPID iGAS Guideline']
+    assert found[1]['date'] == ''
+    assert digest_triage.candidates(response([])) == []
+    for text in ('I found nothing worth listing.', response({'title': 'x'}),
+                 digest_triage.FENCE + '\n[{"title": "cut sh'):
+        with pytest.raises(TriageError):
+            digest_triage.candidates(text)
+
+
+def test_select_drops_repeats_of_memory_and_of_each_other(tmp_path):
+    memory = digest_memory.Memory(tmp_path / 'm.jsonl')
+    memory.add({'title': 'Severe Group A Streptococcus Infections in French Children',
+                'doi': '10.3201/eid3206.250726', 'digest_date': '2026-06-14'})
+    index = digest_minhash.index_memory(memory)
+    found = [
+        {'title': 'Severe Group A Streptococcus Infections in French Children Study', 'doi': ''},
+        {'title': 'Another title', 'doi': '10.3201/EID3206.250726'},
+        {'title': 'Nirsevimab Effectiveness Against RSV Hospitalization', 'doi': '10.1097/INF.0000000000005045'},
+        {'title': 'Nirsevimab Effectiveness Against RSV Hospitalization in Infants', 'doi': ''},
+        {'title': 'Vancomycin AUC-Guided Dosing in Neonates', 'doi': ''},
+        {'title': 'Coxsackievirus A9 Cardiomyopathy Case Report', 'doi': ''},
+    ]
+    selected, dropped = digest_triage.select(found, memory, index, limit=2)
+    assert [c['title'] for c in selected] == [
+        'Nirsevimab Effectiveness Against RSV Hospitalization', 'Vancomycin AUC-Guided Dosing in Neonates']
+    assert [reason for _, reason in dropped] == [
+        'reviewed 2026-06-14', 'reviewed 2026-06-14', 'listed twice', 'over the limit of 2']
+
+
+def test_stitch_follows_the_prompt_layout():
+    title, sections, footer = digest_triage.layout(SYSTEM)
+    assert title == '# 📚 Literature Digest: July 26 - August 09, 2026'
+    assert sections == ['📋 Guideline Updates', '🦠 Pediatric ID Studies', '📰 Notable General ID']
+    assert footer == '*Bi-weekly digest generated August 09, 2026.*'
+
+    review = ('**Nirsevimab Effectiveness Against RSV Hospitalization**\n'
+              '*PIDJ, August 2026* | https://doi.org/10.1097/inf.0000000000005045\n'
+              '- **Access:** OPEN ACCESS')
+    text = digest_triage.stitch(SYSTEM, [('pediatric id studies', review), ('Somewhere else', review)])
+    doc = parse(text)
+    assert [s.title for s in doc.sections] == sections
+    assert [len(s.articles) for s in doc.sections] == [0, 1, 1]
+    assert text.count(digest_triage.EMPTY_SECTION) == 1
+    assert text.endswith('---\n\n' + footer + '\n')
+
+
+def test_windows_do_not_pick_the_same_article(tmp_path):
+    memory = digest_memory.Memory(tmp_path / 'm.jsonl')
+    index = digest_minhash.index_memory(memory)
+    claimed = set()
+    first, _ = digest_triage.select([
+        {'title': 'Nirsevimab Effectiveness Against RSV Hospitalization', 'doi': '10.1097/INF.0000000000005045'},
+    ], memory, index, limit=5, claimed=claimed)
+    second, dropped = digest_triage.select([
+        {'title': 'Nirsevimab and RSV: A Later Listing', 'doi': 'https://doi.org/10.1097/inf.0000000000005045'},
+        {'title': 'Vancomycin AUC-Guided Dosing in Neonates', 'doi': ''},
+    ], memory, index, limit=5, claimed=claimed)
+    assert len(first) == 1
+    assert [c['title'] for c in second] == ['Vancomycin AUC-Guided Dosing in Neonates']
+    assert [reason for _, reason in dropped] == ['picked by another window']
+    assert digest_triage.key(second[0]) in claimed
@@ -0,0 +1,85 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('anthropic')
+
+import generate_digest  # noqa: E402
+
+
+def test_import_makes_no_client():
+    assert generate_digest._client is None
+
+
+def test_backfill_windows_cover_the_range():
+    windows = generate_digest.backfill_windows(datetime(2026, 2, 1), datetime(2026, 3, 12))
+    assert [w.folder for w in windows] == [
+        '2026-02-01_to_2026-02-15', '2026-02-15_to_2026-03-01', '2026-03-01_to_2026-03-12']
+    assert [w.days for w in windows] == [14, 14, 11]
+    assert windows[0].date_range == 'February 01 - February 15, 2026'
+    assert windows[-1].file_date == '2026-03-12'
+
+    window = generate_digest.Window.from_json(windows[1].to_json())
+    assert (window.start, window.end) == (windows[1].start, windows[1].end)
+    assert generate_digest.Window(datetime(2026, 8, 9)).folder == '2026-07-26_to_2026-08-09'
+
+
+def test_rate_limiter_spaces_requests_across_threads():
+    limiter = generate_digest.RateLimiter(per_minute=1200)      # one per 50 ms
+    starts = []
+    lock = threading.Lock()
+
+    def request():
+        limiter.wait()
+        with lock:
+            starts.append(time.monotonic())
+
+    threads = [threading.Thread(target=request) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    starts.sort()
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.04
+
+
+DIGEST = """# 📚 Literature Digest
+
+## 🦠 Pediatric ID Studies
+
+**Nirsevimab Effectiveness Against RSV Hospitalization**
+*The Pediatric Infectious Disease Journal, June 2026* | https://doi.org/10.1097/INF.0000000000005045
+- **Access:** OPEN ACCESS
+
+```json digest-manifest
+[{"title": "Nirsevimab Effectiveness Against RSV Hospitalization", "doi": "10.1097/INF.0000000000005045",
+  "journal": "PIDJ", "topics": ["rsv", "nirsevimab"], "study_type": "case-control"}]
+```
+"""
+
+
+def test_crash_while_remembering_resumes_with_the_same_digest(tmp_path, monkeypatch):
+    digest_runs = pytest.importorskip('digest_runs')
+    monkeypatch.setattr(generate_digest, 'MEMORY_FILE', str(tmp_path / 'memory.jsonl'))
+    monkeypatch.setattr(generate_digest, 'LEGACY_MEMORY_FILE', str(tmp_path / 'memory.json'))
+    monkeypatch.setattr(generate_digest, 'TOPIC_INDEX_FILE', str(tmp_path / 'topics.json'))
+    window = generate_digest.Window(datetime(2026, 8, 9))
+    run = digest_runs.Run.start(tmp_path / 'runs', 'system', 'user', window.to_json(), run_id='r1')
+
+    memory = generate_digest.load_memory()
+    topic_index = generate_digest.load_topic_index(memory)
+    saved = generate_digest.save_memory
+    monkeypatch.setattr(generate_digest, 'save_memory', lambda m: (m.save(), 1 / 0))
+    with pytest.raises(ZeroDivisionError):
+        generate_digest.commit_digest(DIGEST, window, memory, topic_index, run)
+    monkeypatch.setattr(generate_digest, 'save_memory', saved)
+
+    # memory now holds the article; the resumed run must not drop it as a repeat
+    content, _ = generate_digest.generate_digest(window, digest_runs.Run.resume(tmp_path / 'runs', 'r1'))
+    assert '**Nirsevimab Effectiveness Against RSV Hospitalization**' in content
+    memory = generate_digest.load_memory()
+    assert len(memory.records) == 1
+    assert memory.records[0]['topics'] == ['rsv', 'nirsevimab']